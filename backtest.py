@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+# 점수 기반 포트폴리오 백테스트 (날짜 x 종목 행렬 연산)
+# - 입력: 종가 행렬(날짜 x 종목)과 같은 모양의 점수 행렬(예: walk-forward 예측 pred_reg)
+# - 리밸런싱일마다 점수 상위 top_n개(및/또는 threshold 초과) 종목을 동일 비중으로 매수,
+#   다음 리밸런싱까지 보유(비중은 가격에 따라 변동, 중간 매매 없음)
+# - holding=K(리밸런싱 주기 단위)면 시작 시점을 한 주기씩 어긋나게 한 K개 포트폴리오에 자금을 1/K씩 배분
+#   (각 포트폴리오는 K 주기마다 리밸런싱 → 어느 날이든 최근 K번의 선정 종목을 보유)
+# - 거래비용: 리밸런싱일 회전율(매수/매도 비중 변화 합계) x cost를 그날 수익에서 차감
+# - 점수는 그날 종가까지의 정보로 계산됐다고 보고 그날 종가에 매매 → 다음 날 수익부터 반영
+# - 거래정지/상장폐지 종목은 마지막 가격 유지(수익 0), 가격이 없는 날(상장 전)은 선정 대상에서 제외
+# - 반복문은 리밸런싱 시작 위치(K개)만 돌고 나머지는 (날짜 x 종목) numpy 연산
+
+TRADING_DAYS = 252
+
+
+def pivot_matrix(df, value, index='date', columns='code'):
+    """long-format DataFrame → (날짜 x 종목) 행렬 DataFrame"""
+    return df.pivot_table(index=index, columns=columns, values=value, aggfunc='last').sort_index()
+
+
+def rebalance_rows(dates, rebalance=20, start=0):
+    """리밸런싱 위치 (rebalance: 영업일 수 int 또는 기간 문자열 'W', 'M', 'Q' → 기간 첫 거래일)"""
+    if isinstance(rebalance, str):
+        periods = pd.DatetimeIndex(dates).to_period(rebalance)
+        rows = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        return rows[rows >= start]
+    return np.arange(start, len(dates), rebalance)
+
+
+def select_weights(scores, prices, top_n=10, threshold=None):
+    """리밸런싱일 점수 행(R x 종목) → 동일 비중 (R x 종목), 선정 종목이 없으면 전부 0 (현금)"""
+    eligible = ~np.isnan(scores) & ~np.isnan(prices)
+    if threshold is not None:
+        eligible &= scores > threshold
+    picked = eligible
+    if top_n is not None:
+        ranked = np.where(eligible, scores, -np.inf)
+        k = min(top_n, scores.shape[1])
+        top = np.argpartition(-ranked, k - 1, axis=1)[:, :k]
+        picked = np.zeros_like(eligible)
+        np.put_along_axis(picked, top, True, axis=1)
+        picked &= eligible
+    n = picked.sum(axis=1, keepdims=True)
+    return np.divide(picked, n, out=np.zeros(picked.shape), where=n > 0)
+
+
+def _run_schedule(prices, weights, rows, cost):
+    """리밸런싱 위치 rows, 각 위치 목표 비중 weights(R x 종목) 포트폴리오의 일별 (수익률, 비용, 회전율)"""
+    T = len(prices)
+    ret = np.zeros(T)
+    fee = np.zeros(T)
+    # 날짜별 보유 구간 번호: t일 수익(t-1 → t)은 t-1일 종가 기준 보유 포트폴리오
+    seg = np.searchsorted(rows, np.arange(T), side='right') - 1
+    held = seg[:-1]
+    days = np.flatnonzero(held >= 0) + 1
+    if len(days):
+        h = seg[days - 1]
+        w = weights[h]
+        base = prices[rows[h]]
+        cash = 1 - w.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            now = cash + np.nansum(w * prices[days] / base, axis=1)
+            prev = cash + np.nansum(w * prices[days - 1] / base, axis=1)
+        ret[days] = now / prev - 1
+
+    # 회전율: 직전 포트폴리오의 리밸런싱일 비중(가격 변동 반영) → 새 목표 비중
+    drifted = np.zeros_like(weights)
+    if len(rows) > 1:
+        w = weights[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grown = np.nan_to_num(w * prices[rows[1:]] / prices[rows[:-1]])
+        value = (1 - w.sum(axis=1)) + grown.sum(axis=1)
+        drifted[1:] = grown / value[:, None]
+    turnover = np.abs(weights - drifted).sum(axis=1)
+    fee[rows] = turnover * cost
+    return ret, fee, turnover
+
+
+@dataclass
+class BacktestResult:
+    equity: pd.Series     # 누적 자산 (시작 1.0)
+    returns: pd.Series    # 일별 수익률 (거래비용 차감 후)
+    drawdown: pd.Series   # 고점 대비 하락률
+    turnover: pd.Series   # 리밸런싱일별 회전율 (편도, 0~2)
+    holdings: pd.DataFrame  # 리밸런싱일 x 종목 목표 비중
+
+    def summary(self):
+        days = len(self.returns)
+        years = days / TRADING_DAYS
+        total = self.equity.iloc[-1] if days else 1.0
+        vol = self.returns.std() * np.sqrt(TRADING_DAYS)
+        return {
+            'total_return': total - 1,
+            'cagr': total ** (1 / years) - 1 if years > 0 else np.nan,
+            'volatility': vol,
+            'sharpe': self.returns.mean() * TRADING_DAYS / vol if vol > 0 else np.nan,
+            'max_drawdown': self.drawdown.min() if days else 0.0,
+            'avg_turnover': self.turnover.mean() if len(self.turnover) else 0.0,
+            'annual_turnover': self.turnover.sum() / years if years > 0 else np.nan,
+            'n_rebalance': len(self.turnover),
+            'avg_holdings': float((self.holdings > 0).sum(axis=1).mean()) if len(self.holdings) else 0.0,
+        }
+
+
+def backtest(prices, scores, top_n=10, threshold=None, rebalance=20, holding=1, cost=0.0025):
+    """점수 상위 종목 포트폴리오 백테스트
+    prices, scores: 같은 날짜 x 종목 DataFrame (scores는 없는 날/종목 NaN, 첫 점수일부터 시작)
+    top_n: 리밸런싱마다 보유할 종목 수 (None이면 threshold 초과 전부), threshold: 최소 점수
+    rebalance: 리밸런싱 주기 (영업일 수 또는 'W', 'M', 'Q'), holding: 보유 기간 (리밸런싱 주기 단위)
+    cost: 매매금액 대비 편도 거래비용 (수수료 + 세금 + 슬리피지)"""
+    scores = scores.reindex(index=prices.index, columns=prices.columns)
+    P = prices.ffill().to_numpy(dtype=np.float64)
+    S = scores.to_numpy(dtype=np.float64)
+    has_score = np.flatnonzero(~np.isnan(S).all(axis=1))
+    dates = prices.index
+    if len(has_score) == 0:
+        raise ValueError('점수가 있는 날짜가 없습니다.')
+    rows = rebalance_rows(dates, rebalance, start=has_score[0])
+    weights = select_weights(S[rows], prices.to_numpy(dtype=np.float64)[rows], top_n, threshold)
+
+    # 시작을 한 주기씩 어긋나게 한 holding개 포트폴리오 (각각 holding 주기마다 리밸런싱)
+    T = len(dates)
+    value = np.zeros(T)
+    turnover = np.zeros(len(rows))
+    for k in range(min(holding, len(rows))):
+        idx = np.arange(k, len(rows), holding)
+        ret, fee, to = _run_schedule(P, weights[idx], rows[idx], cost)
+        value += np.cumprod((1 + ret) * (1 - fee)) / holding  # 첫 매수 전에는 1.0 (현금)
+        turnover[idx] += to / holding
+    value += max(holding - len(rows), 0) / holding  # 한 번도 매수하지 못한 몫은 현금
+
+    start = rows[0]
+    equity = pd.Series(value[start:], index=dates[start:], name='equity')
+    returns = equity.pct_change().fillna(equity.iloc[0] - 1).rename('returns')
+    drawdown = (equity / equity.cummax() - 1).rename('drawdown')
+    return BacktestResult(
+        equity=equity,
+        returns=returns,
+        drawdown=drawdown,
+        turnover=pd.Series(turnover, index=dates[rows], name='turnover'),
+        holdings=pd.DataFrame(weights, index=dates[rows], columns=prices.columns),
+    )
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from backtest import backtest, rebalance_rows  # noqa: E402
+
+# 포트폴리오 백테스트 속도 + 정확도
+# - 합성 종가/점수 행렬 (상장 시점이 다른 종목, 중간 상장폐지 종목 포함)
+# - 작은 규모에서 날짜마다 보유 주식 수를 추적하는 단순 반복문 구현과 자산 곡선 비교
+# - 10년 x 2500종목 일별 백테스트 시간 측정
+
+
+def synthetic_matrices(n_tickers, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2015-01-02', periods=n_days)
+    codes = [f'{i:06d}' for i in range(n_tickers)]
+    prices = 10000 * np.exp(rng.normal(0.0002, 0.02, (n_days, n_tickers)).cumsum(axis=0))
+    listed = rng.integers(-n_days, n_days // 2, n_tickers).clip(0)  # 상장 전 NaN
+    delisted = np.where(rng.random(n_tickers) < 0.05, rng.integers(n_days // 2, n_days, n_tickers), n_days)
+    day = np.arange(n_days)[:, None]
+    prices[(day < listed) | (day >= delisted)] = np.nan
+    scores = rng.normal(0, 1, (n_days, n_tickers))
+    scores[np.isnan(prices)] = np.nan
+    return (pd.DataFrame(prices, index=dates, columns=codes),
+            pd.DataFrame(scores, index=dates, columns=codes))
+
+
+def naive_backtest(prices, scores, top_n, rebalance, holding, cost):
+    # 보유 주식 수를 날짜마다 갱신하는 반복문 구현 (비교 기준)
+    P = prices.ffill().to_numpy()
+    raw = prices.to_numpy()
+    S = scores.to_numpy()
+    rows = list(rebalance_rows(prices.index, rebalance))
+    total = np.zeros(len(P))
+    for k in range(holding):
+        my_rows = set(rows[k::holding])
+        cash, shares = 1.0, {}
+        for t in range(len(P)):
+            value = cash + sum(n * P[t, j] for j, n in shares.items())
+            if t in my_rows:
+                cand = [j for j in range(P.shape[1]) if not np.isnan(S[t, j]) and not np.isnan(raw[t, j])]
+                cand = sorted(cand, key=lambda j: -S[t, j])[:top_n]
+                old = {j: n * P[t, j] / value for j, n in shares.items()}
+                new = {j: 1 / len(cand) for j in cand}
+                turnover = sum(abs(new.get(j, 0) - old.get(j, 0)) for j in set(old) | set(new))
+                value *= 1 - turnover * cost
+                shares = {j: w * value / P[t, j] for j, w in new.items()}
+                cash = value - sum(w * value for w in new.values())
+            total[t] += value / holding
+    return pd.Series(total, index=prices.index)[prices.index[rows[0]]:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=2500)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--top-n', type=int, default=20)
+    args = parser.parse_args()
+
+    prices, scores = synthetic_matrices(60, 300, seed=1)
+    for rebalance, holding in [(20, 1), (5, 3), ('M', 2)]:
+        result = backtest(prices, scores, top_n=5, rebalance=rebalance, holding=holding, cost=0.003)
+        expected = naive_backtest(prices, scores, 5, rebalance, holding, 0.003)
+        np.testing.assert_allclose(result.equity.to_numpy(), expected.to_numpy(), rtol=1e-9)
+    print('반복문 구현과 자산 곡선 일치 (리밸런싱 20일/5일/월, 보유 1~3주기)')
+
+    n_days = args.years * 252
+    prices, scores = synthetic_matrices(args.tickers, n_days)
+    for rebalance, holding in [(20, 1), (5, 4), ('M', 3)]:
+        t0 = time.perf_counter()
+        result = backtest(prices, scores, top_n=args.top_n, rebalance=rebalance, holding=holding)
+        elapsed = time.perf_counter() - t0
+        s = result.summary()
+        print(f'{args.years}년 x {args.tickers}종목, 리밸런싱 {rebalance!s:>2}, 보유 {holding}주기: {elapsed:6.2f}s | '
+              f"MDD {s['max_drawdown']:.1%}, 연 회전율 {s['annual_turnover']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ohlcv_store import OHLCVStore  # noqa: E402
+from indicators import ML_FEATURE_COLS  # noqa: E402
+from stock_ml_predictor import make_ml_dataset  # noqa: E402
+from dataset_builder import build_dataset, iter_batches  # noqa: E402
+from bench_ml_dataset import synthetic_ohlcv  # noqa: E402
+
+# 학습 데이터셋 생성: 전체 메모리 방식(load → make_ml_dataset) vs chunk 스트리밍(build_dataset)
+# - 합성 시세로 임시 저장소를 만든 뒤 방식별로 별도 프로세스에서 실행해 최대 메모리(RSS) 비교
+# - 두 방식의 결과(전체 row)가 같은지 확인
+
+
+def make_store(root, n_tickers, n_days):
+    df_all = synthetic_ohlcv(n_tickers, n_days)
+    by_code = {code: df.set_index('날짜').drop(columns='code') for code, df in df_all.groupby('code')}
+    store = OHLCVStore(root, fetcher=lambda s, e, code: by_code[code])
+    tickers = sorted(by_code)
+    dates = df_all['날짜']
+    start_str, end_str = dates.min().strftime('%Y%m%d'), dates.max().strftime('%Y%m%d')
+    store.sync(tickers, start_str, end_str)
+    return tickers, start_str, end_str
+
+
+def run(mode, root, out, chunk_size):
+    store = OHLCVStore(root, fetcher=lambda *a: None)
+    tickers = store.codes()
+    start_str, end_str = '19000101', '21001231'
+    t0 = time.perf_counter()
+    if mode == 'memory':
+        df_all = store.load(tickers, start_str, end_str, min_rows=80)
+        data = make_ml_dataset(df_all, dtype=np.float32, with_indicators=True)
+        data = data.dropna(subset=ML_FEATURE_COLS).reset_index(drop=True)
+        data.to_parquet(out, index=False)
+        n = len(data)
+    else:
+        n = build_dataset(tickers, start_str, end_str, out, store=store, chunk_size=chunk_size, sync=False)
+    elapsed = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+    print(f'{n} {elapsed:.3f} {peak:.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--chunk-size', type=int, default=100)
+    parser.add_argument('--run', nargs=3, metavar=('MODE', 'ROOT', 'OUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run(*args.run, chunk_size=args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'ohlcv')
+        make_store(root, args.tickers, args.days)
+        results = {}
+        for mode in ['memory', 'streaming']:
+            out = os.path.join(tmp, f'{mode}.parquet')
+            line = subprocess.run([sys.executable, __file__, '--chunk-size', str(args.chunk_size),
+                                   '--run', mode, root, out],
+                                  check=True, capture_output=True, text=True).stdout.splitlines()[-1].split()
+            n, elapsed, peak = int(line[0]), float(line[1]), float(line[2])
+            results[mode] = out
+            print(f'[{mode:>9}] {n:>10,} rows | {elapsed:6.2f}s | 최대 메모리 {peak:7.0f}MB')
+        expected = pd.read_parquet(results['memory'])
+        streamed = pd.concat(iter_batches(results['streaming']), ignore_index=True)
+        pd.testing.assert_frame_equal(streamed, expected, check_exact=True)
+        print('결과 일치')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import requests
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from test import StockScreener  # noqa: E402
+
+# 로컬 stub HTTP 서버를 상대로 종목 페이지 수집 속도 비교
+# - 기존 방식: 종목당 2회 요청(업종, PER/PBR) + time.sleep(0.1), 직렬
+# - FetchEngine: 종목당 1회 요청, 워커 풀 + token bucket
+
+ITEM_HTML = '''<html><body>
+<div class="trade_compare"><h4><em><a href="#">반도체와반도체장비</a></em></h4></div>
+<em id="_per">12.34</em><em id="_pbr">1,234.5</em>
+</body></html>'''.encode('utf-8')
+
+
+def start_stub_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(ITEM_HTML)))
+            self.end_headers()
+            self.wfile.write(ITEM_HTML)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_serial(url, codes):
+    session = requests.Session()
+    t0 = time.perf_counter()
+    for code in codes:
+        session.get(url.format(code=code))  # get_sector_info
+        time.sleep(0.1)
+        session.get(url.format(code=code))  # get_stock_info
+        time.sleep(0.1)
+    return time.perf_counter() - t0
+
+
+def bench_engine(url, codes, max_workers, rate):
+    screener = StockScreener(max_workers=max_workers, rate=rate, item_url=url)
+    t0 = time.perf_counter()
+    screener.engine.map(screener.get_item_info, codes)
+    elapsed = time.perf_counter() - t0
+    assert all(screener.get_stock_info(code) == (12.34, 1234.5) for code in codes)
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=100, help='종목 수')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub 서버 응답 지연(초)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=10, help='초당 최대 요청 수')
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency)
+    url = f'http://127.0.0.1:{server.server_port}/item/main.naver?code={{code}}'
+    codes = [f'{i:06d}' for i in range(args.n)]
+
+    serial = bench_serial(url, codes)
+    engine = bench_engine(url, codes, args.workers, args.rate)
+    print(f'[직렬 + sleep(0.1), 2회/종목] {serial:.2f}s ({args.n / serial:.1f} 종목/s)')
+    print(f'[FetchEngine, 1회/종목]       {engine:.2f}s ({args.n / engine:.1f} 종목/s)')
+    print(f'→ 전체 {2500}종목 예상: {2500 / (args.n / serial) / 60:.1f}분 → {2500 / (args.n / engine) / 60:.1f}분')
+    server.shutdown()
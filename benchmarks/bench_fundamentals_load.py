@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from fixtures import synthetic_fundamentals  # noqa: E402
+from macro_and_industry_analysis import NUMERIC_COLS, load_fundamentals  # noqa: E402
+
+# dataSet.xlsx 읽기 시간: 기존(매번 pd.read_excel + to_numeric) vs table_cache(처음 한 번 Parquet 변환 후 재사용)
+# - 합성 재무 데이터를 엑셀로 저장 (openpyxl 필요)
+# - 첫 호출(변환 포함), 이후 호출(Parquet), 컬럼 일부만 읽기, 원본 수정 후 재변환을 각각 측정
+# - 기존 방식과 값이 같은지 확인
+
+
+def legacy_fundamentals(file_path):
+    # 기존 recommend_stocks_by_industry의 데이터 불러오기 부분
+    df = pd.read_excel(file_path)
+    for col in NUMERIC_COLS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df.dropna(subset=NUMERIC_COLS + ['산업군'])
+
+
+def timed(fn, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        path = os.path.join(tmp, 'dataSet.xlsx')
+        synthetic_fundamentals(args.rows).to_excel(path, index=False)
+        cols = ['회사명', '산업군'] + NUMERIC_COLS
+
+        legacy, t_legacy = timed(lambda: legacy_fundamentals(path))
+        cold, t_cold = timed(lambda: load_fundamentals(path))
+        warm, t_warm = timed(lambda: load_fundamentals(path), args.repeat)
+        proj, t_proj = timed(lambda: load_fundamentals(path, columns=cols), args.repeat)
+        os.utime(path)  # 내용은 같고 mtime만 바뀜 → 해시 비교 후 변환 없이 재사용
+        _, t_touch = timed(lambda: load_fundamentals(path))
+
+        assert warm['산업군'].dtype == 'category'
+        expected = legacy.reset_index(drop=True)
+        for df in (cold, warm, proj):
+            df = df.reset_index(drop=True)
+            pd.testing.assert_frame_equal(df[NUMERIC_COLS], expected[NUMERIC_COLS], check_dtype=False)
+            assert list(df['산업군'].astype(str)) == list(expected['산업군'].astype(str))
+            assert list(df['회사명']) == list(expected['회사명'])
+
+        print(f'{args.rows}행 ({os.path.getsize(path) / 1e6:.1f}MB xlsx)')
+        print(f'기존 read_excel   {t_legacy * 1000:9.1f}ms')
+        print(f'첫 호출(변환)     {t_cold * 1000:9.1f}ms')
+        print(f'캐시(전체 컬럼)   {t_warm * 1000:9.1f}ms | {t_legacy / t_warm:6.0f}배')
+        print(f'캐시(필요 컬럼)   {t_proj * 1000:9.1f}ms | {t_legacy / t_proj:6.0f}배')
+        print(f'mtime만 변경      {t_touch * 1000:9.1f}ms (해시 확인)')
+        print('값 일치')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from bench_ml_dataset import synthetic_ohlcv  # noqa: E402
+from indicators import ML_FEATURE_COLS  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from stock_ml_predictor import make_ml_dataset, HORIZONS  # noqa: E402
+from walk_forward import walk_forward, walk_forward_horizons, horizon_view, summarize_horizons  # noqa: E402
+
+# 타깃 기간(5/20/60/120영업일) 비교
+# - 데이터셋: horizon마다 make_ml_dataset을 다시 실행 vs horizons=[...]로 한 번에 계산 (타깃 값 일치 확인)
+# - 학습: horizon마다 walk_forward 순차 실행 vs walk_forward_horizons (horizon × fold 학습을 풀 하나에서)
+
+
+def small_models():
+    return {
+        'lr': LinearRegression(),
+        'reg': RandomForestRegressor(n_estimators=20, max_depth=8, random_state=42),
+        'cls': RandomForestClassifier(n_estimators=20, max_depth=8, random_state=42),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--folds', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    horizons = HORIZONS
+    df_all = synthetic_ohlcv(args.tickers, args.days)
+
+    t0 = time.perf_counter()
+    per_h = {h: make_ml_dataset(df_all, with_indicators=True, horizon=h) for h in horizons}
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    data = make_ml_dataset(df_all, with_indicators=True, horizons=horizons)
+    t_once = time.perf_counter() - t0
+
+    for h in horizons:
+        expected = per_h[h][['code', 'date', 'target_reg', 'target_cls']].reset_index(drop=True)
+        got = horizon_view(data, h)[['code', 'date', 'target_reg', 'target_cls']].reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected)
+    print(f'{args.tickers}종목 x {args.days}일, horizon {horizons}')
+    print(f'데이터셋: horizon별 반복 {t_loop:.2f}s | 한 번에 {t_once:.2f}s | {t_loop / t_once:.1f}배, 타깃 일치')
+
+    data = data.dropna(subset=ML_FEATURE_COLS).reset_index(drop=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for h in horizons:
+            walk_forward(horizon_view(data, h), ML_FEATURE_COLS, horizon=h, n_folds=args.folds,
+                         models=small_models(), max_workers=args.workers,
+                         registry=ModelRegistry(os.path.join(tmp, f'seq{h}')))
+        t_seq = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        report, _, _ = walk_forward_horizons(data, ML_FEATURE_COLS, horizons, n_folds=args.folds,
+                                             models=small_models(), max_workers=args.workers,
+                                             registry=ModelRegistry(os.path.join(tmp, 'multi')))
+        t_multi = time.perf_counter() - t0
+    print(f'학습({os.cpu_count()} CPU): horizon별 walk_forward {t_seq:.2f}s | walk_forward_horizons {t_multi:.2f}s')
+    print(summarize_horizons(report).to_string())
+
+
+if __name__ == "__main__":
+    main()
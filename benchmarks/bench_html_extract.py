@@ -0,0 +1,123 @@
+import io
+import os
+import sys
+import glob
+import time
+import argparse
+import pandas as pd
+from bs4 import BeautifulSoup
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from fixtures import MarketFixtures  # noqa: E402
+from html_extract import extract_first_value, extract_item_info, extract_sector_changes  # noqa: E402
+
+# 네이버 금융 페이지 1개당 파싱 시간: 기존(pd.read_html / BeautifulSoup html.parser) vs html_extract(lxml 스트리밍)
+# - 기본은 fixtures.py의 합성 페이지, --pages DIR을 주면 저장해 둔 실제 페이지 사용
+#   (파일명: item_*.html, index_*.html, exchange*.html, sector*.html)
+# - --save DIR: 합성 페이지를 파일로 저장
+# - 두 방식의 추출 값이 같은지 확인
+
+
+def legacy_item_info(html):
+    # 기존 test.parse_item_info
+    soup = BeautifulSoup(html, 'html.parser')
+    sector = soup.select_one('div.trade_compare > h4 > em > a')
+    info = {'업종': sector.text if sector else "기타", 'PER': None, 'PBR': None}
+    try:
+        per = soup.select_one('#_per')
+        pbr = soup.select_one('#_pbr')
+        info['PER'] = float(per.text.replace(',', '')) if per else None
+        info['PBR'] = float(pbr.text.replace(',', '')) if pbr else None
+    except:
+        info['PER'], info['PBR'] = None, None
+    return info
+
+
+def legacy_first_value(html):
+    # 기존 get_kospi_index / get_kosdaq_index / get_usd_krw_exchange_rate
+    df = pd.read_html(io.StringIO(html))[0]
+    return float(str(df.iloc[0, 1]).replace(',', ''))
+
+
+def legacy_sectors(html):
+    # 기존 industry_analysis (정렬 전까지)
+    df = pd.read_html(io.StringIO(html), header=0)[0]
+    df = df.dropna(subset=['전일대비'])
+    df['전일대비(수치)'] = df['전일대비'].astype(str).str.replace('%', '').str.replace('+', '').str.replace(',', '')
+    df['전일대비(수치)'] = pd.to_numeric(df['전일대비(수치)'], errors='coerce')
+    df = df.dropna(subset=['전일대비(수치)'])
+    return list(zip(df['업종명'], df['전일대비'], df['전일대비(수치)']))
+
+
+def new_sectors(html):
+    return [(s.name, s.change_text, s.change) for s in extract_sector_changes(html)]
+
+
+KINDS = {
+    # 종류: (파일 패턴, 기존 함수, 새 함수)
+    'item': ('item_*.html', legacy_item_info, lambda h: extract_item_info(h).as_dict()),
+    'index': ('index_*.html', legacy_first_value, extract_first_value),
+    'exchange': ('exchange*.html', legacy_first_value, extract_first_value),
+    'sector': ('sector*.html', legacy_sectors, new_sectors),
+}
+
+
+def synthetic_pages(n_items):
+    fx = MarketFixtures(n_tickers=n_items)
+    return {
+        'item': [fx.item_page(code) for code in fx.codes],
+        'index': [fx.index_page('KOSPI'), fx.index_page('KOSDAQ')],
+        'exchange': [fx.exchange_page()],
+        'sector': [fx.sector_page()],
+    }
+
+
+def load_pages(root):
+    pages = {}
+    for kind, (pattern, _, _) in KINDS.items():
+        paths = sorted(glob.glob(os.path.join(root, pattern)))
+        if paths:
+            pages[kind] = [open(p, encoding='utf-8', errors='replace').read() for p in paths]
+    return pages
+
+
+def per_page(fn, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=20, help='합성 종목 페이지 수')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pages', help='저장된 페이지 폴더')
+    parser.add_argument('--save', help='합성 페이지 저장 폴더')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages) if args.pages else synthetic_pages(args.items)
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for kind, htmls in pages.items():
+            for i, html in enumerate(htmls):
+                with open(os.path.join(args.save, f'{kind}_{i:04d}.html'), 'w', encoding='utf-8') as f:
+                    f.write(html)
+
+    for kind, htmls in pages.items():
+        _, legacy, new = KINDS[kind]
+        for html in htmls:
+            assert legacy(html) == new(html), kind
+        t_legacy = per_page(legacy, htmls, args.repeat)
+        t_new = per_page(new, htmls, args.repeat)
+        size = sum(len(h.encode('utf-8')) for h in htmls) / len(htmls) / 1024
+        print(f'[{kind:>8}] {len(htmls):>4}페이지 ({size:.0f}KB) | 기존 {t_legacy * 1000:8.2f}ms | '
+              f'lxml {t_new * 1000:7.2f}ms | {t_legacy / t_new:6.1f}배')
+
+
+if __name__ == "__main__":
+    main()
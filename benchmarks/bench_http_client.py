@@ -0,0 +1,113 @@
+import os
+import sys
+import gzip
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from fixtures import MarketFixtures  # noqa: E402
+from fetch_engine import FetchEngine  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+
+# 공용 HTTP 클라이언트: 연결(handshake) 수, 전송 바이트
+# - 로컬 HTTP/1.1 서버(keep-alive, gzip, ETag/304)에 합성 네이버 페이지(종목 페이지 + 지수/환율/업종 페이지)를 올려 두고
+#   기존 방식(요청마다 requests.get) / 공용 클라이언트 첫 실행 / 두 번째 실행(같은 캐시 폴더, 새 프로세스 가정)을 비교
+# - --no-etag: 서버가 ETag를 주지 않는 경우 (연결 재사용 효과만)
+
+
+def make_server(pages, etag=True):
+    stats = {'connections': 0, 'bytes': 0, 'requests': 0, 'not_modified': 0}
+    lock = threading.Lock()
+    gz = {path: gzip.compress(body) for path, body in pages.items()}
+    tags = {path: '"%s"' % hashlib.sha1(body).hexdigest()[:16] for path, body in pages.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats['connections'] += 1
+
+        def do_GET(self):
+            path = self.path
+            with lock:
+                stats['requests'] += 1
+            if etag and self.headers.get('If-None-Match') == tags[path]:
+                with lock:
+                    stats['not_modified'] += 1
+                self.send_response(304)
+                self.send_header('ETag', tags[path])
+                self.end_headers()
+                return
+            compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+            body = gz[path] if compressed else pages[path]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if compressed:
+                self.send_header('Content-Encoding', 'gzip')
+            if etag:
+                self.send_header('ETag', tags[path])
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                stats['bytes'] += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def run(label, server, stats, urls, fetch, workers):
+    before = dict(stats)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        bodies = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - t0
+    d = {k: stats[k] - before[k] for k in stats}
+    print(f'[{label:<14}] 요청 {d["requests"]:>5} | 연결 {d["connections"]:>5} | 304 {d["not_modified"]:>5} | '
+          f'전송 {d["bytes"] / 1e6:8.2f}MB | {elapsed:6.2f}s')
+    return bodies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--no-etag', action='store_true')
+    args = parser.parse_args()
+
+    fx = MarketFixtures(n_tickers=args.items)
+    pages = {f'/item/main.naver?code={code}': fx.item_page(code).encode('utf-8') for code in fx.codes}
+    pages['/sise/sise_index.naver?code=KOSPI'] = fx.index_page('KOSPI').encode('utf-8')
+    pages['/sise/sise_index.naver?code=KOSDAQ'] = fx.index_page('KOSDAQ').encode('utf-8')
+    pages['/sise/sise_group.naver?type=upjong'] = fx.sector_page().encode('utf-8')
+    server, stats = make_server(pages, etag=not args.no_etag)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    urls = [base + path for path in pages]
+    print(f'페이지 {len(urls)}개 (평균 {sum(map(len, pages.values())) / len(pages) / 1024:.0f}KB), 워커 {args.workers}개')
+
+    expected = run('기존 requests.get', server, stats, urls, lambda u: requests.get(u, timeout=10).text, args.workers)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ['공용 클라이언트 1회', '공용 클라이언트 2회']:
+            engine = FetchEngine(max_workers=args.workers, rate=1000, client=HttpClient(cache_dir=tmp))
+            bodies = run(label, server, stats, urls, engine.get, args.workers)
+            assert bodies == expected
+            print(f'{"":16} 클라이언트 기준: {engine.client.stats()}')
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
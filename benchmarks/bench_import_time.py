@@ -0,0 +1,171 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path[:0] = [ROOT, HERE]
+
+# 명령행 도구(kstock.py) 시작 시간 / 모듈 임포트 부작용 확인
+# - 새 파이썬 프로세스로 실행한 전체 시간 (repeat회 중 최소), 목표: --help와 macro는 300ms 미만
+#   · macro(캐시): 오늘 조회한 지수/환율이 TTL 캐시에 있는 경우 (requests/lxml도 읽지 않음)
+#   · macro(조회) 임포트: 캐시가 없을 때 조회 전까지 읽는 모듈 (kstock + 거시경제 모듈 + requests + lxml)
+#   · 명령별 임포트: 각 명령이 실행할 때 읽는 모듈 (무거운 패키지는 실제로 쓰는 명령만 부담)
+# - 부작용 확인: 네트워크 연결을 막고 빈 작업 폴더에서 모든 모듈을 임포트 → 연결 시도/파일 생성이 없어야 함
+#
+# 예) python benchmarks/bench_import_time.py --repeat 7 --importtime macro
+
+TARGET_MS = 300
+HEAVY = ['pandas', 'numpy', 'sklearn', 'pykrx', 'yfinance', 'bs4', 'requests', 'lxml', 'pyarrow', 'joblib', 'tqdm']
+PHASE_DIR = os.path.join(ROOT, '시장 국면 분석')
+
+# 명령별로 실행할 때 임포트하는 모듈 (kstock.cmd_* 참고)
+COMMAND_MODULES = {
+    'macro(조회)': ['macro_and_industry_analysis', 'requests', 'lxml.etree'],
+    'phase': ['macro_snapshot', 'market_phase_summary'],
+    'industry': ['macro_and_industry_analysis', 'table_cache', 'model_registry', 'sklearn.ensemble'],
+    'screen': ['test'],
+    'train/predict': ['stock_ml_predictor'],
+}
+# 변경 전 모듈들이 임포트만으로 읽던 패키지 묶음 (비교용)
+EAGER_BEFORE = ['pandas', 'sklearn.ensemble', 'sklearn.model_selection', 'pykrx.stock', 'yfinance']
+
+# 모듈 하나 임포트 (네트워크 차단, 빈 작업 폴더)
+SIDE_EFFECT_CHECK = r'''
+import os, sys, json, socket, importlib
+attempts = []
+def blocked(*args, **kwargs):
+    attempts.append(repr(args[:2]))
+    raise OSError('network blocked during import')
+socket.socket.connect = blocked
+socket.create_connection = blocked
+socket.getaddrinfo = blocked
+sys.path[:0] = {paths!r}
+importlib.import_module({module!r})
+loaded = sorted({{m.split('.')[0] for m in sys.modules}} & set({heavy!r}))
+files = [os.path.join(d, f) for d, _, fs in os.walk('.') for f in fs]
+print(json.dumps({{'loaded': loaded, 'network': attempts, 'files': files}}))
+'''
+
+
+def run_best(args, repeat, cwd=None, env=None):
+    """새 프로세스 실행 시간 (repeat회 중 최소, ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = subprocess.run(args, cwd=cwd, env=env, capture_output=True, text=True)
+        best = min(best, time.perf_counter() - t0)
+        if result.returncode != 0:
+            raise RuntimeError(f'{args} 실패:\n{result.stderr[-2000:]}')
+    return best * 1000
+
+
+def import_cmd(modules):
+    code = ('import sys; sys.path[:0] = [%r, %r, %r]; import kstock; ' % (
+        ROOT, PHASE_DIR, os.path.join(PHASE_DIR, '결과 분석'))) + '; '.join(f'import {m}' for m in modules)
+    return [sys.executable, '-c', code]
+
+
+def seed_macro_cache(workdir):
+    # 합성 네이버 페이지로 지수/환율을 한 번 조회해서 workdir/data/cache/indicators에 저장
+    from fixtures import MarketFixtures
+    import market_indices
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with MarketFixtures(n_tickers=5, n_days=10).patch():
+            values = [market_indices.get_kospi_index(), market_indices.get_kosdaq_index(),
+                      market_indices.get_usd_krw_exchange_rate()]
+    finally:
+        os.chdir(cwd)
+    assert None not in values, values
+    return values
+
+
+def all_modules():
+    root = sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(ROOT, '*.py')))
+    phase = sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(PHASE_DIR, '*.py')))
+    summary = sorted(os.path.splitext(os.path.basename(p))[0]
+                     for p in glob.glob(os.path.join(PHASE_DIR, '결과 분석', '*.py')))
+    return root + phase + summary
+
+
+def check_side_effects():
+    # 모듈마다 새 프로세스에서 임포트 (앞 모듈이 읽은 패키지와 섞이지 않게)
+    modules = all_modules()
+    paths = [ROOT, PHASE_DIR, os.path.join(PHASE_DIR, '결과 분석')]
+    network, files, loaded = [], [], {}
+    for name in modules:
+        code = SIDE_EFFECT_CHECK.format(paths=paths, module=name, heavy=HEAVY)
+        with tempfile.TemporaryDirectory() as workdir:
+            result = subprocess.run([sys.executable, '-c', code], cwd=workdir, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f'{name} 임포트 실패:\n{result.stderr[-2000:]}')
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        network += [f'{name}: {x}' for x in report['network']]
+        files += [f'{name}: {x}' for x in report['files']]
+        loaded[name] = report['loaded']
+    print(f'\n[임포트 부작용] 모듈 {len(modules)}개 (모듈마다 새 프로세스, 네트워크 차단, 빈 작업 폴더)')
+    print(f'  네트워크 연결 시도: {len(network)}회, 생성된 파일: {len(files)}개')
+    print('  모듈별 임포트만으로 읽는 무거운 패키지:')
+    for name, packages in loaded.items():
+        print(f'    {name:32s} {", ".join(packages) or "-"}')
+    return network + files
+
+
+def print_importtime(modules, top=12):
+    # python -X importtime: 누적 시간이 큰 모듈 순
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + import_cmd(modules)[1:],
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cum_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cum_us), int(self_us), name))
+    print(f'\n[-X importtime] {" + ".join(modules)} (누적 상위 {top}개)')
+    for cum_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f'  {cum_us / 1000:8.1f} ms (자체 {self_us / 1000:6.1f} ms)  {name.rstrip()}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--importtime', choices=list(COMMAND_MODULES), help='해당 명령의 모듈별 임포트 시간 출력')
+    args = parser.parse_args()
+
+    kstock = os.path.join(ROOT, 'kstock.py')
+    rows = [('python -c pass (인터프리터 시작)', run_best([sys.executable, '-c', 'pass'], args.repeat), False)]
+    rows.append(('kstock.py --help', run_best([sys.executable, kstock, '--help'], args.repeat), True))
+    rows.append(('kstock.py macro --help', run_best([sys.executable, kstock, 'macro', '--help'], args.repeat), True))
+    with tempfile.TemporaryDirectory() as workdir:
+        seed_macro_cache(workdir)
+        rows.append(('kstock.py macro (캐시)', run_best([sys.executable, kstock, 'macro'], args.repeat, cwd=workdir), True))
+    for command, modules in COMMAND_MODULES.items():
+        rows.append((f'{command} 임포트', run_best(import_cmd(modules), args.repeat), command == 'macro(조회)'))
+    rows.append(('변경 전 임포트 묶음 (' + ', '.join(EAGER_BEFORE) + ')',
+                 run_best(import_cmd(EAGER_BEFORE), args.repeat), False))
+
+    print(f'[새 프로세스 실행 시간] {args.repeat}회 중 최소, 목표 {TARGET_MS}ms 미만 (✔ 표시 항목)')
+    failed = []
+    for label, ms, checked in rows:
+        mark = ('✔' if ms < TARGET_MS else '✘') if checked else ' '
+        print(f'  {mark} {label:60s} {ms:8.0f} ms')
+        if checked and ms >= TARGET_MS:
+            failed.append(label)
+
+    side_effects = check_side_effects()
+    if args.importtime:
+        print_importtime(COMMAND_MODULES[args.importtime])
+    if failed or side_effects:
+        print('\n⚠️ 목표 미달 또는 임포트 부작용: ' + ', '.join(failed + side_effects))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from fixtures import synthetic_fundamentals  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from macro_and_industry_analysis import NUMERIC_COLS, recommend_from_frame  # noqa: E402
+
+# 산업군별 모델 학습: 기존 순차 루프 vs recommend_from_frame(프로세스 풀)
+# - 산업군 n_sectors개 전체(top_k=None)를 학습, 모델 저장소는 매번 새로 만들어 캐시 없이 측정
+# - 두 방식의 추천 결과가 같은지 확인
+
+
+def legacy_recommend(df, econ_status, top_k):
+    # 기존 recommend_stocks_by_industry 본문 (상위 산업군 수만 top_k로, 저장소 없이 매번 학습)
+    df = df.copy()
+    if econ_status == '호황':
+        df['산업점수'] = 0.6 * df['ROE'] + 0.4 * df['영업이익률']
+    else:
+        df['산업점수'] = 0.7 * df['ROE'] - 0.3 * df['부채비율'] / 100
+    top_industries = df.groupby('산업군')['산업점수'].mean().sort_values(ascending=False).head(top_k).index
+    df_top = df[df['산업군'].isin(top_industries)]
+    features = ['PER', 'PBR', 'ROE', '부채비율', '영업이익률', '시가총액']
+    result_df = pd.DataFrame()
+    for industry in top_industries:
+        industry_df = df_top[df_top['산업군'] == industry].copy()
+        if len(industry_df) < 10:
+            continue
+        X_train, X_test, y_train, y_test = train_test_split(
+            industry_df[features], industry_df['3개월수익률'], test_size=0.2, random_state=42)
+        model = RandomForestRegressor(random_state=42).fit(X_train, y_train)
+        industry_df['예측수익률'] = model.predict(industry_df[features])
+        result_df = pd.concat([result_df, industry_df.sort_values('예측수익률', ascending=False).head(3)])
+    return result_df[['회사명', '산업군', '예측수익률', '3개월수익률', 'PER', 'PBR', 'ROE', '부채비율', '영업이익률']]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--sectors', type=int, default=60)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    df = synthetic_fundamentals(args.rows, args.sectors)
+    for col in NUMERIC_COLS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=NUMERIC_COLS + ['산업군'])
+
+    t0 = time.perf_counter()
+    one = legacy_recommend(df, '불황', top_k=1)
+    t_one = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    expected = legacy_recommend(df, '불황', top_k=args.sectors)
+    t_legacy = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        result = recommend_from_frame(df, '불황', ModelRegistry(tmp), top_k=None, max_workers=args.workers)
+        t_pool = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        recommend_from_frame(df, '불황', ModelRegistry(tmp), top_k=None)
+        t_cached = time.perf_counter() - t0
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(one, expected.head(len(one)))
+    print(f'{len(df):,} rows, 산업군 {args.sectors}개 ({os.cpu_count()} cpu)')
+    print(f'기존: 산업군 1개 {t_one:.2f}s | 전체 순차 {t_legacy:.2f}s')
+    print(f'프로세스 풀 {t_pool:.2f}s ({t_legacy / t_pool:.1f}배) | 저장소 재사용 {t_cached:.2f}s | 결과 일치')
+
+
+if __name__ == "__main__":
+    main()
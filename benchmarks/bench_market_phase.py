@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, '시장 국면 분석', '결과 분석'))
+from market_phase_summary import diagnose_market_phase, diagnose_market_phase_series, LOW_FREQ  # noqa: E402
+
+# 날짜별 시장 국면 벡터화 계산 속도 측정 + 스칼라 diagnose_market_phase와 날짜별 결과 비교
+# - 비교 기준: 거래일마다 일간 지표는 원래 값(결측은 None), 월간 지표만 직전 발표값
+
+
+def synthetic_indicators(years=20, seed=0, missing=0.05):
+    # 일간 지표(지수/환율/금리)는 영업일, 월간 지표(기준금리/M2)는 월말에만 값이 있는 시계열
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range('2005-01-03', periods=years * 252)
+    months = pd.date_range(days[0], days[-1], freq='ME')
+
+    def walk(index, start, scale, lo, hi):
+        values = np.clip(start + rng.normal(0, scale, len(index)).cumsum(), lo, hi)
+        values[rng.random(len(index)) < missing] = np.nan  # 조회 실패 구간
+        return pd.Series(values, index=index)
+
+    return {
+        'kospi': walk(days, 2000, 15, 500, 3500),
+        'sp500': walk(days, 4000, 30, 1000, 6000),
+        'vkospi': walk(days, 20, 0.5, 8, 60),
+        'kor_bond3y': walk(days, 2.7, 0.02, 0.5, 6),
+        'us10y': walk(days, 2.7, 0.02, 0.5, 6),
+        'usdkrw': walk(days, 1200, 5, 900, 1600),
+        'base_rate': walk(months, 2.75, 0.1, 0.5, 5),
+        'm2_growth': walk(months, 6, 0.5, 0, 15),
+    }
+
+
+def daily_frame(indicators):
+    # 거래일(일간 지표 날짜) 기준 표: 일간 지표는 채우지 않고, 월간 지표는 그날까지 마지막으로 발표된 값
+    days = indicators['kospi'].index
+    frame = pd.DataFrame({k: v.reindex(days) for k, v in indicators.items() if k not in LOW_FREQ})
+    for k in LOW_FREQ:
+        frame[k] = indicators[k].dropna().reindex(days, method='ffill')
+    return frame
+
+
+def scalar_phases(frame):
+    # 날짜마다 스칼라 함수 호출 (NaN → None)
+    phases = []
+    for row in frame.itertuples(index=False):
+        kwargs = {k: (None if pd.isna(v) else v) for k, v in row._asdict().items()}
+        phases.append(diagnose_market_phase(**kwargs, verbose=False))
+    return pd.Series(phases, index=frame.index, name='phase')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seeds', type=int, default=4, help='스칼라 함수와 비교할 합성 데이터 개수')
+    args = parser.parse_args()
+
+    indicators = synthetic_indicators(args.years)
+    best = float('inf')
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        phase = diagnose_market_phase_series(indicators)
+        best = min(best, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    expected = scalar_phases(daily_frame(indicators))
+    t_scalar = time.perf_counter() - t0
+    print(f'{len(phase):,}일 | 벡터화 {best * 1000:.1f}ms | 스칼라 {t_scalar * 1000:.0f}ms')
+
+    # 여러 합성 데이터에서 날짜별 국면이 스칼라 함수와 같은지 확인 (시드별로 나오는 국면이 다름)
+    counts = pd.Series(0, index=['회복기', '과열기', '침체기', '불황기', '판단불가'])
+    for seed in range(args.seeds):
+        indicators = synthetic_indicators(args.years, seed=seed)
+        phase = diagnose_market_phase_series(indicators)
+        expected = scalar_phases(daily_frame(indicators))
+        pd.testing.assert_series_equal(phase, expected, check_freq=False)
+        counts = counts.add(phase.value_counts(), fill_value=0)
+    print(f'시드 {args.seeds}개 결과 일치')
+    print(counts.astype(int).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stock_ml_predictor import make_ml_dataset  # noqa: E402
+
+# make_ml_dataset 처리 속도(rows/sec) 측정 + 기존 종목별 groupby 루프 구현과 결과 비교
+
+
+def make_ml_dataset_legacy(df_all):
+    # 기존 구현 (종목별 groupby 루프) - 결과 비교 기준
+    dfs = []
+    for code, df in df_all.groupby('code'):
+        df = df.sort_values('날짜').reset_index(drop=True)
+        df['return_3m'] = (df['종가'].shift(-60) - df['종가']) / df['종가']
+        features = df[['시가', '고가', '저가', '종가', '거래량']].copy()
+        features = (features - features.mean()) / features.std()
+        out = features.copy()
+        out['target_reg'] = df['return_3m']
+        out['target_cls'] = (df['return_3m'] > 0.1).astype(int)
+        out['code'] = code
+        out['date'] = df['날짜']
+        dfs.append(out)
+    data = pd.concat(dfs)
+    data = data.dropna(subset=['target_reg'])
+    return data
+
+
+def synthetic_ohlcv(n_tickers, n_days=500, seed=0, missing=0.0):
+    # get_real_stock_data와 같은 long-format (종목마다 상장일이 달라 길이가 다름)
+    # missing: 시가/종가/거래량 중 결측(NaN)으로 바꿀 비율
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=n_days, name='날짜')
+    dfs = []
+    for i in range(n_tickers):
+        n = n_days - int(rng.integers(0, n_days - 80)) if rng.random() < 0.1 else n_days
+        close = (10000 * np.exp(rng.normal(0, 0.02, n).cumsum())).astype('int64')
+        df = pd.DataFrame({
+            '날짜': dates[-n:],
+            '시가': close + rng.integers(-100, 100, n),
+            '고가': close + rng.integers(0, 200, n),
+            '저가': close - rng.integers(0, 200, n),
+            '종가': close,
+            '거래량': rng.integers(10_000, 5_000_000, n),
+            'code': f'{i:06d}',
+        })
+        if missing:
+            for col in ['시가', '종가', '거래량']:
+                df[col] = df[col].astype('float64').mask(rng.random(n) < missing)
+        dfs.append(df)
+    return pd.concat(dfs)
+
+
+def timeit(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, nargs='+', default=[50, 500, 2500])
+    parser.add_argument('--days', type=int, default=500)
+    parser.add_argument('--missing', type=float, default=0.0, help='결측(NaN) 비율 (기존 구현과 결과 비교용)')
+    args = parser.parse_args()
+
+    for n in args.tickers:
+        df_all = synthetic_ohlcv(n, args.days, missing=args.missing)
+        legacy, t_legacy = timeit(make_ml_dataset_legacy, df_all)
+        new, t_new = timeit(make_ml_dataset, df_all)
+        new32, t_new32 = timeit(make_ml_dataset, df_all, dtype=np.float32)
+        pd.testing.assert_frame_equal(new, legacy, check_exact=True)
+        rows = len(df_all)
+        print(f'[{n:>5}종목, {rows:>9,} rows] '
+              f'기존 {rows / t_legacy:>12,.0f} rows/s | '
+              f'벡터화 {rows / t_new:>12,.0f} rows/s | '
+              f'float32 {rows / t_new32:>12,.0f} rows/s '
+              f'({legacy.memory_usage(deep=True).sum() / 2**20:.0f}MB → {new32.memory_usage(deep=True).sum() / 2**20:.0f}MB)')
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import pickle
+import argparse
+import pandas as pd
+from sklearn.metrics import mean_squared_error, accuracy_score
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from bench_ml_dataset import synthetic_ohlcv  # noqa: E402
+from indicators import ML_FEATURE_COLS  # noqa: E402
+from model_backends import BACKENDS  # noqa: E402
+from stock_ml_predictor import make_ml_dataset  # noqa: E402
+from walk_forward import make_folds, split_fold  # noqa: E402
+
+# 모델 백엔드 비교 (같은 walk-forward fold 데이터)
+# - 백엔드별 회귀/분류 모델 학습 시간, 예측 시간(테스트 1000 row당), 모델 크기(pickle), MSE, 정확도
+# - fold는 walk_forward와 같은 분할(월 단위, 학습은 테스트 시작 60영업일 전까지)의 최근 --folds개 평균
+
+
+def run_backend(backend, data, folds):
+    data = data.astype({c: backend.dtype for c in ML_FEATURE_COLS + ['target_reg']})
+    rows = []
+    for fold in folds:
+        train, test = split_fold(data, fold)
+        X, X_test = train[ML_FEATURE_COLS], test[ML_FEATURE_COLS]
+        models = backend.models()
+        t0 = time.perf_counter()
+        models['reg'].fit(X, train['target_reg'])
+        models['cls'].fit(X, train['target_cls'])
+        t_fit = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        pred_reg = models['reg'].predict(X_test)
+        pred_cls = models['cls'].predict(X_test)
+        t_pred = time.perf_counter() - t0
+        rows.append({
+            'fit_s': t_fit,
+            'predict_ms_per_1k': t_pred / len(test) * 1e6,
+            'size_mb': (len(pickle.dumps(models['reg'])) + len(pickle.dumps(models['cls']))) / 1e6,
+            'mse': mean_squared_error(test['target_reg'], pred_reg),
+            'accuracy': accuracy_score(test['target_cls'], pred_cls),
+            'n_train': len(train),
+        })
+    return pd.DataFrame(rows).mean()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=300)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--folds', type=int, default=2)
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    args = parser.parse_args()
+
+    df_all = synthetic_ohlcv(args.tickers, args.days)
+    data = make_ml_dataset(df_all, with_indicators=True).dropna(subset=ML_FEATURE_COLS).reset_index(drop=True)
+    folds = make_folds(data['date'], n_folds=args.folds)
+    print(f'{args.tickers}종목 x {args.days}일, {len(data):,} rows, fold {len(folds)}개, {os.cpu_count()} CPU')
+
+    results = {}
+    for name in args.backends.split(','):
+        results[name] = run_backend(BACKENDS[name], data, folds)
+        print(f'  {name} 완료', flush=True)
+    report = pd.DataFrame(results).T
+    report['n_train'] = report['n_train'].astype(int)
+    print(report.to_string(float_format=lambda x: f'{x:.4f}'))
+    if 'rf' in results:
+        base = results['rf']
+        for name, r in results.items():
+            print(f"{name:>8}: 학습 {base['fit_s'] / r['fit_s']:6.1f}배 빠름, 크기 {base['size_mb'] / r['size_mb']:7.1f}배 작음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from fixtures import MarketFixtures  # noqa: E402
+from ohlcv_store import OHLCVStore  # noqa: E402
+
+# OHLCV 수집 요청 수: 종목별 조회(get_market_ohlcv_by_date) vs 날짜별 전 종목 조회(get_market_ohlcv_by_ticker)
+# - 합성 시세(fixtures.MarketFixtures)로 전체 backfill, 다음 날 하루 갱신을 각각 실행
+# - 요청 수와 로컬 처리 시간, 요청 1회 지연(--latency)을 더한 예상 시간, 두 저장소 내용 일치 확인
+
+
+class Counter:
+    def __init__(self, fn):
+        self.fn = fn
+        self.n = 0
+
+    def __call__(self, *args, **kwargs):
+        self.n += 1
+        return self.fn(*args, **kwargs)
+
+
+def run(root, fx, mode, tickers, start_str, end_str):
+    by_date = Counter(fx.get_market_ohlcv_by_date)
+    by_ticker = Counter(lambda d: fx.get_market_ohlcv_by_ticker(d, market='ALL'))
+    store = OHLCVStore(root, fetcher=by_date, snapshot_fetcher=by_ticker)
+    t0 = time.perf_counter()
+    store.sync(tickers, start_str, end_str, mode=mode)
+    return store, by_date.n + by_ticker.n, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=2500)
+    parser.add_argument('--days', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.2, help='요청 1회 예상 지연 (초)')
+    args = parser.parse_args()
+
+    fx = MarketFixtures(n_tickers=args.tickers, n_days=args.days + 1)
+    dates = pd.bdate_range(end=fx.end, periods=args.days + 1)
+    start_str, backfill_end, update_end = (d.strftime('%Y%m%d') for d in (dates[0], dates[-2], dates[-1]))
+    tickers = fx.codes
+    fx.get_market_ohlcv_by_ticker(start_str)  # 날짜별 색인 미리 생성 (측정에서 제외)
+
+    print(f'{len(tickers)}종목 x {args.days}영업일 backfill → 다음 날 갱신 (요청 1회 {args.latency}s 가정)')
+    stores = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ['ticker', 'date', 'auto']:
+            root = os.path.join(tmp, mode)
+            store, n_backfill, t_backfill = run(root, fx, mode, tickers, start_str, backfill_end)
+            store, n_update, t_update = run(root, fx, mode, tickers, start_str, update_end)
+            stores[mode] = store.load(tickers, start_str, update_end)
+            print(f'[{mode:>6}] backfill {n_backfill:>5}회 {t_backfill:6.1f}s (예상 {t_backfill + n_backfill * args.latency:7.0f}s) | '
+                  f'갱신 {n_update:>5}회 {t_update:5.1f}s (예상 {t_update + n_update * args.latency:6.0f}s)')
+    pd.testing.assert_frame_equal(stores['date'], stores['ticker'])
+    pd.testing.assert_frame_equal(stores['auto'], stores['ticker'])
+    print(f"저장 내용 일치 ({len(stores['ticker']):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
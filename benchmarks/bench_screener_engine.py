@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(HERE), HERE]
+from fixtures import SECTORS  # noqa: E402
+from screener_engine import ValueScreener, is_valid  # noqa: E402
+
+# 장중 일부 종목 PER/PBR 갱신 후 업종별 저평가 종목 재계산
+# - 기존: find_undervalued_stocks (groupby 평균 → merge → 전체 정렬)를 전체 종목에 다시 실행
+# - ValueScreener: 바뀐 종목만 update → 바뀐 업종만 다시 순위
+# - 갱신 전/후 모두 두 방식의 결과(종목, 점수)가 같은지 확인
+
+
+def legacy_undervalued(stock_df, top_n):
+    # 기존 StockScreener.find_undervalued_stocks (self.stock_df 대신 복사본 사용)
+    industry_avg = stock_df.groupby('업종').agg({'PER': 'mean', 'PBR': 'mean'}).\
+        rename(columns={'PER': 'industry_PER', 'PBR': 'industry_PBR'})
+    df = stock_df.merge(industry_avg, on='업종')
+    df['value_score'] = (df['PER'] / df['industry_PER'] + df['PBR'] / df['industry_PBR']) / 2
+    undervalued = df.sort_values('value_score').groupby('업종').head(top_n).sort_values(['업종', 'value_score'])
+    return undervalued[['종목명', '업종', 'PER', 'PBR', 'industry_PER', 'industry_PBR', 'value_score']]
+
+
+def synthetic_stocks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = [f'{i:06d}' for i in range(1, n + 1)]
+    return pd.DataFrame({
+        '종목코드': codes,
+        '종목명': [f'합성종목{c}' for c in codes],
+        '업종': rng.choice(SECTORS, n),
+        'PER': np.round(rng.lognormal(2.5, 0.6, n), 2),
+        'PBR': np.round(rng.lognormal(0.0, 0.5, n), 2),
+    })
+
+
+def check(engine, stock_df, top_n):
+    expected = legacy_undervalued(stock_df, top_n).reset_index(drop=True)
+    result = engine.top_n(top_n)
+    pd.testing.assert_frame_equal(result[['종목명', '업종', 'PER', 'PBR']], expected[['종목명', '업종', 'PER', 'PBR']])
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=2500)
+    parser.add_argument('--changed', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--top-n', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    full = synthetic_stocks(args.tickers)
+    stock_df = full.copy()
+    t0 = time.perf_counter()
+    engine = ValueScreener.from_frame(stock_df)
+    engine.top_n(args.top_n)
+    t_build = time.perf_counter() - t0
+    check(engine, stock_df, args.top_n)
+
+    t_legacy = t_engine = 0.0
+    for _ in range(args.rounds):
+        idx = rng.choice(len(full), args.changed, replace=False)
+        full.loc[idx, 'PER'] = np.round(full.loc[idx, 'PER'] * rng.normal(1, 0.05, args.changed), 2)
+        full.loc[idx, 'PBR'] = np.round(full.loc[idx, 'PBR'] * rng.normal(1, 0.05, args.changed), 2)
+        full.loc[idx[:2], 'PER'] = -1.0  # 적자 전환 → 제외
+
+        t0 = time.perf_counter()
+        stock_df = full[[is_valid(per, pbr) for per, pbr in zip(full['PER'], full['PBR'])]]
+        legacy_undervalued(stock_df, args.top_n)
+        t_legacy += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        engine.update_frame(full.iloc[idx])
+        engine.top_n(args.top_n)
+        t_engine += time.perf_counter() - t0
+        check(engine, stock_df, args.top_n)
+
+    print(f'{args.tickers}종목, 갱신 {args.changed}종목 x {args.rounds}회 | 엔진 생성 {t_build * 1000:.1f}ms')
+    print(f'전체 재계산 {t_legacy / args.rounds * 1000:8.2f}ms/회 | 증분 {t_engine / args.rounds * 1000:6.2f}ms/회 | '
+          f'{t_legacy / t_engine:.1f}배, 결과 일치')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import json
+import numpy as np
+import pandas as pd
+import requests
+from contextlib import contextmanager, ExitStack
+from datetime import datetime
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# 오프라인 벤치마크용 합성 데이터 (pykrx / 네이버 금융 / ECOS / yfinance)
+# - MarketFixtures(n_tickers): 종목 목록, 종목별 OHLCV, 종목 페이지(업종/PER/PBR), 업종 시세, 지수/환율 페이지,
+#   ECOS/Yahoo chart JSON을 seed로 결정적으로 생성
+# - fixtures.patch() 안에서는 requests의 모든 요청이 FixtureAdapter로 가고(네트워크 사용 없음),
+#   pykrx.stock / yfinance.download도 합성 데이터를 반환
+# - 네이버 페이지는 실제 페이지처럼 메뉴/표/스크립트를 채워 넣어 크기를 비슷하게 맞춤 (파싱 비용 측정용)
+
+SECTORS = ['반도체와반도체장비', '제약', '자동차', '화학', '은행', '소프트웨어', '철강', '건설',
+           '디스플레이장비및부품', '전기제품', '기계', '통신장비', '식품', '증권', '게임엔터테인먼트',
+           '생물공학', '항공사', '조선', '전자장비와기기', '에너지장비및서비스']
+
+
+def _filler(seed, n_links=400, n_tables=6, n_rows=40):
+    # 실제 네이버 금융 페이지의 메뉴/시세표/스크립트 분량을 흉내 낸 본문 (약 150KB)
+    rng = np.random.default_rng(seed)
+    parts = ['<div id="menu"><ul>']
+    parts += [f'<li class="m{i % 7}"><a href="/sise/item{i}.naver" onclick="clickcr(this, \'lnb.m{i}\', \'\', \'\', event);">'
+              f'메뉴항목 {i}</a></li>' for i in range(n_links)]
+    parts.append('</ul></div>')
+    for t in range(n_tables):
+        parts.append(f'<table class="type_{t % 3} tb_{t}" summary="시세 정보"><caption>시세표 {t}</caption>'
+                     '<thead><tr>' + ''.join(f'<th scope="col">항목{c}</th>' for c in range(8)) + '</tr></thead><tbody>')
+        for _ in range(n_rows):
+            cells = rng.integers(100, 99999, 8)
+            parts.append('<tr onmouseover="mouseOver(this)" onmouseout="mouseOut(this)">' +
+                         ''.join(f'<td class="number"><span class="tah p11">{v:,}</span></td>' for v in cells) + '</tr>')
+        parts.append('</tbody></table>')
+    parts.append('<script type="text/javascript">' + 'var _d = {"k": [1,2,3], "v": "x"};\n' * 300 + '</script>')
+    return ''.join(parts)
+
+
+def synthetic_fundamentals(n_rows=5000, n_sectors=60, seed=0):
+    """dataSet.xlsx와 같은 컬럼의 합성 재무 데이터 (회사명, 산업군, PER, ..., 3개월수익률, 일부 결측/문자 값 포함)"""
+    rng = np.random.default_rng(seed)
+    sectors = [f'{SECTORS[i % len(SECTORS)]}{i // len(SECTORS) or ""}' for i in range(n_sectors)]
+    df = pd.DataFrame({
+        '종목코드': [f'{i:06d}' for i in range(1, n_rows + 1)],
+        '회사명': [f'합성기업{i}' for i in range(1, n_rows + 1)],
+        '산업군': rng.choice(sectors, n_rows),
+        'PER': np.round(rng.lognormal(2.5, 0.6, n_rows), 2),
+        'PBR': np.round(rng.lognormal(0.0, 0.5, n_rows), 2),
+        'ROE': np.round(rng.normal(8, 6, n_rows), 2),
+        '부채비율': np.round(rng.lognormal(4.5, 0.5, n_rows), 1),
+        '영업이익률': np.round(rng.normal(6, 5, n_rows), 2),
+        '시가총액': rng.integers(100, 500_000, n_rows) * 100_000_000,
+        '3개월수익률': np.round(rng.normal(0.01, 0.12, n_rows), 4),
+    })
+    # 엑셀 원본처럼 숫자 칸에 '-', 'N/A' 같은 문자가 섞인 행
+    bad = rng.random(n_rows) < 0.02
+    df['PER'] = df['PER'].astype(object)
+    df.loc[bad, 'PER'] = rng.choice(['-', 'N/A'], int(bad.sum()))
+    return df
+
+
+class FixtureAdapter(BaseAdapter):
+    """URL(host, path)별 응답 함수로 requests 요청에 답하는 transport (네트워크 없음)"""
+
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = routes  # {(host, path): fn(query dict) -> (status, body bytes, content_type)}
+        self.n_requests = 0
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        handler = self.routes.get((url.hostname, url.path))
+        if handler is None:
+            status, body, content_type = 404, b'not found', 'text/plain'
+        else:
+            status, body, content_type = handler({k: v[0] for k, v in parse_qs(url.query).items()}, url.path)
+        self.n_requests += 1
+        resp = requests.Response()
+        resp.status_code = status
+        resp._content = body
+        resp.headers = CaseInsensitiveDict({'Content-Type': content_type, 'Content-Length': str(len(body))})
+        resp.encoding = 'utf-8'
+        resp.url = request.url
+        resp.request = request
+        resp.reason = 'OK' if status == 200 else 'Not Found'
+        return resp
+
+    def close(self):
+        pass
+
+
+class MarketFixtures:
+    def __init__(self, n_tickers=100, n_days=500, seed=0, end=None):
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.n_days = n_days
+        self.end = pd.Timestamp(end or datetime.today().date())
+        codes = [f'{i:06d}' for i in range(1, n_tickers + 1)]
+        n_kospi = int(np.ceil(n_tickers * 0.6))
+        self.markets = {'KOSPI': codes[:n_kospi], 'KOSDAQ': codes[n_kospi:]}
+        self.names = {code: f'합성종목{code}' for code in codes}
+        self.sectors = {code: SECTORS[int(self.rng.integers(len(SECTORS)))] for code in codes}
+        per = np.round(self.rng.lognormal(2.5, 0.6, n_tickers), 2)
+        per[self.rng.random(n_tickers) < 0.08] *= -1            # 적자 기업
+        pbr = np.round(self.rng.lognormal(0.0, 0.5, n_tickers), 2)
+        missing = self.rng.random(n_tickers) < 0.05             # 투자지표 없는 종목 (ETF/스팩 등)
+        self.per = {c: (None if m else float(v)) for c, v, m in zip(codes, per, missing)}
+        self.pbr = {c: (None if m else float(v)) for c, v, m in zip(codes, pbr, missing)}
+        self._ohlcv = {}
+        self._by_date = None
+        self._filler = _filler(seed)
+
+    @property
+    def codes(self):
+        return self.markets['KOSPI'] + self.markets['KOSDAQ']
+
+    # 1. pykrx
+    def ohlcv(self, code):
+        """종목별 합성 일봉 (날짜 인덱스, pykrx get_market_ohlcv_by_date 형식)"""
+        if code not in self._ohlcv:
+            rng = np.random.default_rng([self.seed, int(code)])
+            dates = pd.bdate_range(end=self.end, periods=self.n_days, name='날짜')
+            n = self.n_days - int(rng.integers(0, self.n_days - 80)) if rng.random() < 0.1 else self.n_days
+            close = (10000 * np.exp(rng.normal(0, 0.02, n).cumsum())).astype('int64')
+            self._ohlcv[code] = pd.DataFrame({
+                '시가': close + rng.integers(-100, 100, n),
+                '고가': close + rng.integers(0, 200, n),
+                '저가': close - rng.integers(0, 200, n),
+                '종가': close,
+                '거래량': rng.integers(10_000, 5_000_000, n),
+            }, index=dates[-n:])
+        return self._ohlcv[code]
+
+    def get_market_ticker_list(self, date=None, market='KOSPI'):
+        return list(self.markets.get(market, []))
+
+    def get_market_ticker_name(self, ticker):
+        return self.names[ticker]
+
+    def get_nearest_business_day_in_a_week(self, date=None, prev=True):
+        day = pd.Timestamp(date or self.end)
+        day = pd.offsets.BDay().rollback(day) if prev else pd.offsets.BDay().rollforward(day)
+        return day.strftime('%Y%m%d')
+
+    def get_market_ohlcv_by_date(self, fromdate, todate, ticker, *args, **kwargs):
+        df = self.ohlcv(ticker)
+        return df.loc[pd.Timestamp(fromdate):pd.Timestamp(todate)]
+
+    def get_market_ohlcv_by_ticker(self, date, market='ALL', *args, **kwargs):
+        """날짜 하나의 전 종목 시세 (pykrx 형식: 티커 인덱스, 휴장일은 전부 0)"""
+        if self._by_date is None:
+            parts = []
+            for code in self.codes:
+                df = self.ohlcv(code)
+                # 등락률: 전일 종가 대비 (%, 소수 둘째 자리)
+                parts.append(df.assign(티커=code, 등락률=(df['종가'].pct_change().fillna(0) * 100).round(2)))
+            long = pd.concat(parts)
+            self._by_date = {d: g.set_index('티커') for d, g in long.groupby(level=0)}
+        codes = self.codes if market == 'ALL' else self.markets.get(market, [])
+        snap = self._by_date.get(pd.Timestamp(date))
+        if snap is None:
+            snap = pd.DataFrame(0, index=pd.Index(codes, name='티커'),
+                                columns=['시가', '고가', '저가', '종가', '거래량', '등락률'])
+        snap = snap[snap.index.isin(codes)].copy()
+        snap['거래대금'] = snap['종가'] * snap['거래량']
+        return snap
+
+    # 2. 네이버 금융 페이지
+    def _page(self, body, first=False):
+        if first:  # 본문 표가 페이지의 첫 번째 표 (pd.read_html(...)[0]으로 읽는 페이지)
+            return ('<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"></head><body>'
+                    f'{body}{self._filler}</body></html>')
+        return ('<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>네이버 금융</title></head>'
+                f'<body><div id="wrap">{self._filler[:len(self._filler) // 2]}'
+                f'<div id="content">{body}</div>{self._filler[len(self._filler) // 2:]}</div></body></html>')
+
+    def item_page(self, code):
+        per, pbr = self.per.get(code), self.pbr.get(code)
+        fmt = lambda v: f'{v:,.2f}' if v is not None else 'N/A'  # noqa: E731
+        per_em = f'<em id="_per">{fmt(per)}</em>' if per is not None else '<em>N/A</em>'
+        pbr_em = f'<em id="_pbr">{fmt(pbr)}</em>' if pbr is not None else '<em>N/A</em>'
+        body = (f'<div class="wrap_company"><h2><a href="#">{self.names.get(code, code)}</a></h2>'
+                f'<div class="description"><span class="code">{code}</span></div></div>'
+                f'<div class="trade_compare"><h4 class="h_sub sub_tit7"><em><a href="/sise/sise_group_detail.naver?type=upjong">'
+                f'{self.sectors.get(code, "기타")}</a></em></h4></div>'
+                '<div class="aside_invest_info"><table class="per_table" summary="PER/EPS 정보">'
+                f'<tr><th scope="row">PER</th><td>{per_em}배</td></tr>'
+                f'<tr><th scope="row">PBR</th><td>{pbr_em}배</td></tr></table></div>')
+        return self._page(body)
+
+    def index_page(self, code):
+        # 첫 번째 표의 첫 행 두 번째 칸이 현재 지수 (pd.read_html(...)[0].iloc[0, 1])
+        value = {'KOSPI': 2650.12, 'KOSDAQ': 845.67}.get(code, 1000.0)
+        body = ('<div class="box_top_sub"><table class="table_kos_index" summary="지수 정보">'
+                '<tr><th>지수</th><th>현재</th><th>전일대비</th></tr>'
+                f'<tr><th scope="row">{code}</th><td><em id="now_value">{value:,.2f}</em></td><td>+1.23</td></tr>'
+                '<tr><th scope="row">거래량</th><td>512,345</td><td>-</td></tr></table></div>')
+        return self._page(body, first=True)
+
+    def exchange_page(self):
+        body = ('<table class="tbl_calculator" summary="환율 정보">'
+                '<thead><tr><th>통화명</th><th>매매기준율</th><th>전일대비</th></tr></thead>'
+                '<tbody><tr><td>미국 USD</td><td>1,378.50</td><td>-2.50</td></tr></tbody></table>')
+        return self._page(body, first=True)
+
+    def sector_page(self):
+        # 업종별 시세: 업종명, 전일대비, 전일대비 등락현황(전체/상승/보합/하락), 구분선 row 포함
+        rng = np.random.default_rng([self.seed, 7])
+        rows = []
+        for i, sector in enumerate(SECTORS * 4):
+            name = sector if i < len(SECTORS) else f'{sector}{i // len(SECTORS)}'
+            change = rng.normal(0, 1.5)
+            counts = rng.integers(0, 40, 3)
+            rows.append(f'<tr><td style="padding-left:10px;"><a href="/sise/sise_group_detail.naver?type=upjong&no={i}">{name}</a></td>'
+                        f'<td class="number"><span class="tah p11 {"red01" if change >= 0 else "nv01"}">{change:+.2f}%</span></td>'
+                        f'<td class="number">{counts.sum()}</td><td class="number">{counts[0]}</td>'
+                        f'<td class="number">{counts[1]}</td><td class="number">{counts[2]}</td></tr>')
+            if i % 5 == 4:
+                rows.append('<tr><td colspan="6" class="blank_08"></td></tr>')
+        body = ('<table class="type_1" summary="업종별 시세 리스트">'
+                '<tr><th>업종명</th><th>전일대비</th><th>전체</th><th>상승</th><th>보합</th><th>하락</th></tr>'
+                + ''.join(rows) + '</table>')
+        return self._page(body, first=True)
+
+    # 3. ECOS / yfinance
+    def ecos_json(self, path):
+        # /api/StatisticSearch/{key}/json/kr/{start}/{end}/{통계코드}/{주기}/{시작}/{끝}/{항목}
+        parts = path.strip('/').split('/')
+        stat, item = parts[7], parts[-1]
+        value = {'722Y001': 3.50, '322Y001': 7.10, '817Y002': {'010200000': 2.41, '010210000': 2.68}.get(item, 3.0)}
+        v = value.get(stat, 1.0)
+        rows = [{'STAT_CODE': stat, 'ITEM_CODE1': item, 'TIME': f'2023{m:02d}', 'DATA_VALUE': f'{v + 0.01 * m:.2f}'}
+                for m in range(1, 6)]
+        return {'StatisticSearch': {'list_total_count': len(rows), 'row': rows}}
+
+    def yahoo_chart(self, symbol, n=5):
+        base = {'USDKRW=X': 1378.5, '^TNX': 42.1, '^GSPC': 5321.4}.get(symbol, 100.0)
+        ts = [int(d.timestamp()) for d in pd.bdate_range(end=self.end, periods=n)]
+        close = [round(base * (1 + 0.001 * i), 4) for i in range(n)]
+        return {'chart': {'result': [{'meta': {'symbol': symbol}, 'timestamp': ts,
+                                      'indicators': {'quote': [{'open': close, 'high': close, 'low': close,
+                                                                'close': close, 'volume': [0] * n}]}}]}}
+
+    def yf_download(self, tickers, period='5d', *args, **kwargs):
+        result = self.yahoo_chart(tickers)['chart']['result'][0]
+        quote = result['indicators']['quote'][0]
+        index = pd.to_datetime(result['timestamp'], unit='s').rename('Date')
+        return pd.DataFrame({c.capitalize(): quote[c] for c in ['open', 'high', 'low', 'close', 'volume']}, index=index)
+
+    # 4. 요청 라우팅 / 패치
+    def routes(self):
+        html = lambda text: (200, text.encode('utf-8'), 'text/html; charset=utf-8')  # noqa: E731
+        naver = 'finance.naver.com'
+        return {
+            (naver, '/item/main.naver'): lambda q, p: html(self.item_page(q.get('code', ''))),
+            (naver, '/sise/sise_index.naver'): lambda q, p: html(self.index_page(q.get('code', 'KOSPI'))),
+            (naver, '/marketindex/exchangeDetail.naver'): lambda q, p: html(self.exchange_page()),
+            (naver, '/sise/sise_group.naver'): lambda q, p: html(self.sector_page()),
+        }
+
+    @contextmanager
+    def patch(self):
+        """requests(네이버/ECOS), pykrx.stock, yfinance.download를 합성 데이터로 대체"""
+        adapter = FixtureAdapter(self.routes())
+        ecos = lambda q, p: (200, json.dumps(self.ecos_json(p)).encode(), 'application/json')  # noqa: E731
+
+        def get_adapter(session, url):
+            host = urlparse(url).hostname
+            if host == 'ecos.bok.or.kr':
+                path = urlparse(url).path
+                adapter.routes.setdefault((host, path), ecos)
+            return adapter
+
+        from pykrx import stock
+        import yfinance as yf
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch.object(requests.Session, 'get_adapter', get_adapter))
+            for name in ['get_market_ticker_list', 'get_market_ticker_name', 'get_nearest_business_day_in_a_week',
+                         'get_market_ohlcv_by_date', 'get_market_ohlcv_by_ticker']:
+                stack.enter_context(mock.patch.object(stock, name, getattr(self, name)))
+            stack.enter_context(mock.patch.object(yf, 'download', self.yf_download))
+            yield adapter
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import glob
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path[:0] = [ROOT, HERE, os.path.join(ROOT, '시장 국면 분석')]
+from fixtures import MarketFixtures  # noqa: E402
+
+# 네트워크 없이 합성 데이터(fixtures.py)로 주요 단계 소요 시간 측정
+# - 규모(종목 수)별로 get_real_stock_data(최초/재실행), make_ml_dataset, walk_forward 학습,
+#   StockScreener.analyze_stocks / find_undervalued_stocks, industry_analysis, 거시 지표 수집 측정
+# - 결과는 benchmarks/results/{커밋}.json에 저장하고, 이전 결과와 단계별로 비교해서 느려진 단계 표시
+# - 작업 디렉터리를 임시 폴더로 바꿔 실행 (OHLCV 저장소, 모델 저장소, TTL 캐시가 매번 비어 있는 상태)
+#
+# 예) python benchmarks/run_suite.py --scales 50 200 --baseline 445a2dc
+
+RESULTS_DIR = os.path.join(HERE, 'results')
+REGRESSION = 1.2  # 기준 대비 이 배수 이상 느려지면 표시
+
+
+def git_commit():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def best_of(fn, repeat):
+    """repeat회 실행 중 가장 짧은 시간 (마지막 실행 결과와 함께 반환)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def bench_scale(n, days, repeat, fit_models):
+    from ttl_cache import clear_cache
+    from ohlcv_store import OHLCVStore
+    from stock_ml_predictor import get_real_stock_data, make_ml_dataset
+    from stock_investment_pipeline import industry_analysis
+    from indicators import ML_FEATURE_COLS
+    from walk_forward import walk_forward
+    from model_registry import ModelRegistry
+    from macro_snapshot import collect_snapshot
+    from test import StockScreener
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+    fx = MarketFixtures(n_tickers=n, n_days=days)
+    results = {}
+    with fx.patch():
+        # 1. 시세 수집: 빈 저장소(최초 실행) / 이미 받아 둔 저장소(재실행)
+        t0 = time.perf_counter()
+        df_all = get_real_stock_data(n_sample=n, store=OHLCVStore())
+        results['get_real_stock_data[cold]'] = time.perf_counter() - t0
+        df_all, results['get_real_stock_data[warm]'] = best_of(
+            lambda: get_real_stock_data(n_sample=n, store=OHLCVStore()), repeat)
+
+        # 2. 데이터셋 / 학습
+        data, results['make_ml_dataset'] = best_of(lambda: make_ml_dataset(df_all, with_indicators=True), repeat)
+        data = data.dropna(subset=ML_FEATURE_COLS).reset_index(drop=True)
+        if fit_models:
+            models = {
+                'lr': LinearRegression(),
+                'reg': RandomForestRegressor(n_estimators=20, random_state=42),
+                'cls': RandomForestClassifier(n_estimators=20, random_state=42),
+            }
+            t0 = time.perf_counter()
+            walk_forward(data, ML_FEATURE_COLS, n_folds=2, models=models, registry=ModelRegistry('registry'))
+            results['walk_forward'] = time.perf_counter() - t0
+
+        # 3. 저평가 종목 스크리닝 (fixture 응답이라 요청 속도 제한은 풀고 파싱/집계 비용만 측정)
+        screener = StockScreener(rate=10**6)
+        t0 = time.perf_counter()
+        screener.analyze_stocks()
+        results['StockScreener.analyze_stocks'] = time.perf_counter() - t0
+        analyzed = screener.stock_df
+
+        def undervalued():
+            screener.stock_df = analyzed
+            return screener.find_undervalued_stocks(top_n=3)
+        _, results['StockScreener.find_undervalued_stocks'] = best_of(undervalued, repeat)
+
+        # 4. 산업 / 거시 지표 (TTL 캐시를 비우고 매번 실제 조회 경로 측정)
+        _, results['industry_analysis'] = best_of(lambda: industry_analysis(top_n=3), repeat)
+
+        def snapshot():
+            clear_cache()
+            return collect_snapshot()
+        _, results['collect_snapshot'] = best_of(snapshot, repeat)
+    return results
+
+
+def load_baseline(ref, current):
+    """ref(커밋 또는 파일 경로)의 결과, 없으면 현재 커밋을 제외한 가장 최근 결과"""
+    if ref:
+        path = ref if os.path.exists(ref) else os.path.join(RESULTS_DIR, f'{ref}.json')
+        if not os.path.exists(path):
+            return None
+    else:
+        paths = [p for p in glob.glob(os.path.join(RESULTS_DIR, '*.json'))
+                 if os.path.basename(p) != f'{current}.json']
+        if not paths:
+            return None
+        path = max(paths, key=os.path.getmtime)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_results(results, baseline):
+    base = baseline['results'] if baseline else {}
+    header = f"{'단계':<42}{'시간(s)':>10}"
+    if baseline:
+        header += f"{'기준(' + baseline['commit'] + ')':>22}{'배수':>8}"
+    print(header)
+    for key, seconds in results.items():
+        line = f'{key:<42}{seconds:>10.4f}'
+        if key in base:
+            ratio = seconds / base[key] if base[key] else float('inf')
+            flag = '  ← 느려짐' if ratio >= REGRESSION else ''
+            line += f'{base[key]:>22.4f}{ratio:>8.2f}{flag}'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', type=int, nargs='+', default=[50, 200], help='종목 수')
+    parser.add_argument('--days', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-fit', action='store_true', help='walk_forward 학습 제외')
+    parser.add_argument('--baseline', help='비교할 커밋 또는 결과 파일 (기본: 가장 최근 결과)')
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.scales:
+            os.chdir(tempfile.mkdtemp(dir=tmp))
+            try:
+                for key, seconds in bench_scale(n, args.days, args.repeat, not args.no_fit).items():
+                    results[f'{key}@{n}'] = seconds
+            finally:
+                os.chdir(cwd)
+
+    baseline = load_baseline(args.baseline, commit)
+    print(f'\n[벤치마크 결과] 커밋 {commit}')
+    print_results(results, baseline)
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f'{commit}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'commit': commit,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'machine': f'{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)',
+                'args': vars(args),
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f'결과 저장: {path}')
+
+
+if __name__ == "__main__":
+    main()
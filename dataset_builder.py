@@ -0,0 +1,142 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import datetime
+from ohlcv_store import OHLCVStore
+from indicators import ML_FEATURE_COLS
+from stock_ml_predictor import make_ml_dataset
+
+# 전 종목 학습 데이터셋을 메모리에 다 올리지 않고 만드는 스트리밍 빌더
+# - 종목을 chunk_size개씩 저장소에서 읽어 특성/타깃 계산 후 Parquet 파일에 row group으로 이어 씀
+#   (정규화/지표/타깃은 모두 종목 단위 계산이라 chunk로 나눠도 전체를 한 번에 만든 결과와 같음)
+# - 메모리 사용량 ≈ chunk 하나의 시세 + 특성 (전체 종목 수와 무관)
+# - 학습은 배치 단위로 읽어서: partial_fit이 있는 모델은 fit_incremental, 일반 모델(랜덤포레스트 등)은
+#   배치마다 같은 비율로 샘플링한 max_rows개로 fit_subsampled
+
+DEFAULT_PATH = os.path.join('data', 'datasets', 'train.parquet')
+TARGET_COLS = ['target_reg', 'target_cls']
+
+
+# 1. 종목 chunk 스트리밍
+def iter_ticker_chunks(store, tickers, start_str, end_str, chunk_size=200, min_rows=80, sync=True):
+    """종목을 chunk_size개씩 (sync 후) 저장소에서 읽어 long-format DataFrame으로 하나씩 반환"""
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i + chunk_size]
+        if sync:
+            store.sync(chunk, start_str, end_str)  # 빠진 날짜만 수집
+        df = store.load(chunk, start_str, end_str, min_rows=min_rows)
+        if len(df):
+            yield df
+
+
+def iter_dataset_chunks(chunks, dtype=np.float32, with_indicators=True, horizons=()):
+    """시세 chunk마다 make_ml_dataset 결과(지표 결측 row 제외)를 하나씩 반환"""
+    for df in chunks:
+        data = make_ml_dataset(df, dtype=dtype, with_indicators=with_indicators, horizons=horizons)
+        if with_indicators:
+            data = data.dropna(subset=ML_FEATURE_COLS)  # 지표 계산 구간이 부족한 초기 row
+        if len(data):
+            yield data.reset_index(drop=True)
+
+
+# 2. Parquet 학습 행렬로 저장
+def write_dataset(chunks, path=DEFAULT_PATH):
+    """데이터셋 chunk들을 Parquet 파일 하나에 이어 쓰고 전체 row 수 반환 (임시 파일에 쓰고 교체)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    writer, n_rows = None, 0
+    try:
+        for data in chunks:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            n_rows += len(data)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError('저장할 데이터가 없습니다.')
+    os.replace(tmp, path)
+    return n_rows
+
+
+def build_dataset(tickers, start_str, end_str, path=DEFAULT_PATH, store=None,
+                  chunk_size=200, min_rows=80, dtype=np.float32, with_indicators=True, sync=True, horizons=()):
+    """tickers 전체의 학습 데이터셋을 chunk 단위로 만들어 path에 저장, row 수 반환
+    horizons를 주면 타깃 기간별 target_reg_{h}, target_cls_{h} 컬럼도 저장"""
+    store = store or OHLCVStore()
+    chunks = iter_ticker_chunks(store, list(tickers), start_str, end_str, chunk_size, min_rows, sync)
+    return write_dataset(iter_dataset_chunks(chunks, dtype, with_indicators, horizons), path)
+
+
+# 3. 배치 단위 읽기 / 학습
+def _date_filter(start=None, end=None):
+    flt = None
+    if start is not None:
+        flt = ds.field('date') >= pd.Timestamp(start)
+    if end is not None:
+        cond = ds.field('date') <= pd.Timestamp(end)
+        flt = cond if flt is None else flt & cond
+    return flt
+
+
+def iter_batches(path=DEFAULT_PATH, columns=None, batch_size=200_000, start=None, end=None):
+    """저장된 데이터셋을 batch_size row씩 DataFrame으로 반환 (columns만, 날짜 구간 start~end만)"""
+    dataset = ds.dataset(path, format='parquet')
+    for batch in dataset.to_batches(columns=columns, filter=_date_filter(start, end), batch_size=batch_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def count_rows(path=DEFAULT_PATH, start=None, end=None):
+    return ds.dataset(path, format='parquet').count_rows(filter=_date_filter(start, end))
+
+
+def fit_incremental(model, features, target='target_reg', path=DEFAULT_PATH, batch_size=200_000,
+                    start=None, end=None, epochs=1, classes=None):
+    """partial_fit이 있는 모델(SGDRegressor, SGDClassifier 등)을 배치 단위로 학습"""
+    for _ in range(epochs):
+        for batch in iter_batches(path, list(features) + [target], batch_size, start, end):
+            batch = batch.dropna(subset=[target])  # horizons로 만든 데이터셋은 기간별로 타깃이 없는 row가 있음
+            if classes is not None:
+                model.partial_fit(batch[features], batch[target], classes=classes)
+            else:
+                model.partial_fit(batch[features], batch[target])
+    return model
+
+
+def fit_subsampled(model, features, target='target_reg', path=DEFAULT_PATH, max_rows=1_000_000,
+                   batch_size=200_000, start=None, end=None, seed=42):
+    """배치마다 같은 비율로 샘플링해서 최대 max_rows개로 일반 모델 학습 (메모리 ≈ max_rows × 특성 수)"""
+    total = count_rows(path, start, end)
+    frac = min(1.0, max_rows / total) if total else 1.0
+    rng = np.random.default_rng(seed)
+    parts = []
+    for batch in iter_batches(path, list(features) + [target], batch_size, start, end):
+        batch = batch.dropna(subset=[target])
+        if frac < 1.0:
+            batch = batch[rng.random(len(batch)) < frac]
+        parts.append(batch)
+    sample = pd.concat(parts, ignore_index=True)
+    return model.fit(sample[features], sample[target])
+
+
+if __name__ == "__main__":
+    # 예) KOSPI+KOSDAQ 전 종목 10년치 학습 데이터셋 생성
+    from pykrx import stock
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--path', default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    today = datetime.today()
+    start_str = f'{today.year - args.years}0101'
+    tickers = stock.get_market_ticker_list(market="KOSPI") + stock.get_market_ticker_list(market="KOSDAQ")
+    n = build_dataset(tickers, start_str, today.strftime('%Y%m%d'), args.path, chunk_size=args.chunk_size)
+    print(f'{len(tickers)}종목 → {n:,} rows 저장: {args.path}')
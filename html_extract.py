@@ -0,0 +1,137 @@
+from typing import Optional
+from dataclasses import dataclass
+
+# 네이버 금융 페이지에서 필요한 값만 빠르게 추출 (lxml 스트리밍 파싱)
+# - pd.read_html(전체 표 → DataFrame)이나 BeautifulSoup html.parser(순수 파이썬) 대신
+#   lxml 파서에 페이지를 조금씩 넣으면서 필요한 요소가 닫히는 즉시 멈춤
+# - 지수/환율/업종 시세 페이지는 첫 번째 표만, 종목 페이지는 업종/PER/PBR 요소만 찾으면 나머지는 파싱하지 않음
+# - 결과는 기존 코드와 같은 값 (pd.read_html(...)[0].iloc[0, 1], BeautifulSoup select 결과)
+
+CHUNK_SIZE = 16 * 1024
+
+
+@dataclass
+class ItemInfo:
+    sector: str = '기타'
+    per: Optional[float] = None
+    pbr: Optional[float] = None
+
+    def as_dict(self):
+        """StockScreener에서 쓰는 {'업종', 'PER', 'PBR'} 형식"""
+        return {'업종': self.sector, 'PER': self.per, 'PBR': self.pbr}
+
+
+@dataclass
+class SectorChange:
+    name: str
+    change_text: str  # 페이지 표기 그대로 (예: '+1.23%')
+    change: float     # 등락률 (%)
+
+
+# 1. 스트리밍 파싱
+def iter_closed(html, tags=None, chunk_size=CHUNK_SIZE):
+    """html을 chunk_size씩 파서에 넣으면서 닫힌 요소를 순서대로 반환 (중간에 그만 읽으면 나머지는 파싱 안 함)"""
+    from lxml import etree
+    parser = etree.HTMLPullParser(events=('end',), tag=tags)
+    for i in range(0, len(html), chunk_size):
+        parser.feed(html[i:i + chunk_size])
+        for _, el in parser.read_events():
+            yield el
+    parser.close()
+    for _, el in parser.read_events():
+        yield el
+
+
+def _text(el):
+    return ''.join(el.itertext()).strip()
+
+
+def _to_float(text):
+    try:
+        return float(text.replace(',', '').replace('%', '').replace('+', ''))
+    except (AttributeError, ValueError):
+        return None
+
+
+# 2. 표
+def first_table(html):
+    """페이지의 첫 번째 <table> 요소"""
+    for el in iter_closed(html, 'table'):
+        return el
+    return None
+
+
+def table_rows(table):
+    """(header, rows): pd.read_html과 같은 규칙으로 헤더 행(thead 또는 맨 앞의 th만 있는 행)과 본문 행 분리
+    셀은 colspan만큼 반복"""
+    header, rows = [], []
+    for tr in table.iter('tr'):
+        cells = [c for c in tr if c.tag in ('td', 'th')]
+        if not cells:
+            continue
+        texts = []
+        for cell in cells:
+            texts.extend([_text(cell)] * int(cell.get('colspan') or 1))
+        if tr.getparent().tag == 'thead' or (not rows and all(c.tag == 'th' for c in cells)):
+            header.append(texts)
+        else:
+            rows.append(texts)
+    return header, rows
+
+
+def extract_first_value(html, row=0, col=1):
+    """첫 번째 표의 본문 row번째 행, col번째 칸의 숫자 (pd.read_html(html)[0].iloc[row, col])"""
+    table = first_table(html)
+    if table is None:
+        return None
+    _, rows = table_rows(table)
+    if row >= len(rows) or col >= len(rows[row]):
+        return None
+    return _to_float(rows[row][col])
+
+
+# 3. 네이버 금융 페이지별 추출
+def extract_item_info(html):
+    """종목 페이지(item/main)의 업종, PER, PBR (div.trade_compare > h4 > em > a, #_per, #_pbr)"""
+    info = ItemInfo()
+    found_sector = False
+    per = pbr = None
+    for el in iter_closed(html, ('a', 'em')):
+        if el.tag == 'a' and not found_sector:
+            em = el.getparent()
+            h4 = em.getparent() if em is not None else None
+            div = h4.getparent() if h4 is not None else None
+            if (em.tag == 'em' and h4 is not None and h4.tag == 'h4' and div is not None
+                    and div.tag == 'div' and 'trade_compare' in (div.get('class') or '').split()):
+                info.sector = _text(el)
+                found_sector = True
+        elif el.tag == 'em' and el.get('id') == '_per' and per is None:
+            per = _text(el)
+        elif el.tag == 'em' and el.get('id') == '_pbr' and pbr is None:
+            pbr = _text(el)
+        if found_sector and per is not None and pbr is not None:
+            break
+    try:
+        info.per = float(per.replace(',', '')) if per is not None else None
+        info.pbr = float(pbr.replace(',', '')) if pbr is not None else None
+    except ValueError:
+        info.per, info.pbr = None, None
+    return info
+
+
+def extract_sector_changes(html):
+    """업종별 시세 페이지(sise_group)의 [SectorChange], 페이지 순서 그대로 (구분선/수치 없는 행 제외)"""
+    table = first_table(html)
+    if table is None:
+        return []
+    header, rows = table_rows(table)
+    columns = header[0] if header else rows.pop(0)
+    i_name, i_change = columns.index('업종명'), columns.index('전일대비')
+    result = []
+    for cells in rows:
+        if len(cells) <= max(i_name, i_change) or not cells[i_change]:
+            continue
+        change = _to_float(cells[i_change])
+        if change is not None:
+            result.append(SectorChange(cells[i_name], cells[i_change], change))
+    return result
@@ -0,0 +1,157 @@
+import os
+import json
+import hashlib
+import threading
+from urllib.parse import urlparse
+from profiler import count
+
+# 공용 HTTP 클라이언트 (네이버 금융, ECOS 등 모든 수집 함수가 같이 사용)
+# - 연결 풀 하나(HTTPAdapter)를 모든 스레드의 Session이 공유 → 같은 호스트는 keep-alive 연결 재사용
+#   (Session 객체는 스레드 간 공유가 안전하지 않으므로 스레드별로 만들고 adapter만 공유)
+# - 기본 timeout (연결 3초, 읽기 10초), gzip/deflate 요청
+# - 호스트별 동시 요청 수 제한 (per_host), 풀 크기는 pool_size (동시 요청 수 이상으로)
+# - 조건부 요청: 응답에 ETag/Last-Modified가 있으면 본문과 함께 {cache_dir}에 저장해 두고
+#   다음 요청에 If-None-Match/If-Modified-Since를 보냄 → 304면 저장된 본문 사용 (다음 실행에도 유지)
+# - stats(): 요청 수, 304 수, 새 연결 수(TCP/TLS handshake), 받은 바이트(압축 상태 기준)
+# - requests/urllib3는 클라이언트를 만들 때 임포트 (TTL 캐시로 끝나는 실행은 requests를 읽지 않음)
+
+DEFAULT_CACHE_DIR = os.path.join('data', 'cache', 'http')
+DEFAULT_TIMEOUT = (3.05, 10)
+USER_AGENT = 'Mozilla/5.0 (K-StockML)'
+
+
+class HttpClient:
+    def __init__(self, pool_size=16, per_host=8, timeout=DEFAULT_TIMEOUT, cache_dir=DEFAULT_CACHE_DIR,
+                 verify=True, headers=None):
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        self.timeout = timeout
+        self.verify = verify
+        self.per_host = per_host
+        self.cache_dir = cache_dir
+        self.headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'}
+        self.headers.update(headers or {})
+        # pool_block=True: 풀이 다 차면 새 연결을 만들지 않고 반납을 기다림
+        self.adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, pool_block=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._host_limits = {}
+        self._validators = {}  # url -> {'etag', 'last_modified', 'encoding', 'content_type'}
+        self._stats = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+        if not verify:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    # 1. 세션 / 호스트별 제한
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    # 2. 조건부 요청 캐시
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest()[:20])
+
+    def _validator(self, url):
+        if url in self._validators:
+            return self._validators[url]
+        path = self._cache_path(url)
+        try:
+            with open(path + '.json', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._validators[url] = meta
+        return meta
+
+    def _remember(self, url, res):
+        etag, modified = res.headers.get('ETag'), res.headers.get('Last-Modified')
+        if not (etag or modified) or not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(url)
+        with open(path + '.body.tmp', 'wb') as f:
+            f.write(res.content)
+        os.replace(path + '.body.tmp', path + '.body')
+        meta = {'url': url, 'etag': etag, 'last_modified': modified,
+                'encoding': res.encoding, 'content_type': res.headers.get('Content-Type')}
+        with open(path + '.json.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(path + '.json.tmp', path + '.json')
+        self._validators[url] = meta
+
+    def _from_cache(self, url, res, meta):
+        # 304 응답을 저장해 둔 본문의 200 응답으로 바꿈
+        with open(self._cache_path(url) + '.body', 'rb') as f:
+            res._content = f.read()
+        res.status_code = 200
+        res.encoding = meta.get('encoding')
+        if meta.get('content_type'):
+            res.headers['Content-Type'] = meta['content_type']
+        res.from_cache = True
+        return res
+
+    # 3. 요청
+    def get(self, url, params=None, headers=None, timeout=None, verify=None, revalidate=True):
+        """GET (keep-alive 풀, 호스트별 동시 요청 제한, 조건부 요청), requests.Response 반환"""
+        headers = dict(headers or {})
+        meta = self._validator(url) if revalidate and params is None else None
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        count('http_requests')
+        with self._host_limit(url):
+            res = self.session().get(url, params=params, headers=headers, timeout=timeout or self.timeout,
+                                     verify=self.verify if verify is None else verify)
+            res.content  # 본문을 다 읽고 연결을 풀에 반납
+        wire = res.raw.tell() if hasattr(res.raw, 'tell') else len(res.content)
+        with self._lock:
+            self._stats['requests'] += 1  # 완료된 요청 (연결 오류는 제외)
+            self._stats['bytes'] += wire
+        res.from_cache = False
+        if res.status_code == 304 and meta is not None:
+            with self._lock:
+                self._stats['not_modified'] += 1
+            count('http_not_modified')
+            return self._from_cache(url, res, meta)
+        if res.status_code == 200 and params is None:
+            self._remember(url, res)
+        return res
+
+    def stats(self):
+        """{'requests', 'not_modified', 'bytes', 'connections'(새로 연 연결 수)}"""
+        pools = self.adapter.poolmanager.pools
+        pools = [pools[key] for key in pools.keys()]
+        with self._lock:
+            return dict(self._stats, connections=sum(p.num_connections for p in pools))
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """프로세스 공용 클라이언트 (처음 사용할 때 생성)"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
+
+
+def get(url, **kwargs):
+    return default_client().get(url, **kwargs)
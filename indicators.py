@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+# 기술적 지표 엔진 (전 종목을 종목코드/날짜 순으로 이어붙인 배열에서 한 번에 계산)
+# - 이동평균(MA), RSI, ATR, 변동성, 모멘텀, 거래량 z-score, 골든/데드크로스
+# - 롤링 윈도우는 누적합 차이로 계산하고, 종목 경계를 넘는 윈도우는 NaN 처리
+# - 증분 모드: 종목별 최근 LOOKBACK일만 상태로 들고 있다가 새 날짜만 추가 계산 (scoring_service가 매일 점수화에 사용)
+
+MA_WINDOWS = [5, 20, 50, 200]
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+VOL_WINDOW = 20
+MOM_WINDOW = 20
+VOLUME_WINDOW = 20
+CROSS_FAST, CROSS_SLOW = 50, 200
+LOOKBACK = max(MA_WINDOWS + [CROSS_SLOW]) + 1  # 크로스 판단에 전일 MA200까지 필요
+
+INDICATOR_COLS = [f'MA{w}' for w in MA_WINDOWS] + [
+    f'RSI{RSI_WINDOW}', f'ATR{ATR_WINDOW}', f'VOL{VOL_WINDOW}', f'MOM{MOM_WINDOW}',
+    f'VOLZ{VOLUME_WINDOW}', 'GOLDEN_CROSS', 'DEAD_CROSS'
+]
+# ML 특성용: 가격 단위 지표(MA, ATR)는 종가 대비 비율로 변환
+ML_FEATURE_COLS = [f'MA{w}_gap' for w in MA_WINDOWS] + [
+    f'RSI{RSI_WINDOW}', f'ATR{ATR_WINDOW}_pct', f'VOL{VOL_WINDOW}', f'MOM{MOM_WINDOW}',
+    f'VOLZ{VOLUME_WINDOW}', 'GOLDEN_CROSS', 'DEAD_CROSS'
+]
+
+
+# 1. 종목 구간(segment) 단위 기본 연산
+def _sort_order(df):
+    # 종목코드 → 날짜 순 정렬 인덱스와 정렬된 종목 번호
+    code_ids, _ = pd.factorize(df['code'], sort=True)
+    order = np.lexsort((df['날짜'].to_numpy(), code_ids))
+    return order, code_ids[order]
+
+
+def _positions(code_ids):
+    # 종목 순으로 정렬된 배열에서 각 row의 종목 내 순번
+    starts = np.flatnonzero(np.r_[True, code_ids[1:] != code_ids[:-1]])
+    counts = np.diff(np.r_[starts, len(code_ids)])
+    return np.arange(len(code_ids)) - np.repeat(starts, counts), starts, counts
+
+
+def _shift(x, pos, k):
+    # 종목 내 k일 전 값 (shift(k))
+    out = np.full(len(x), np.nan)
+    out[k:] = x[:-k]
+    out[pos < k] = np.nan
+    return out
+
+
+def _segment_matrix(x, pos, counts):
+    # (종목, 종목 내 순번) 2차원 배열, 짧은 종목은 뒤를 NaN으로 채움
+    rows = np.repeat(np.arange(len(counts)), counts)
+    m = np.full((len(counts), counts.max()), np.nan)
+    m[rows, pos] = x
+    return m, rows
+
+
+def _rolling_sum(x, pos, counts, window):
+    # 종목 내 window일 합계, 윈도우에 NaN이 있거나 일수가 부족하면 NaN
+    # 누적합을 종목(행)별로 따로 구하므로 다른 종목/이후 날짜가 추가돼도 기존 값은 그대로 유지됨
+    m, rows = _segment_matrix(x, pos, counts)
+    nan = np.isnan(m)
+    c = np.cumsum(np.where(nan, 0.0, m), axis=1)
+    n_nan = np.cumsum(nan, axis=1)
+    out = c.copy()
+    out[:, window:] -= c[:, :-window]
+    bad = n_nan.copy()
+    bad[:, window:] -= n_nan[:, :-window]
+    out[bad > 0] = np.nan
+    out = out[rows, pos]
+    out[pos < window - 1] = np.nan
+    return out
+
+
+def _rolling_mean(x, pos, counts, window):
+    return _rolling_sum(x, pos, counts, window) / window
+
+
+def _rolling_std(x, pos, starts, counts, window):
+    # 누적합 기반 분산의 자릿수 손실을 줄이기 위해 종목별 첫 유효값을 빼고 계산
+    valid = ~np.isnan(x)
+    first = np.minimum.reduceat(np.where(valid, pos, np.iinfo(pos.dtype).max), starts)
+    first = np.minimum(first, counts - 1)
+    xc = x - np.repeat(np.nan_to_num(x[starts + first]), counts)
+    s1 = _rolling_sum(xc, pos, counts, window)
+    s2 = _rolling_sum(xc ** 2, pos, counts, window)
+    var = (s2 - s1 ** 2 / window) / (window - 1)
+    return np.sqrt(np.maximum(var, 0))
+
+
+# 2. 전체 계산
+def compute_indicators(df):
+    """df(날짜, 종가, code [+ 고가, 저가, 거래량])의 기술적 지표를 df와 같은 row 순서로 반환"""
+    order, code_ids = _sort_order(df)
+    out = _compute_sorted(df.take(order), *_positions(code_ids))
+    # 원래 row 순서로 되돌림
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    return pd.DataFrame({c: out[c][inverse] for c in INDICATOR_COLS}, index=df.index)
+
+
+def _compute_sorted(df, pos, starts, counts):
+    # df는 종목코드 → 날짜 순으로 정렬된 상태
+    close = df['종가'].to_numpy(dtype=np.float64)
+    prev_close = _shift(close, pos, 1)
+
+    out = {}
+    for w in MA_WINDOWS:
+        out[f'MA{w}'] = _rolling_mean(close, pos, counts, w)
+
+    # RSI (상승폭/하락폭의 단순이동평균 기준)
+    diff = close - prev_close
+    gain = _rolling_mean(np.where(np.isnan(diff), np.nan, np.maximum(diff, 0)), pos, counts, RSI_WINDOW)
+    loss = _rolling_mean(np.where(np.isnan(diff), np.nan, np.maximum(-diff, 0)), pos, counts, RSI_WINDOW)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[f'RSI{RSI_WINDOW}'] = np.where(gain + loss > 0, 100 * gain / (gain + loss), 50.0)
+    out[f'RSI{RSI_WINDOW}'][np.isnan(gain)] = np.nan
+
+    # ATR (True Range의 단순이동평균)
+    if '고가' in df and '저가' in df:
+        high = df['고가'].to_numpy(dtype=np.float64)
+        low = df['저가'].to_numpy(dtype=np.float64)
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        out[f'ATR{ATR_WINDOW}'] = _rolling_mean(tr, pos, counts, ATR_WINDOW)
+    else:
+        out[f'ATR{ATR_WINDOW}'] = np.full(len(close), np.nan)
+
+    # 변동성 (일간 수익률 표준편차), 모멘텀 (n일 수익률)
+    ret = close / prev_close - 1
+    out[f'VOL{VOL_WINDOW}'] = _rolling_std(ret, pos, starts, counts, VOL_WINDOW)
+    out[f'MOM{MOM_WINDOW}'] = close / _shift(close, pos, MOM_WINDOW) - 1
+
+    # 거래량 z-score
+    if '거래량' in df:
+        volume = df['거래량'].to_numpy(dtype=np.float64)
+        vol_mean = _rolling_mean(volume, pos, counts, VOLUME_WINDOW)
+        vol_std = _rolling_std(volume, pos, starts, counts, VOLUME_WINDOW)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[f'VOLZ{VOLUME_WINDOW}'] = np.where(vol_std > 0, (volume - vol_mean) / vol_std, 0.0)
+        out[f'VOLZ{VOLUME_WINDOW}'][np.isnan(vol_mean)] = np.nan
+    else:
+        out[f'VOLZ{VOLUME_WINDOW}'] = np.full(len(close), np.nan)
+
+    # 골든/데드크로스 (당일 MA50이 MA200을 상향/하향 돌파)
+    above = out[f'MA{CROSS_FAST}'] > out[f'MA{CROSS_SLOW}']
+    below = out[f'MA{CROSS_FAST}'] < out[f'MA{CROSS_SLOW}']
+    prev_above = _shift(above.astype(np.float64), pos, 1) == 1
+    prev_below = _shift(below.astype(np.float64), pos, 1) == 1
+    valid = ~np.isnan(_shift(out[f'MA{CROSS_SLOW}'], pos, 1))
+    out['GOLDEN_CROSS'] = (above & ~prev_above & valid).astype(np.int8)
+    out['DEAD_CROSS'] = (below & ~prev_below & valid).astype(np.int8)
+    return out
+
+
+def to_features(ind, close):
+    """지표를 종목 간 비교 가능한 ML 특성(ML_FEATURE_COLS)으로 변환"""
+    close = np.asarray(close, dtype=np.float64)
+    feats = pd.DataFrame(index=ind.index)
+    for w in MA_WINDOWS:
+        feats[f'MA{w}_gap'] = close / ind[f'MA{w}'].to_numpy() - 1
+    feats[f'RSI{RSI_WINDOW}'] = ind[f'RSI{RSI_WINDOW}'].to_numpy()
+    feats[f'ATR{ATR_WINDOW}_pct'] = ind[f'ATR{ATR_WINDOW}'].to_numpy() / close
+    for c in [f'VOL{VOL_WINDOW}', f'MOM{MOM_WINDOW}', f'VOLZ{VOLUME_WINDOW}', 'GOLDEN_CROSS', 'DEAD_CROSS']:
+        feats[c] = ind[c].to_numpy()
+    return feats
+
+
+# 3. 증분 모드
+def tail_state(df, lookback=LOOKBACK):
+    """종목별 최근 lookback일만 남긴 상태 (증분 계산용)"""
+    order, code_ids = _sort_order(df)
+    pos, starts, counts = _positions(code_ids)
+    return df.take(order[pos >= np.repeat(counts, counts) - lookback])
+
+
+def append_latest(state, new_rows, lookback=LOOKBACK):
+    """state(tail_state 결과)에 새 날짜 row를 붙여 새 row의 지표만 계산, (지표, 새 상태) 반환"""
+    combined = pd.concat([state, new_rows], ignore_index=True)
+    order, code_ids = _sort_order(combined)
+    # 같은 종목/날짜가 state와 new_rows에 모두 있으면 new_rows 쪽을 사용
+    dates = combined['날짜'].to_numpy()[order]
+    dup = (code_ids[:-1] == code_ids[1:]) & (dates[:-1] == dates[1:])
+    keep = np.r_[~dup, True]
+    order, code_ids = order[keep], code_ids[keep]
+    combined = combined.take(order)
+    pos, starts, counts = _positions(code_ids)
+    out = _compute_sorted(combined, pos, starts, counts)
+
+    is_new = order >= len(state)
+    latest = combined.loc[is_new, ['code', '날짜']].reset_index(drop=True)
+    for c in INDICATOR_COLS:
+        latest[c] = out[c][is_new]
+    return latest, combined[pos >= np.repeat(counts, counts) - lookback].reset_index(drop=True)
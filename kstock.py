@@ -0,0 +1,130 @@
+import os
+import sys
+import argparse
+
+# K-StockML 명령행 도구 (분석 스크립트별 실행부를 하위 명령 하나로 모음)
+#   python kstock.py macro                거시경제 진단 (KOSPI, KOSDAQ, 환율)
+#   python kstock.py phase [--trend]      시장 국면 진단 (8개 지표 동시 수집), --trend면 KOSPI 이동평균 추세도 출력
+#   python kstock.py industry             경기 진단 → 산업군별 추천 종목 (dataSet.xlsx + 산업군별 회귀 모델)
+#   python kstock.py screen               업종 평균 대비 PER/PBR 저평가 종목
+#   python kstock.py train                OHLCV 수집 → 데이터셋 → walk-forward 학습 → 백테스트
+#   python kstock.py predict              최근 fold 모델로 전 종목 점수화 → 추천 종목
+# - 이 파일은 표준 라이브러리만 임포트, 각 명령의 모듈은 실행할 때 임포트
+#   (--help, macro는 pandas/sklearn/pykrx/yfinance를 읽지 않음 → benchmarks/bench_import_time.py)
+# - train/predict는 단계 실행기 사용: 끝난 단계는 저장된 결과 사용, --force 단계명으로 다시 실행
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PHASE_DIR = os.path.join(ROOT, '시장 국면 분석')
+
+
+def _phase_path():
+    # 시장 국면 분석 폴더(패키지가 아닌 스크립트 폴더)의 모듈을 임포트할 수 있게
+    for path in (os.path.join(PHASE_DIR, '결과 분석'), PHASE_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+# 1. 하위 명령
+def cmd_macro(args):
+    from macro_and_industry_analysis import macro_analysis
+    return 0 if macro_analysis() else 1
+
+
+def cmd_phase(args):
+    _phase_path()
+    from macro_snapshot import collect_snapshot
+    from market_phase_summary import diagnose_market_phase
+
+    snapshot = collect_snapshot()
+    for name, error in snapshot.errors.items():
+        print(f'⚠️ {name} 조회 실패: {error}')
+    diagnose_market_phase(**snapshot.as_kwargs())
+    if args.trend:
+        from market_phase_analysis import analyze_kospi_trend, get_kospi_history
+        result = analyze_kospi_trend(get_kospi_history(args.period))
+        print(f"\n[KOSPI 추세] 종가: {result['close']:.2f}, 50일 MA: {result['ma50']:.2f}, "
+              f"200일 MA: {result['ma200']:.2f}")
+        print(f"→ 시장 위치: {result['market_position']}, 추세: {result['trend']}")
+    return 0
+
+
+def cmd_industry(args):
+    from macro_and_industry_analysis import macro_analysis, recommend_stocks_by_industry
+
+    econ_status = args.status or macro_analysis()
+    if not econ_status:
+        return 1
+    recommendations = recommend_stocks_by_industry(econ_status, file_path=args.file, top_k=args.top_k,
+                                                   top_n=args.top_n)
+    print(f"\n[📈 산업군별 추천 종목 상위 {args.top_n}개]")
+    print(recommendations.to_string(index=False))
+    return 0
+
+
+def cmd_screen(args):
+    from test import StockScreener
+
+    screener = StockScreener(max_workers=args.workers, rate=args.rate)
+    print("주식 데이터 분석 중...")
+    screener.analyze_stocks()
+    print(f"\n업종별 저평가 종목 추천 (상위 {args.top_n}개):")
+    print(screener.find_undervalued_stocks(top_n=args.top_n).to_string())
+    return 0
+
+
+def cmd_train(args):
+    from stock_ml_predictor import train
+    train(force=args.force, n_sample=args.n_sample, backend=args.backend)
+    return 0
+
+
+def cmd_predict(args):
+    from stock_ml_predictor import predict
+    predict(force=args.force, n_sample=args.n_sample, backend=args.backend)
+    return 0
+
+
+# 2. 인자
+def build_parser():
+    parser = argparse.ArgumentParser(prog='kstock', description='K-StockML 한국 주식 분석/예측')
+    commands = parser.add_subparsers(dest='command', required=True, metavar='명령')
+
+    p = commands.add_parser('macro', help='거시경제 진단 (KOSPI, KOSDAQ, 원/달러 환율)')
+    p.set_defaults(func=cmd_macro)
+
+    p = commands.add_parser('phase', help='시장 국면 진단 (금리, 지수, 환율, 유동성 8개 지표)')
+    p.add_argument('--trend', action='store_true', help='KOSPI 50/200일 이동평균 추세도 출력 (yfinance)')
+    p.add_argument('--period', default='2y', help='--trend 조회 기간 (기본 2y)')
+    p.set_defaults(func=cmd_phase)
+
+    p = commands.add_parser('industry', help='경기 진단 → 산업군별 추천 종목')
+    p.add_argument('--file', default='dataSet.xlsx', help='재무 데이터 엑셀 (기본 dataSet.xlsx)')
+    p.add_argument('--status', choices=['호황', '불황', '침체'], help='경기 국면 직접 지정 (지정하면 거시경제 조회 생략)')
+    p.add_argument('--top-k', type=int, default=3, help='추천 산업군 수')
+    p.add_argument('--top-n', type=int, default=3, help='산업군별 추천 종목 수')
+    p.set_defaults(func=cmd_industry)
+
+    p = commands.add_parser('screen', help='업종 평균 대비 PER/PBR 저평가 종목')
+    p.add_argument('--top-n', type=int, default=3, help='업종별 추천 종목 수')
+    p.add_argument('--workers', type=int, default=8, help='동시 요청 수')
+    p.add_argument('--rate', type=float, default=10, help='초당 최대 요청 수')
+    p.set_defaults(func=cmd_screen)
+
+    for name, func, text in [('train', cmd_train, 'OHLCV 수집 → walk-forward 학습 → 백테스트'),
+                             ('predict', cmd_predict, '최근 fold 모델로 전 종목 점수화 → 추천 종목')]:
+        p = commands.add_parser(name, help=text)
+        p.add_argument('--n-sample', type=int, default=50, help='KOSPI 앞에서부터 사용할 종목 수')
+        p.add_argument('--backend', help='모델 백엔드 rf | rf_lean | hgb (기본: KSTOCK_MODEL_BACKEND 또는 hgb)')
+        p.add_argument('--force', action='append', default=[], metavar='단계',
+                       help='저장된 결과가 있어도 다시 실행할 단계 (여러 번 지정 가능)')
+        p.set_defaults(func=func)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
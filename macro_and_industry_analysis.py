@@ -1,7 +1,7 @@
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from stock_investment_pipeline import get_kospi_index, get_kosdaq_index, get_usd_krw_exchange_rate
+from market_indices import get_kospi_index, get_kosdaq_index, get_usd_krw_exchange_rate
+
+# 거시경제 진단은 pandas/sklearn 없이 실행 (python kstock.py macro)
+# pandas, sklearn, 모델 저장소는 산업군 추천 함수 안에서 임포트
 
 # 1. 거시경제 분석 (네이버 금융 실시간)
 def macro_analysis():
@@ -28,49 +28,62 @@ def macro_analysis():
     return econ_status
 
 # 2. 산업군 추천 + 머신러닝 기반 종목 추천
-def recommend_stocks_by_industry(econ_status, file_path='dataSet.xlsx'):
-    # 데이터 불러오기
-    df = pd.read_excel(file_path)
-
-    # 수치형 컬럼 정리
-    numeric_cols = ['PER', 'PBR', 'ROE', '부채비율', '영업이익률', '시가총액', '3개월수익률']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    df = df.dropna(subset=numeric_cols + ['산업군'])
+NUMERIC_COLS = ['PER', 'PBR', 'ROE', '부채비율', '영업이익률', '시가총액', '3개월수익률']
+FEATURES = ['PER', 'PBR', 'ROE', '부채비율', '영업이익률', '시가총액']
+TARGET = '3개월수익률'
+RESULT_COLS = ['회사명', '산업군', '예측수익률', '3개월수익률', 'PER', 'PBR', 'ROE', '부채비율', '영업이익률']
+
+def load_fundamentals(file_path='dataSet.xlsx', columns=None):
+    # 데이터 불러오기 (엑셀은 처음 한 번만 읽어 Parquet으로 변환, 원본이 바뀌면 다시 변환)
+    # 수치형 컬럼은 변환할 때 to_numeric(errors='coerce'), 산업군은 category
+    from table_cache import load_table
+    df = load_table(file_path, columns=columns, numeric=NUMERIC_COLS, categorical=['산업군'])
+    return df.dropna(subset=NUMERIC_COLS + ['산업군'])
+
+def recommend_from_frame(df, econ_status, registry=None, top_k=3, top_n=3, max_workers=None):
+    """산업점수 상위 top_k개 산업군마다 회귀 모델로 예측수익률 상위 top_n개 종목 추천
+    산업군별 모델은 프로세스 풀에서 병렬 학습 (max_workers=1이면 순차)"""
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import train_test_split
+    from model_registry import ModelRegistry
 
     # 산업 점수 계산
     if econ_status == '호황':
-        df['산업점수'] = 0.6 * df['ROE'] + 0.4 * df['영업이익률']
+        score = 0.6 * df['ROE'] + 0.4 * df['영업이익률']
     else:
-        df['산업점수'] = 0.7 * df['ROE'] - 0.3 * df['부채비율'] / 100
-
-    # 산업군별 평균 점수 기준 상위 3개 산업군 선정
-    top_industries = df.groupby('산업군')['산업점수'].mean().sort_values(ascending=False).head(3).index
-    df_top = df[df['산업군'].isin(top_industries)]
-
-    # 회귀 모델 학습을 위한 컬럼
-    features = ['PER', 'PBR', 'ROE', '부채비율', '영업이익률', '시가총액']
-    target = '3개월수익률'
-    result_df = pd.DataFrame()
-
-    for industry in top_industries:
-        industry_df = df_top[df_top['산업군'] == industry]
-        if len(industry_df) < 10:
-            continue
-
-        X = industry_df[features]
-        y = industry_df[target]
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-        model = RandomForestRegressor(random_state=42)
-        model.fit(X_train, y_train)
-
-        industry_df['예측수익률'] = model.predict(X)
-
-        top3 = industry_df.sort_values('예측수익률', ascending=False).head(3)
-        result_df = pd.concat([result_df, top3])
-
-    return result_df[['회사명', '산업군', '예측수익률', '3개월수익률', 'PER', 'PBR', 'ROE', '부채비율', '영업이익률']]
+        score = 0.7 * df['ROE'] - 0.3 * df['부채비율'] / 100
+    df = df.assign(산업점수=score)
+
+    # 산업군별 평균 점수 기준 상위 top_k개 산업군 선정 (top_k=None이면 전체)
+    industry_score = df.groupby('산업군', observed=True)['산업점수'].mean().sort_values(ascending=False)
+    top_industries = industry_score.index if top_k is None else industry_score.head(top_k).index
+    groups = dict(list(df[df['산업군'].isin(top_industries)].groupby('산업군', observed=True)))
+    industry_dfs = {industry: groups[industry] for industry in top_industries
+                    if industry in groups and len(groups[industry]) >= 10}
+
+    # 산업군별 모델은 저장소에서 재사용 (데이터/하이퍼파라미터가 바뀐 경우만 재학습)
+    registry = registry or ModelRegistry()
+    jobs = {}
+    for industry, industry_df in industry_dfs.items():
+        X_train, X_test, y_train, y_test = train_test_split(
+            industry_df[FEATURES], industry_df[TARGET], test_size=0.2, random_state=42)
+        jobs[f'industry/{industry}'] = (RandomForestRegressor(random_state=42), X_train, y_train)
+    models = registry.get_or_train_many(jobs, max_workers=max_workers)
+
+    # 산업군별 예측수익률 상위 top_n개를 모아서 한 번에 합치기
+    tops = []
+    for industry, industry_df in industry_dfs.items():
+        pred = models[f'industry/{industry}'].predict(industry_df[FEATURES])
+        tops.append(industry_df.assign(예측수익률=pred).sort_values('예측수익률', ascending=False).head(top_n))
+    if not tops:
+        return pd.DataFrame(columns=RESULT_COLS)
+    return pd.concat(tops)[RESULT_COLS]
+
+def recommend_stocks_by_industry(econ_status, file_path='dataSet.xlsx', registry=None, top_k=3, top_n=3,
+                                 max_workers=None):
+    df = load_fundamentals(file_path, columns=['회사명', '산업군'] + NUMERIC_COLS)
+    return recommend_from_frame(df, econ_status, registry, top_k, top_n, max_workers)
 
 # 3. 실행부
 if __name__ == "__main__":
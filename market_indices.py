@@ -0,0 +1,38 @@
+import http_client
+from ttl_cache import cached, INTRADAY
+from html_extract import extract_first_value
+
+# 네이버 금융 지수/환율 조회 (거시경제 분석, 시장 국면 지표 수집에서 같이 사용)
+# - 표준 라이브러리 + 공용 HTTP 클라이언트/TTL 캐시만 사용 (pandas 등 무거운 패키지를 읽지 않음)
+# - 조회 실패 시 None
+
+
+@cached('kospi_index', ttl=INTRADAY)
+def get_kospi_index():
+    """코스피 지수 가져오기 (네이버 금융)"""
+    try:
+        url = 'https://finance.naver.com/sise/sise_index.naver?code=KOSPI'
+        res = http_client.get(url)
+        return extract_first_value(res.text)  # 첫 번째 표의 첫 행 두 번째 칸
+    except:
+        return None
+
+@cached('kosdaq_index', ttl=INTRADAY)
+def get_kosdaq_index():
+    """코스닥 지수 가져오기 (네이버 금융)"""
+    try:
+        url = 'https://finance.naver.com/sise/sise_index.naver?code=KOSDAQ'
+        res = http_client.get(url)
+        return extract_first_value(res.text)  # 첫 번째 표의 첫 행 두 번째 칸
+    except:
+        return None
+
+@cached('usd_krw', ttl=INTRADAY)
+def get_usd_krw_exchange_rate():
+    """원/달러 환율 (네이버 금융)"""
+    try:
+        url = 'https://finance.naver.com/marketindex/exchangeDetail.naver?marketindexCd=FX_USDKRW'
+        res = http_client.get(url)
+        return extract_first_value(res.text)  # 첫 번째 표의 첫 행 두 번째 칸
+    except:
+        return None
@@ -0,0 +1,103 @@
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable
+
+# walk-forward 예측 모델 백엔드 (회귀 + 분류 모델 묶음)
+# - 모델 dict 키: 'lr'(기준 선형회귀), 'reg'(회귀), 'cls'(분류) → 백엔드와 무관한 이름
+#   (이전 이름 'rf_reg', 'rf_cls'로 저장된 모델은 canonical_models로 읽을 때 바꿈)
+# - 평가 보고서/모델 저장소 메타데이터에는 model_label(모델 묶음)로 백엔드 이름을 같이 기록
+# - rf      : 기존 모델 (sklearn 기본값: 깊이 제한 없는 트리 100개, 단일 코어) → 학습 느리고 파일 수백 MB
+# - rf_lean : 깊이/잎 크기/표본 비율을 제한한 랜덤포레스트
+# - hgb     : 히스토그램 그래디언트 부스팅 (특성을 255개 구간으로 나눠 학습 → 수십만 row도 빠르고 모델이 작음)
+# - 백엔드 선택: 인자 > 환경변수 KSTOCK_MODEL_BACKEND > DEFAULT_BACKEND
+#   (모델 설정이 바뀌면 params_fingerprint가 달라지므로 저장소의 fold 모델은 자동으로 다시 학습)
+# - sklearn은 모델을 만들 때 임포트 (모듈 임포트만으로는 sklearn을 읽지 않음)
+# - n_jobs 기본값 None(단일 스레드): walk_forward/ModelRegistry가 fold(모델)마다 프로세스를 하나씩 쓰므로
+#   스레드 수 = 워커 수 (프로세스 풀 없이 학습할 때만 make_models(n_jobs=-1))
+
+DEFAULT_BACKEND = 'hgb'
+MODEL_ALIASES = {'rf_reg': 'reg', 'rf_cls': 'cls'}  # 이전 키 -> 현재 키
+
+
+@dataclass
+class Backend:
+    name: str
+    description: str
+    factory: Callable[[int], dict]  # n_jobs -> {이름: 모델}
+    dtype: type = np.float32  # 학습 데이터 dtype (make_ml_dataset(dtype=...))
+
+    def models(self, n_jobs=None):
+        return self.factory(n_jobs)
+
+
+def _rf(n_jobs=None):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+    return {
+        'lr': LinearRegression(),
+        'reg': RandomForestRegressor(n_jobs=n_jobs, random_state=42),
+        'cls': RandomForestClassifier(n_jobs=n_jobs, random_state=42),
+    }
+
+
+def _rf_lean(n_jobs=None):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+    params = dict(n_estimators=100, max_depth=12, min_samples_leaf=20, max_samples=0.5,
+                  n_jobs=n_jobs, random_state=42)
+    return {
+        'lr': LinearRegression(),
+        'reg': RandomForestRegressor(max_features=0.5, **params),
+        'cls': RandomForestClassifier(max_features='sqrt', **params),
+    }
+
+
+def _hgb(n_jobs=None):
+    # HistGradientBoosting은 n_jobs 인자가 없음 (OpenMP 스레드 수는 walk_forward.fit_fold에서 제한)
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import HistGradientBoostingRegressor, HistGradientBoostingClassifier
+    params = dict(max_iter=200, learning_rate=0.05, max_leaf_nodes=31, min_samples_leaf=50,
+                  l2_regularization=1.0, early_stopping=False, random_state=42)
+    return {
+        'lr': LinearRegression(),
+        'reg': HistGradientBoostingRegressor(**params),
+        'cls': HistGradientBoostingClassifier(**params),
+    }
+
+
+BACKENDS = {
+    'rf': Backend('rf', 'RandomForest 기본값 (기존)', _rf, np.float64),
+    'rf_lean': Backend('rf_lean', 'RandomForest 깊이/잎 제한', _rf_lean),
+    'hgb': Backend('hgb', 'HistGradientBoosting', _hgb),
+}
+
+
+def get_backend(name=None):
+    """이름(없으면 환경변수 KSTOCK_MODEL_BACKEND, 그것도 없으면 DEFAULT_BACKEND)으로 백엔드 선택"""
+    name = name or os.environ.get('KSTOCK_MODEL_BACKEND') or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise KeyError(f'알 수 없는 모델 백엔드: {name} (가능: {", ".join(BACKENDS)})')
+    return BACKENDS[name]
+
+
+def make_models(name=None, n_jobs=None):
+    return get_backend(name).models(n_jobs)
+
+
+def canonical_models(models):
+    """이전 키('rf_reg', 'rf_cls')로 저장된 모델 묶음을 현재 키로"""
+    return {MODEL_ALIASES.get(name, name): model for name, model in models.items()}
+
+
+def model_label(models):
+    """모델 묶음의 백엔드 이름 (등록된 백엔드와 설정이 같으면 'hgb' 등, 아니면 회귀 모델 클래스 이름)"""
+    reg = canonical_models(models)['reg']
+
+    def params(model):
+        return type(model).__name__, {k: v for k, v in model.get_params().items() if k != 'n_jobs'}
+
+    for backend in BACKENDS.values():
+        if params(backend.models()['reg']) == params(reg):
+            return backend.name
+    return type(reg).__name__
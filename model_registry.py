@@ -0,0 +1,134 @@
+import os
+import json
+import hashlib
+import joblib
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+# 학습된 모델 저장소
+# - {root}/{name}.joblib : 모델 (압축 없이 저장 → joblib mmap 로드 가능)
+# - {root}/{name}.json   : 메타데이터 (키, 특성 스키마, 하이퍼파라미터, 저장 시각)
+# - 키 = 학습 데이터 해시 + 모델 하이퍼파라미터 → 둘 중 하나라도 바뀔 때만 재학습
+
+DEFAULT_ROOT = os.path.join('data', 'models', 'registry')
+
+
+def _fit(model, X, y):
+    # 프로세스 풀에서 실행 (모델 하나 = 프로세스 하나, 모델 자체는 n_jobs 설정 그대로)
+    return model.fit(X, y)
+
+
+def data_fingerprint(*frames):
+    """DataFrame/Series 내용(컬럼명 포함) 해시"""
+    h = hashlib.sha1()
+    for df in frames:
+        names = list(df.columns) if isinstance(df, pd.DataFrame) else [df.name]
+        h.update(repr(names).encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:20]
+
+
+def params_fingerprint(model):
+    """모델(또는 {이름: 모델} dict) 종류 + 하이퍼파라미터 해시"""
+    models = model if isinstance(model, dict) else {'': model}
+    h = hashlib.sha1()
+    for name, m in sorted(models.items()):
+        h.update(f'{name}:{type(m).__name__}:{sorted(m.get_params().items())}'.encode())
+    return h.hexdigest()[:20]
+
+
+class ModelRegistry:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._loaded = {}  # name -> (key, model), 프로세스 내 재사용
+
+    def _path(self, name, ext):
+        parts = [p.replace(os.sep, '_') for p in name.split('/')]
+        return os.path.join(self.root, *parts) + ext
+
+    def meta(self, name):
+        """저장된 메타데이터, 없으면 None"""
+        path = self._path(name, '.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def names(self, prefix=''):
+        """저장된 모델 이름 목록 (prefix로 시작하는 것만, 정렬)"""
+        names = []
+        for dirpath, _, files in os.walk(self.root):
+            rel = os.path.relpath(dirpath, self.root)
+            for f in files:
+                if f.endswith('.json'):
+                    name = f[:-len('.json')] if rel == '.' else f"{rel.replace(os.sep, '/')}/{f[:-len('.json')]}"
+                    if name.startswith(prefix):
+                        names.append(name)
+        return sorted(names)
+
+    def is_current(self, name, key):
+        meta = self.meta(name)
+        return meta is not None and meta['key'] == key and os.path.exists(self._path(name, '.joblib'))
+
+    def load(self, name, features=None):
+        """모델을 처음 사용할 때 mmap으로 로드 (features를 주면 저장된 스키마와 비교)"""
+        meta = self.meta(name)
+        if meta is None:
+            raise KeyError(f'등록되지 않은 모델: {name}')
+        if features is not None and list(features) != meta['features']:
+            raise ValueError(f'{name}: 특성 스키마 불일치 {list(features)} != {meta["features"]}')
+        cached = self._loaded.get(name)
+        if cached is None or cached[0] != meta['key']:
+            cached = (meta['key'], joblib.load(self._path(name, '.joblib'), mmap_mode='r'))
+            self._loaded[name] = cached
+        return cached[1]
+
+    def save(self, name, model, key, features, extra=None):
+        models = model if isinstance(model, dict) else {'': model}
+        path = self._path(name, '.joblib')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(model, path + '.tmp')
+        os.replace(path + '.tmp', path)
+        meta = {
+            'key': key,
+            'features': list(features),
+            'params': {n: {'model': type(m).__name__, **m.get_params()} for n, m in models.items()},
+            'saved_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        meta.update(extra or {})
+        with open(self._path(name, '.json.tmp'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1, default=str)
+        os.replace(self._path(name, '.json.tmp'), self._path(name, '.json'))
+        self._loaded[name] = (key, model)
+
+    def get_or_train(self, name, model, X, y):
+        """(X, y, 하이퍼파라미터)가 저장된 것과 같으면 로드, 다르면 학습 후 저장"""
+        key = data_fingerprint(X, y) + params_fingerprint(model)
+        if self.is_current(name, key):
+            return self.load(name, X.columns)
+        model.fit(X, y)
+        self.save(name, model, key, X.columns, {'n_rows': len(X)})
+        return model
+
+    def get_or_train_many(self, jobs, max_workers=None):
+        """{name: (model, X, y)} 중 저장소에 없거나 바뀐 것만 프로세스 풀로 병렬 학습, {name: 모델} 반환"""
+        fitted, todo = {}, {}
+        for name, (model, X, y) in jobs.items():
+            key = data_fingerprint(X, y) + params_fingerprint(model)
+            if self.is_current(name, key):
+                fitted[name] = self.load(name, X.columns)
+            else:
+                todo[name] = key
+        workers = min(max_workers or os.cpu_count() or 1, len(todo))
+        if workers <= 1:  # 학습할 모델이 하나이거나 CPU가 하나면 프로세스 풀 생략
+            results = {name: _fit(*jobs[name]) for name in todo}
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {name: pool.submit(_fit, *jobs[name]) for name in todo}
+                results = {name: f.result() for name, f in futures.items()}
+        for name, model in results.items():
+            X = jobs[name][1]
+            self.save(name, model, todo[name], X.columns, {'n_rows': len(X)})
+            fitted[name] = model
+        return {name: fitted[name] for name in jobs}
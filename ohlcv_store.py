@@ -0,0 +1,269 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from profiler import count
+
+# 일별 OHLCV 로컬 저장소 (종목별 Parquet 파일 + 동기화 범위 manifest)
+# - 종목당 파일 1개: {root}/{code}.parquet (컬럼: 날짜, 시가, 고가, 저가, 종가, 거래량, ..., code)
+# - manifest.json: {code: {'start': 'YYYYMMDD', 'end': 'YYYYMMDD', 'synced': 'YYYYMMDDHHMM'}} 이미 받아둔 구간
+#   (수정주가를 다시 받아 파일을 교체한 종목은 'rebased': 'YYYYMMDDHHMM' 추가 → 저장된 과거 봉을 쓰는 쪽에서 다시 계산)
+# - sync()는 빠진 앞/뒤 구간만 받아오고, load()는 요청 구간을 한 번에 읽어 옴
+# - 수집 방식 두 가지 (sync(mode='auto')는 요청 수가 적은 쪽 선택)
+#   ticker: 종목마다 기간 조회 (get_market_ohlcv_by_date) → 요청 수 = 종목 수 x 빠진 구간 수
+#   date  : 날짜마다 전 종목 조회 (get_market_ohlcv_by_ticker, market='ALL') 후 종목별로 나눠 저장
+#           → 요청 수 = 빠진 영업일 수 (2500종목 x 500일 backfill ≈ 500회, 장 마감 후 매일 갱신 1회)
+#   주의: 날짜별 조회는 KRX 원주가(수정주가 아님), 거래정지 종목은 종가만 있고 시가/고가/저가는 종가로 채움
+# - 수정주가 일관성: 분할/증자 등으로 과거 수정주가가 바뀌면 저장된 과거 봉과 새 봉의 기준이 달라짐
+#   ticker: 이미 저장된 마지막 봉 OVERLAP_DAYS일 전부터 겹쳐 받아서 겹친 날 종가가 저장된 값과 다르면
+#   date  : 새 봉의 등락률로 구한 전일 종가(종가 / (1 + 등락률))가 실제 전일 종가(저장된 봉 또는 앞의 새 봉)와
+#           다르면 (처음 backfill도 포함)
+#   → 그 종목은 이어 붙이지 않고 수정주가 전체 구간을 다시 받아 파일을 교체 (REBASE_TOL: 허용 오차 비율)
+
+DEFAULT_ROOT = os.path.join('data', 'ohlcv')
+MANIFEST_NAME = 'manifest.json'
+OHLCV_COLS = ['시가', '고가', '저가', '종가', '거래량']
+FINAL_AFTER = '1600'  # 이 시각 이후에 받은 당일 봉은 확정된 것으로 봄 (장 마감 15:30)
+OVERLAP_DAYS = 7  # 종목별 조회에서 겹쳐 받는 달력 일수 (확정된 저장 봉이 하나 이상 겹치도록)
+REBASE_TOL = 0.001
+
+
+def _to_date(s):
+    return datetime.strptime(s, '%Y%m%d')
+
+
+def _to_str(d):
+    return d.strftime('%Y%m%d')
+
+
+class OHLCVStore:
+    def __init__(self, root=DEFAULT_ROOT, fetcher=None, snapshot_fetcher=None):
+        """fetcher(start_str, end_str, code) -> 날짜 인덱스 DataFrame (기본값: pykrx)
+        snapshot_fetcher(date_str) -> 종목코드 인덱스 전 종목 DataFrame (기본값: fetcher를 안 주면 pykrx,
+        fetcher만 주면 날짜별 수집 안 함)"""
+        self.root = root
+        if fetcher is None and snapshot_fetcher is None:
+            from pykrx import stock
+            fetcher = stock.get_market_ohlcv_by_date
+            snapshot_fetcher = lambda date_str: stock.get_market_ohlcv_by_ticker(date_str, market='ALL')  # noqa: E731
+        self.fetcher = fetcher
+        self.snapshot_fetcher = snapshot_fetcher
+        os.makedirs(self.root, exist_ok=True)
+        self.manifest = self._read_manifest()
+        self._rebased = set()  # 이번 sync에서 수정주가 전체 구간을 다시 받은 종목
+
+    # 1. manifest / 파일 경로
+    def _manifest_path(self):
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    def _read_manifest(self):
+        path = self._manifest_path()
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        path = self._manifest_path()
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp, path)
+
+    def codes(self):
+        """저장소에 있는 종목코드 목록"""
+        return sorted(self.manifest)
+
+    def path(self, code):
+        return os.path.join(self.root, f'{code}.parquet')
+
+    # 2. 증분 동기화
+    def _is_final(self, meta):
+        # 마지막으로 받은 날(end)의 봉이 장 마감 후에 받은 확정 봉인지
+        return meta.get('synced', '') > meta['end'] + FINAL_AFTER
+
+    def missing_ranges(self, code, start_str, end_str):
+        """code에 대해 아직 받지 않은 (start, end) 구간 목록"""
+        meta = self.manifest.get(code)
+        if meta is None:
+            return [(start_str, end_str)]
+        ranges = []
+        if start_str < meta['start']:
+            ranges.append((start_str, _to_str(_to_date(meta['start']) - timedelta(days=1))))
+        if end_str > meta['end']:
+            # 마지막 날이 장중 미완성 봉일 수 있으면 하루 겹쳐서 다시 받음
+            first = meta['end'] if not self._is_final(meta) else _to_str(_to_date(meta['end']) + timedelta(days=1))
+            ranges.append((first, end_str))
+        elif end_str == meta['end'] and end_str >= _to_str(datetime.today()) and not self._is_final(meta):
+            ranges.append((end_str, end_str))
+        return ranges
+
+    def plan(self, tickers, start_str, end_str):
+        """{종목: 빠진 구간 목록}, 종목별 요청 수, 날짜별 요청 수(빠진 구간의 평일 수)"""
+        missing = {code: self.missing_ranges(code, start_str, end_str) for code in tickers}
+        missing = {code: ranges for code, ranges in missing.items() if ranges}
+        n_ticker = sum(len(r) for r in missing.values())
+        days = set()
+        for ranges in missing.values():
+            for s, e in ranges:
+                days.update(pd.bdate_range(_to_date(s), _to_date(e)).strftime('%Y%m%d'))
+        return missing, n_ticker, sorted(days)
+
+    def sync(self, tickers, start_str, end_str, mode='auto'):
+        """tickers의 빠진 구간만 받아서 저장, 받아온 종목 수 반환
+        mode: 'ticker'(종목별), 'date'(날짜별 전 종목), 'auto'(요청 수가 적은 쪽)"""
+        missing, n_ticker, days = self.plan(tickers, start_str, end_str)
+        if not missing:
+            return 0
+        if mode == 'auto':
+            mode = 'date' if self.snapshot_fetcher is not None and len(days) < n_ticker else 'ticker'
+        self._rebased = set()
+        if mode == 'date':
+            self._sync_by_date(missing, days)
+        else:
+            self._sync_by_ticker(missing)
+        synced = datetime.now().strftime('%Y%m%d%H%M')
+        for code in missing:
+            meta = self.manifest.get(code, {'start': start_str, 'end': end_str})
+            self.manifest[code] = {
+                'start': min(meta['start'], start_str),
+                'end': max(meta['end'], end_str),
+                'synced': synced,
+            }
+            rebased = synced if code in self._rebased else meta.get('rebased')
+            if rebased:
+                self.manifest[code]['rebased'] = rebased
+        self._write_manifest()
+        return len(missing)
+
+    def _sync_by_ticker(self, missing):
+        for code, ranges in missing.items():
+            meta = self.manifest.get(code)
+            parts = []
+            for s, e in ranges:
+                if meta is not None and s >= meta['end']:
+                    s = _to_str(_to_date(meta['end']) - timedelta(days=OVERLAP_DAYS))  # 저장된 봉과 겹쳐 받음
+                df = self.fetcher(s, e, code)
+                count('ohlcv_requests')
+                if df is not None and len(df) > 0:
+                    parts.append(df)
+            if parts and not self._append(code, parts, check=lambda old, new: self._overlap_changed(meta, old, new)):
+                self._rebase(code, ranges)
+
+    def fetch_snapshots(self, days, codes=None):
+        """날짜별 전 종목 시세 → long-format DataFrame (code, 날짜, 시가, 고가, 저가, 종가, 거래량[, 등락률]), 휴장일 제외"""
+        parts = []
+        for day in days:
+            snap = self.snapshot_fetcher(day)
+            count('ohlcv_requests')
+            if snap is None or len(snap) == 0 or (snap[['시가', '고가', '저가', '종가']] == 0).all(axis=None):
+                continue  # 휴장일은 전부 0
+            snap = snap[OHLCV_COLS + (['등락률'] if '등락률' in snap else [])]
+            if codes is not None:
+                snap = snap[snap.index.isin(codes)]
+            parts.append(snap.assign(날짜=pd.Timestamp(_to_date(day))))
+        if not parts:
+            return pd.DataFrame(columns=['code', '날짜'] + OHLCV_COLS)
+        df = pd.concat(parts).rename_axis('code').reset_index()
+        df['날짜'] = df['날짜'].astype('datetime64[ns]')  # 종목별 조회와 같은 dtype
+        # 거래정지 종목: 종가만 있고 시가/고가/저가 0 → 종가로 채움
+        halted = (df['시가'] == 0) & (df['고가'] == 0) & (df['저가'] == 0)
+        for col in ['시가', '고가', '저가']:
+            df.loc[halted, col] = df.loc[halted, '종가']
+        return df
+
+    def _sync_by_date(self, missing, days):
+        df = self.fetch_snapshots(days, set(missing))
+        for code, rows in df.groupby('code', sort=False):
+            dates = rows['날짜']
+            keep = pd.Series(False, index=rows.index)
+            for s, e in missing[code]:
+                keep = keep | ((dates >= pd.Timestamp(_to_date(s))) & (dates <= pd.Timestamp(_to_date(e))))
+            rows = rows[keep]
+            if not len(rows):
+                continue
+            prev = None
+            if '등락률' in rows:
+                prev = pd.Series((rows['종가'] / (1 + rows['등락률'] / 100)).to_numpy(), index=rows['날짜'])
+            check = lambda old, new, prev=prev: self._prev_close_changed(old, new, prev)  # noqa: E731
+            if not self._append(code, [rows.set_index('날짜')[OHLCV_COLS]], check=check):
+                self._rebase(code, missing[code])
+
+    # 3. 수정주가 기준 확인
+    def _overlap_changed(self, meta, old, new):
+        # 종목별 조회: 겹쳐 받은 날의 종가가 저장된 값과 다른지 (마지막 날이 장중 미완성 봉이면 그날은 제외)
+        if meta is None:
+            return False
+        old = old[old['날짜'].isin(new['날짜'])]
+        if not self._is_final(meta):
+            old = old[old['날짜'] < pd.Timestamp(_to_date(meta['end']))]
+        fetched = new.set_index('날짜')['종가'].reindex(old['날짜']).to_numpy(dtype=float)
+        return bool((abs(fetched / old['종가'].to_numpy(dtype=float) - 1) > REBASE_TOL).any())
+
+    def _prev_close_changed(self, old, new, prev):
+        # 날짜별 조회: 새 봉마다 등락률로 구한 전일 종가가 실제 전일 종가(저장된 봉 또는 앞의 새 봉)와 다른지
+        # (파일이 없는 처음 backfill도 새 봉끼리 비교 → 구간 안의 분할/증자도 감지)
+        if prev is None:
+            return False
+        closes = pd.concat([old[['날짜', '종가']], new[['날짜', '종가']]]) if len(old) else new[['날짜', '종가']]
+        closes = closes.drop_duplicates(subset='날짜', keep='last').sort_values('날짜').set_index('날짜')['종가']
+        actual = closes.shift(1).reindex(prev.index).to_numpy(dtype=float)
+        implied = prev.to_numpy(dtype=float)
+        valid = ~np.isnan(actual) & (actual > 0)
+        return bool((abs(implied[valid] / actual[valid] - 1) > REBASE_TOL).any())
+
+    def _rebase(self, code, ranges):
+        # 저장된 구간과 새 구간 전체를 수정주가로 다시 받아 파일 교체
+        meta = self.manifest.get(code)
+        start = min([s for s, _ in ranges] + ([meta['start']] if meta else []))
+        end = max([e for _, e in ranges] + ([meta['end']] if meta else []))
+        df = self.fetcher(start, end, code)
+        count('ohlcv_requests')
+        count('ohlcv_rebased')
+        if df is not None and len(df) > 0:
+            self._rebased.add(code)
+            if os.path.exists(self.path(code)):
+                os.remove(self.path(code))
+            self._append(code, [df])
+
+    def _append(self, code, parts, check=None):
+        """새 봉을 저장된 봉에 이어 붙여 저장, check(저장된 봉, 새 봉)이 True면 저장하지 않고 False 반환
+        (파일이 없으면 저장된 봉은 빈 DataFrame)"""
+        new = pd.concat(parts).reset_index()
+        new = new.rename(columns={new.columns[0]: '날짜'})
+        new['code'] = code
+        path = self.path(code)
+        old = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame(columns=new.columns)
+        if check is not None and check(old, new.sort_values('날짜')):
+            return False
+        if len(old):
+            new = pd.concat([old, new])
+        new = new.drop_duplicates(subset='날짜', keep='last').sort_values('날짜')
+        tmp = path + '.tmp'
+        pq.write_table(pa.Table.from_pandas(new, preserve_index=False), tmp)
+        os.replace(tmp, path)
+        return True
+
+    # 4. 일괄 로드
+    def load(self, tickers, start_str, end_str, min_rows=0):
+        """요청 구간을 한 번에 읽어 get_real_stock_data와 같은 long-format DataFrame으로 반환"""
+        paths = [self.path(code) for code in tickers if os.path.exists(self.path(code))]
+        if not paths:
+            return pd.DataFrame()
+        dataset = ds.dataset(paths, format='parquet')
+        flt = (ds.field('날짜') >= pd.Timestamp(_to_date(start_str))) & \
+              (ds.field('날짜') <= pd.Timestamp(_to_date(end_str)))
+        df = dataset.to_table(filter=flt).to_pandas()
+        if min_rows:
+            counts = df.groupby('code')['날짜'].transform('size')
+            df = df[counts >= min_rows]
+        # 종목 순서(tickers) → 날짜 순으로 정렬, 인덱스는 종목별 0..n-1 (기존 concat 결과와 동일)
+        order = {code: i for i, code in enumerate(tickers)}
+        df = df.assign(_order=df['code'].map(order)).sort_values(['_order', '날짜'], kind='stable')
+        df = df.drop(columns='_order')
+        df.index = df.groupby('code').cumcount().values
+        return df
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import pstats
+import cProfile
+import resource
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# 파이프라인 단계별 시간/메모리/카운터 측정
+# - span('단계명'): 단계 구간 (with 문 또는 @profiled 데코레이터), 중첩 가능 → 'main/training' 형태로 기록
+# - count('http_requests'), count('rows', n): 실행 전체 + 현재 단계 카운터
+# - profile_run(...)으로 감싼 실행이 끝나면 data/profiles/{이름}-{시각}.json 보고서 저장
+# - 측정 중이 아닐 때 span/count는 전역 변수 하나만 확인하고 바로 반환 (오버헤드 무시 가능)
+# - 환경 변수: KSTOCK_PROFILE=1 측정 켜기, KSTOCK_PROFILE_STAGE=단계명 해당 단계만 cProfile 덤프
+# - tracemalloc 최대 메모리는 프로세스 전체 값 → 다른 스레드의 단계와 겹쳐 실행된 단계는 concurrent=True로 표시하고
+#   peak_mb를 '그 단계가 실행되는 동안의 프로세스 최대 메모리'로 기록 (단계만의 증가량 alloc_mb는 기록하지 않음)
+
+DEFAULT_DIR = os.path.join('data', 'profiles')
+_NULL = nullcontext()
+_active = None  # 현재 측정 중인 Profiler
+
+
+class Profiler:
+    def __init__(self, name, memory=True, cprofile_stage=None, out_dir=DEFAULT_DIR):
+        """memory=True면 tracemalloc으로 단계별 최대 메모리 측정 (측정 중에는 할당이 느려짐)"""
+        self.name = name
+        self.memory = memory
+        self.cprofile_stage = cprofile_stage
+        self.out_dir = out_dir
+        self.spans = []
+        self.counters = {}
+        self.started_at = None
+        self.elapsed = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = []  # 실행 중인 단계 record (모든 스레드)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    # 1. 단계 구간
+    @contextmanager
+    def span(self, name):
+        stack = self._stack()
+        path = '/'.join([s['stage'] for s in stack] + [name])
+        record = {'stage': path, 'counters': {}, 'peak_mb': None}
+        own = {id(frame['record']) for frame in stack}
+        with self._lock:
+            others = [r for r in self._open if id(r) not in own]  # 다른 스레드에서 실행 중인 단계
+            if others:
+                record['concurrent'] = True
+                for r in others:
+                    r['concurrent'] = True
+            if self.memory and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                for r in self._open:  # 실행 중인 단계들의 최대값을 넘겨주고 이 단계 기준으로 초기화
+                    r['_peak'] = max(r.get('_peak', 0), peak)
+                tracemalloc.reset_peak()
+                record['_start_mem'] = current
+            self._open.append(record)
+        prof = None
+        if self.cprofile_stage in (name, path):
+            prof = cProfile.Profile()
+            prof.enable()
+        stack.append({'stage': name, 'record': record})
+        with self._lock:
+            self.spans.append(record)  # 시작 순서대로 기록
+        t0 = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - t0, 6)
+            if prof is not None:
+                prof.disable()
+                record['cprofile'] = self._dump_cprofile(prof, path)
+            stack.pop()
+            with self._lock:
+                self._open.remove(record)
+                if '_start_mem' in record:
+                    peak = max(tracemalloc.get_traced_memory()[1], record.pop('_peak', 0))
+                    start_mem = record.pop('_start_mem')
+                    record['peak_mb'] = round(peak / 2**20, 1)
+                    if not record.get('concurrent'):
+                        record['alloc_mb'] = round((peak - start_mem) / 2**20, 1)
+
+    # 2. 카운터
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        stack = getattr(self._local, 'stack', None)
+        if stack:
+            counters = stack[-1]['record']['counters']
+            counters[name] = counters.get(name, 0) + n
+
+    # 3. 보고서
+    def _dump_cprofile(self, prof, path):
+        os.makedirs(self.out_dir, exist_ok=True)
+        out = os.path.join(self.out_dir, f"{self.name}-{path.replace('/', '.')}.prof")
+        prof.dump_stats(out)
+        # 누적 시간 상위 함수 요약 (전체 결과는 .prof 파일: python -m pstats 또는 snakeviz로 확인)
+        stats = pstats.Stats(prof).stats
+        top = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:15]
+        return {
+            'path': out,
+            'top': [{'func': f'{f}:{line}({fn})', 'calls': nc, 'tottime': round(tt, 6), 'cumtime': round(ct, 6)}
+                    for (f, line, fn), (cc, nc, tt, ct, callers) in top],
+        }
+
+    def report(self):
+        return {
+            'name': self.name,
+            'started_at': self.started_at,
+            'seconds': self.elapsed,
+            'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'counters': dict(self.counters),
+            'stages': list(self.spans),
+        }
+
+    def dump(self, path=None):
+        if path is None:
+            path = os.path.join(self.out_dir, f"{self.name}-{self.started_at.replace(':', '').replace('-', '')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def span(name):
+    """단계 구간 (측정 중이 아니면 아무것도 하지 않음)"""
+    if _active is None:
+        return _NULL
+    return _active.span(name)
+
+
+def count(name, n=1):
+    """카운터 증가 (측정 중이 아니면 아무것도 하지 않음)"""
+    if _active is not None:
+        _active.count(name, n)
+
+
+def profiled(name=None):
+    """함수 전체를 단계 구간으로 측정하는 데코레이터"""
+    def decorator(fn):
+        stage = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            with _active.span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _env_enabled():
+    return os.environ.get('KSTOCK_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+
+@contextmanager
+def profile_run(name, enabled=None, memory=True, cprofile_stage=None, out_dir=DEFAULT_DIR, verbose=True):
+    """실행 전체 측정 후 JSON 보고서 저장 (enabled=None이면 KSTOCK_PROFILE 환경 변수로 결정)"""
+    global _active
+    if enabled is None:
+        enabled = _env_enabled()
+    if not enabled or _active is not None:  # 꺼져 있거나 이미 바깥에서 측정 중
+        yield _active
+        return
+    cprofile_stage = cprofile_stage or os.environ.get('KSTOCK_PROFILE_STAGE') or None
+    prof = Profiler(name, memory, cprofile_stage, out_dir)
+    prof.started_at = datetime.now().isoformat(timespec='seconds')
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _active = prof
+    t0 = time.perf_counter()
+    try:
+        yield prof
+    finally:
+        prof.elapsed = round(time.perf_counter() - t0, 6)
+        _active = None
+        if started_tracing:
+            tracemalloc.stop()
+        path = prof.dump()
+        if verbose:
+            print_report(prof.report())
+            print(f'프로파일 보고서 저장: {path}')
+
+
+def print_report(report):
+    print(f"\n[단계별 소요 시간] {report['name']} 전체 {report['seconds']:.2f}s, 최대 RSS {report['max_rss_mb']:.0f}MB")
+    for s in report['stages']:
+        mem = f"{s['peak_mb']:>8.1f}MB" if s['peak_mb'] is not None else ' ' * 10
+        mem += '*' if s.get('concurrent') else ' '
+        counters = ', '.join(f'{k}={v:,}' for k, v in s['counters'].items())
+        print(f"  {s['stage']:<30} {s['seconds']:>9.3f}s {mem}  {counters}")
+    if any(s.get('concurrent') for s in report['stages']):
+        print('  * 다른 단계와 동시에 실행: 최대 메모리는 실행 중 프로세스 전체 최대값')
+    if report['counters']:
+        print('  전체 카운터:', ', '.join(f'{k}={v:,}' for k, v in report['counters'].items()))
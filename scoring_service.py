@@ -0,0 +1,265 @@
+import os
+import json
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from ohlcv_store import OHLCVStore
+from model_registry import ModelRegistry
+from indicators import compute_indicators, to_features, tail_state, append_latest, LOOKBACK
+from model_backends import canonical_models
+
+# 전 종목 일괄 점수화 (함수 + 로컬 HTTP 엔드포인트)
+# - 저장소에서 기준일까지의 최근 LOOKBACK 거래일만 읽어 종목별 마지막 row의 특성 계산
+# - 가장 최근 walk-forward fold 모델로 전 종목을 predict 한 번에 점수화 후 순위 반환
+# - 모델, 전 종목 최근 시세(warm), 날짜별 전 종목 특성은 메모리에 두고 재사용
+#   (종목 하나의 특성은 다른 종목과 무관하므로 종목 목록이 달라도 같은 날짜 특성을 필터링해서 사용)
+# - 저장소 manifest가 바뀌면(sync로 새 봉/장 마감 확정 봉 저장) 메모리의 시세/특성을 버리고 다시 읽음
+# - 증분 상태: 가장 최근 기준일의 종목별 최근 LOOKBACK 거래일 시세(indicators.tail_state)와 특성을
+#   {저장소}/indicator_state/에 저장 → 다음 기준일에는 그 뒤의 봉만 읽어 append_latest로 새 봉의 지표만 계산
+#   (상태 기준일 봉도 다시 읽어 장중 봉을 확정 봉으로 교체, 수정주가를 다시 받은 종목(manifest 'rebased')과
+#    새 종목은 LOOKBACK 구간을 읽어 다시 계산)
+
+LOOKBACK_DAYS = int(LOOKBACK * 7 / 5) + 30  # LOOKBACK 거래일을 덮는 달력 일수 (휴장일 여유 포함)
+STATE_DIR = 'indicator_state'
+
+
+class ScoringService:
+    def __init__(self, store=None, registry=None, model_name=None):
+        self.store = store or OHLCVStore()
+        self.registry = registry or ModelRegistry()
+        self.model_name = model_name
+        self.models = None
+        self.backend = None
+        self.features = None
+        self.history = None  # warm()으로 읽어 둔 전 종목 최근 시세
+        self.history_range = (None, None)
+        self._feature_cache = {}  # date_str -> 전 종목 최신 특성 row
+        self._store_version = self._manifest_version()
+        self._state = None  # 증분 상태 {'date', 'built', 'tail', 'features'}
+        self._state_lock = threading.Lock()
+
+    def _manifest_version(self):
+        try:
+            return os.stat(self.store._manifest_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_store(self):
+        # 다른 프로세스/스레드가 저장소를 동기화했으면 manifest를 다시 읽고 메모리 시세/특성 무효화
+        version = self._manifest_version()
+        if version != self._store_version:
+            self._store_version = version
+            self.store.manifest = self.store._read_manifest()
+            self.history = None
+            self.history_range = (None, None)
+            self._feature_cache.clear()
+
+    def load_models(self):
+        """가장 최근 walk-forward fold 모델 로드 (model_name을 주면 해당 모델)"""
+        if self.model_name is None:
+            # walk_forward/{fold}만 (walk_forward_horizons의 walk_forward/h{h}/{fold} 제외)
+            names = [n for n in self.registry.names('walk_forward/') if n.count('/') == 1]
+            if not names:
+                raise KeyError('저장된 walk-forward 모델이 없습니다. stock_ml_predictor.main()을 먼저 실행하세요.')
+            self.model_name = names[-1]
+        meta = self.registry.meta(self.model_name)
+        self.features = meta['features']
+        self.backend = meta.get('model')  # 이전 버전으로 저장된 모델은 None
+        self.models = canonical_models(self.registry.load(self.model_name, self.features))
+        return self.models
+
+    def warm(self, date_str=None, extra_days=90):
+        """기준일까지 전 종목 최근 시세(LOOKBACK 거래일 + extra_days)를 메모리에 올리고 특성 계산
+        extra_days 이내의 과거 날짜 요청도 저장소를 다시 읽지 않음"""
+        date_str = date_str or datetime.today().strftime('%Y%m%d')
+        self._check_store()
+        start = datetime.strptime(date_str, '%Y%m%d') - timedelta(days=LOOKBACK_DAYS + extra_days)
+        self.history = self.store.load(self.store.codes(), start.strftime('%Y%m%d'), date_str)
+        self.history_range = (start.strftime('%Y%m%d'), date_str)
+        self._feature_cache.clear()
+        return self.latest_features(date_str)
+
+    def latest_features(self, date_str):
+        """기준일(date_str) 이전 마지막 거래일의 전 종목 특성 row"""
+        self._check_store()
+        if date_str not in self._feature_cache:
+            start = datetime.strptime(date_str, '%Y%m%d') - timedelta(days=LOOKBACK_DAYS)
+            start_str = start.strftime('%Y%m%d')
+            lo, hi = self.history_range
+            with self._state_lock:
+                state = self._load_state()
+                if self.history is not None and lo <= start_str and date_str <= hi:
+                    dates = self.history['날짜']
+                    df = self.history[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(date_str))]
+                elif state is not None and state['date'] <= date_str:
+                    self._feature_cache[date_str] = self._advance_state(state, date_str, start_str)
+                    return self._feature_cache[date_str]
+                else:
+                    df = self.store.load(self.store.codes(), start_str, date_str)
+                if len(df) == 0:
+                    return pd.DataFrame(columns=['code', 'date'])
+                df = df.reset_index(drop=True)
+                feats = _last_features(compute_indicators(df), df)
+                if state is None or state['date'] <= date_str:
+                    self._save_state(date_str, tail_state(df), feats)
+            self._feature_cache[date_str] = feats
+        return self._feature_cache[date_str]
+
+    # 증분 상태
+    def _state_dir(self):
+        return os.path.join(self.store.root, STATE_DIR)
+
+    def _load_state(self):
+        if self._state is None:
+            path = os.path.join(self._state_dir(), 'state.json')
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    meta = json.load(f)
+                self._state = dict(meta,
+                                   tail=pd.read_parquet(os.path.join(self._state_dir(), 'tail.parquet')),
+                                   features=pd.read_parquet(os.path.join(self._state_dir(), 'features.parquet')))
+        return self._state
+
+    def _save_state(self, date_str, tail, feats):
+        root = self._state_dir()
+        os.makedirs(root, exist_ok=True)
+        meta = {'date': date_str, 'built': datetime.now().strftime('%Y%m%d%H%M')}
+        for name, df in [('tail', tail), ('features', feats)]:
+            path = os.path.join(root, f'{name}.parquet')
+            df.reset_index(drop=True).to_parquet(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+        with open(os.path.join(root, 'state.json.tmp'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(os.path.join(root, 'state.json.tmp'), os.path.join(root, 'state.json'))
+        self._state = dict(meta, tail=tail.reset_index(drop=True), features=feats)
+
+    def _advance_state(self, state, date_str, start_str):
+        # 상태 기준일부터 date_str까지의 봉만 읽어 새 봉의 지표 계산
+        tail, feats = state['tail'], state['features']
+        manifest = self.store.manifest
+        # 상태를 만든 뒤 동기화됐거나 상태 기준일 뒤의 봉이 있는 종목만 읽음 (나머지는 바뀐 봉이 없음)
+        codes = [code for code, meta in sorted(manifest.items())
+                 if meta.get('synced', '') >= state['built'] or meta['end'] > state['date']]
+        new = self.store.load(codes, state['date'], date_str) if codes else pd.DataFrame()
+        new = new.reset_index(drop=True) if len(new) else pd.DataFrame(columns=tail.columns)
+        # 1) 수정주가를 다시 받은 종목, 상태에 없는 종목 → LOOKBACK 구간을 읽어 처음부터 계산
+        rebuild = {code for code, meta in manifest.items() if meta.get('rebased', '') >= state['built']}
+        rebuild |= set(new['code']) - set(tail['code'])
+        if rebuild:
+            rebuild = sorted(rebuild)
+            new = new[~new['code'].isin(rebuild)]
+            window = self.store.load(rebuild, start_str, date_str)
+            new = pd.concat([new, window], ignore_index=True) if len(window) else new
+            tail = tail[~tail['code'].isin(rebuild)]
+            feats = feats[~feats['code'].isin(rebuild)]
+        # 2) 새 봉 지표 → 종목별 마지막 봉의 특성으로 교체
+        if len(new):
+            ind, tail = append_latest(tail, new)
+            ind = ind.merge(new[['code', '날짜', '종가']], on=['code', '날짜'])
+            updated = _last_features(ind, ind)
+            feats = pd.concat([feats[~feats['code'].isin(updated['code'])], updated], ignore_index=True)
+        feats = feats[(feats['date'] >= pd.Timestamp(start_str)) & feats['code'].isin(manifest)]
+        feats = feats.sort_values('code', kind='stable').reset_index(drop=True)
+        if len(new) or date_str != state['date']:
+            self._save_state(date_str, tail, feats)
+        return feats
+
+    def score(self, date_str=None, tickers=None):
+        """tickers(기본: 저장소 전체)를 기준일 특성으로 일괄 점수화, 예측 수익률 내림차순 순위 반환"""
+        if self.models is None:
+            self.load_models()
+        date_str = date_str or datetime.today().strftime('%Y%m%d')
+        feats = self.latest_features(date_str)
+        if tickers:
+            feats = feats[feats['code'].isin(tickers)]
+        feats = feats.dropna(subset=self.features)  # 지표 계산 구간이 부족한 종목 제외
+        result = feats[['code', 'date']].copy()
+        if len(feats) == 0:
+            return result
+        X = feats[self.features]
+        result['pred_reg'] = self.models['reg'].predict(X)
+        result['pred_lr'] = self.models['lr'].predict(X)
+        result['pred_cls'] = self.models['cls'].predict(X)
+        result['prob_cls'] = self.models['cls'].predict_proba(X)[:, -1]
+        result = result.sort_values('pred_reg', ascending=False, kind='stable').reset_index(drop=True)
+        result['rank'] = np.arange(1, len(result) + 1)
+        return result
+
+
+def _last_features(ind, df):
+    # 종목별 마지막 row의 지표 → ML 특성 (code, date + 특성 컬럼)
+    df = df.reset_index(drop=True)
+    last = df.groupby('code')['날짜'].idxmax().to_numpy()  # 종목별 마지막 row 위치
+    feats = to_features(ind.reset_index(drop=True).iloc[last], df['종가'].to_numpy()[last])
+    feats.insert(0, 'code', df['code'].to_numpy()[last])
+    feats.insert(1, 'date', df['날짜'].to_numpy()[last])
+    return feats.reset_index(drop=True)
+
+
+def score_universe(date_str=None, tickers=None, store=None, registry=None):
+    """기준일/종목 목록을 받아 순위가 매겨진 예측 결과 반환"""
+    return ScoringService(store, registry).score(date_str, tickers)
+
+
+# 로컬 HTTP 엔드포인트: GET /score?date=YYYYMMDD&tickers=005930,000660&top=20
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/score':
+                self.send_error(404)
+                return
+            query = parse_qs(url.query)
+            date_str = query.get('date', [None])[0]
+            tickers = query['tickers'][0].split(',') if 'tickers' in query else None
+            try:
+                top = int(query['top'][0]) if 'top' in query else None
+                if top is not None and top < 1:
+                    raise ValueError(top)
+                if date_str is not None:
+                    datetime.strptime(date_str, '%Y%m%d')
+            except ValueError:
+                self.send_error(400, 'Bad Request', 'date는 YYYYMMDD, top은 1 이상의 정수')  # 한글은 본문으로
+                return
+            try:
+                result = service.score(date_str, tickers)
+            except Exception as e:
+                self.send_error(500, 'Internal Server Error', str(e))
+                return
+            if top is not None:
+                result = result.head(top)
+            body = json.dumps({
+                'date': date_str,
+                'model': service.model_name,
+                'backend': service.backend,
+                'n': len(result),
+                'predictions': json.loads(result.to_json(orient='records', date_format='iso')),
+            }, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def serve(host='127.0.0.1', port=8000, service=None):
+    service = service or ScoringService()
+    service.load_models()  # 요청 전에 모델 로드 + 최근 시세/특성 준비
+    service.warm()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f'점수화 서버 시작: http://{host}:{server.server_port}/score (모델: {service.model_name})')
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -0,0 +1,127 @@
+import math
+import heapq
+import pandas as pd
+
+# 업종별 저평가 종목 스크리닝 엔진 (증분 갱신)
+# - 업종별 PER/PBR 합계와 종목 수를 유지 → 종목 몇 개의 PER/PBR이 바뀌면 해당 업종 평균만 O(1)로 갱신
+# - value_score = (PER / 업종 평균 PER + PBR / 업종 평균 PBR) / 2 (낮을수록 저평가)
+# - 업종 평균이 바뀌면 그 업종 종목의 점수 순서가 바뀔 수 있으므로, 바뀐 업종만 표시해 두고
+#   조회할 때 그 업종만 힙(heapq.nsmallest)으로 상위 N개를 다시 뽑음 (나머지 업종은 저장된 결과 사용)
+# - 종목 조건은 StockScreener.analyze_stocks와 동일: PER, PBR이 있고 0 < PER < 1000
+# - 업종 평균 PER/PBR이 0 이하이면 비율이 의미 없으므로 그 업종은 점수 NaN, 추천에서 제외
+# - 더하고 빼기를 반복한 합계는 부동소수 오차가 쌓이므로, 바뀐 업종을 다시 뽑을 때 합계도 종목 값으로 다시 계산
+
+RESULT_COLS = ['종목명', '업종', 'PER', 'PBR', 'industry_PER', 'industry_PBR', 'value_score']
+
+
+def _missing(x):
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+
+def is_valid(per, pbr):
+    return not _missing(per) and not _missing(pbr) and 0 < per < 1000
+
+
+class ValueScreener:
+    def __init__(self):
+        self.stocks = {}   # 종목코드 -> (종목명, 업종, PER, PBR)
+        self.sectors = {}  # 업종 -> {'per': PER 합계, 'pbr': PBR 합계, 'n': 종목 수, 'codes': 종목코드 set}
+        self._top = {}     # 업종 -> (뽑은 개수, [(value_score, 종목코드)]) 업종별 상위 종목
+        self._dirty = set()
+
+    @classmethod
+    def from_frame(cls, df):
+        """종목코드, 종목명, 업종, PER, PBR 컬럼 DataFrame으로 생성"""
+        screener = cls()
+        screener.update_frame(df)
+        return screener
+
+    # 1. 갱신
+    def update(self, code, per, pbr, sector=None, name=None):
+        """종목 하나의 PER/PBR(업종, 종목명) 갱신, 조건에 맞지 않으면 제외"""
+        old = self.stocks.get(code)
+        if old is not None:
+            name = name if name is not None else old[0]
+            sector = sector if sector is not None else old[1]
+            self.remove(code)
+        if sector is None or not is_valid(per, pbr):
+            return
+        per, pbr = float(per), float(pbr)
+        agg = self.sectors.setdefault(sector, {'per': 0.0, 'pbr': 0.0, 'n': 0, 'codes': set()})
+        agg['per'] += per
+        agg['pbr'] += pbr
+        agg['n'] += 1
+        agg['codes'].add(code)
+        self.stocks[code] = (name, sector, per, pbr)
+        self._dirty.add(sector)
+
+    def remove(self, code):
+        old = self.stocks.pop(code, None)
+        if old is None:
+            return
+        _, sector, per, pbr = old
+        agg = self.sectors[sector]
+        agg['codes'].discard(code)
+        agg['n'] -= 1
+        if agg['n'] == 0:
+            del self.sectors[sector]
+            self._top.pop(sector, None)
+            self._dirty.discard(sector)
+            return
+        agg['per'] -= per
+        agg['pbr'] -= pbr
+        self._dirty.add(sector)
+
+    def update_frame(self, df):
+        """DataFrame(종목코드, PER, PBR, [업종, 종목명]) 행마다 update"""
+        sectors = df['업종'] if '업종' in df else [None] * len(df)
+        names = df['종목명'] if '종목명' in df else [None] * len(df)
+        for code, per, pbr, sector, name in zip(df['종목코드'], df['PER'], df['PBR'], sectors, names):
+            self.update(code, per, pbr, sector, name)
+
+    # 2. 조회
+    def sector_avg(self, sector):
+        """업종 평균 (PER, PBR)"""
+        agg = self.sectors[sector]
+        return agg['per'] / agg['n'], agg['pbr'] / agg['n']
+
+    def score(self, code):
+        _, sector, per, pbr = self.stocks[code]
+        avg_per, avg_pbr = self.sector_avg(sector)
+        if avg_per <= 0 or avg_pbr <= 0:
+            return float('nan')
+        return (per / avg_per + pbr / avg_pbr) / 2
+
+    def _resum(self, sector):
+        # 증분 합계의 누적 오차 제거 (업종 종목 값으로 다시 합산)
+        agg = self.sectors[sector]
+        agg['per'] = math.fsum(self.stocks[c][2] for c in agg['codes'])
+        agg['pbr'] = math.fsum(self.stocks[c][3] for c in agg['codes'])
+
+    def top_sector(self, sector, n):
+        """업종 내 value_score 하위(저평가) n개 [(value_score, 종목코드)], 업종 평균이 0 이하이면 빈 리스트"""
+        cached = self._top.get(sector)
+        if sector in self._dirty or cached is None or cached[0] < n:
+            if sector in self._dirty:
+                self._resum(sector)
+            avg_per, avg_pbr = self.sector_avg(sector)
+            if avg_per <= 0 or avg_pbr <= 0:
+                scores = []
+            else:
+                scores = (((self.stocks[c][2] / avg_per + self.stocks[c][3] / avg_pbr) / 2, c)
+                          for c in self.sectors[sector]['codes'])
+            cached = (n, heapq.nsmallest(n, scores))
+            self._top[sector] = cached
+            self._dirty.discard(sector)
+        return cached[1][:n]
+
+    def top_n(self, top_n=5):
+        """업종별 저평가 상위 top_n개 (find_undervalued_stocks와 같은 컬럼, 업종 → value_score 순)"""
+        rows = []
+        for sector in sorted(self.sectors):
+            top = self.top_sector(sector, top_n)  # 바뀐 업종은 합계를 다시 계산한 뒤 평균 사용
+            avg_per, avg_pbr = self.sector_avg(sector)
+            for score, code in top:
+                name, _, per, pbr = self.stocks[code]
+                rows.append((name, sector, per, pbr, avg_per, avg_pbr, score))
+        return pd.DataFrame(rows, columns=RESULT_COLS)
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import inspect
+import hashlib
+import joblib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from profiler import span
+
+# 체크포인트 단계 실행기 (작은 DAG)
+# - 단계 = 함수 + 의존 단계 목록, 의존 단계 결과를 같은 이름의 인자로 받음
+# - 단계 결과는 {root}/{단계}.joblib, 메타데이터는 {root}/{단계}.json (키, 결과 해시, 실행 시간)
+# - 키 = 단계 이름 + 함수 소스 + version + params + inputs() 값(예: 오늘 날짜, 원본 파일 해시) + 의존 단계 결과 해시
+#   → 키가 같으면 저장된 결과 사용(건너뜀), 다르면 다시 실행
+#   (의존 단계가 다시 실행돼도 결과 내용이 같으면 다음 단계는 건너뜀)
+# - 서로 의존하지 않는 단계는 스레드 풀에서 동시에 실행
+# - 한 단계가 실패하면 그 단계에 의존하는 단계만 멈추고, 진행 중인 다른 단계는 끝까지 실행해서 저장
+#   → 다시 실행하면 성공한 단계는 건너뛰고 실패한 단계부터 이어서 실행
+# - 함수가 부르는 다른 함수의 코드 변경은 감지하지 않으므로 그런 경우 version을 올리거나 force 사용
+
+DEFAULT_ROOT = os.path.join('data', 'stages')
+
+
+def today():
+    """날짜가 바뀌면 다시 실행할 단계의 inputs (예: 시세/뉴스 수집)"""
+    return datetime.today().strftime('%Y%m%d')
+
+
+def file_fingerprint(path):
+    """원본 파일 내용이 바뀌면 다시 실행할 단계의 inputs"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source(fn):
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        return getattr(fn, '__qualname__', repr(fn))
+
+
+class StageError(RuntimeError):
+    def __init__(self, failed):
+        self.failed = failed  # {단계: 예외}
+        super().__init__('단계 실패: ' + ', '.join(f'{k} ({type(e).__name__}: {e})' for k, e in failed.items()))
+
+
+class Stage:
+    def __init__(self, name, fn, deps=(), params=None, inputs=None, version='1'):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.params = params or {}
+        self.inputs = inputs
+        self.version = version
+
+    def key(self, dep_hashes):
+        h = hashlib.sha1()
+        h.update(f'{self.name}:{self.version}:{sorted(self.params.items())!r}'.encode())
+        h.update(_source(self.fn).encode())
+        if self.inputs is not None:
+            h.update(repr(self.inputs()).encode())
+        for dep in self.deps:
+            h.update(f'{dep}={dep_hashes[dep]}'.encode())
+        return h.hexdigest()[:20]
+
+
+class StageRunner:
+    def __init__(self, name, root=DEFAULT_ROOT, max_workers=4, verbose=True):
+        self.root = os.path.join(root, name)
+        self.max_workers = max_workers
+        self.verbose = verbose
+        self.stages = {}
+        self.status = {}  # 단계 -> 'skipped' | 'ran' | 'failed' | 'blocked'
+
+    def add(self, name, fn, deps=(), params=None, inputs=None, version='1'):
+        for dep in deps:
+            if dep not in self.stages:
+                raise KeyError(f'{name}: 먼저 등록되지 않은 의존 단계 {dep}')
+        self.stages[name] = Stage(name, fn, deps, params, inputs, version)
+        return fn
+
+    def stage(self, name=None, deps=(), params=None, inputs=None, version='1'):
+        """데코레이터: @runner.stage('training', deps=['dataset'])"""
+        return lambda fn: self.add(name or fn.__name__, fn, deps, params, inputs, version)
+
+    # 1. 체크포인트
+    def _paths(self, name):
+        base = os.path.join(self.root, name.replace('/', '_'))
+        return base + '.joblib', base + '.json'
+
+    def _meta(self, name):
+        data_path, meta_path = self._paths(name)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, name, key, value, elapsed):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(name)
+        joblib.dump(value, data_path + '.tmp')
+        digest = file_fingerprint(data_path + '.tmp')[:20]
+        os.replace(data_path + '.tmp', data_path)
+        meta = {'key': key, 'output': digest, 'elapsed': round(elapsed, 3),
+                'saved_at': datetime.now().isoformat(timespec='seconds')}
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + '.tmp', meta_path)
+        return digest
+
+    def load(self, name):
+        """저장된 단계 결과"""
+        return joblib.load(self._paths(name)[0])
+
+    def invalidate(self, *names):
+        for name in names:
+            for path in self._paths(name):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # 2. 실행
+    def _needed(self, targets):
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return [n for n in self.stages if n in needed]  # 등록 순서 = 위상 순서
+
+    def _log(self, msg):
+        if self.verbose:
+            print(f'[stage] {msg}')
+
+    def run(self, targets=None, force=()):
+        """targets(기본: 전체)와 그 의존 단계 실행, {단계: 결과} 반환 (실패 시 StageError)
+        force: 키와 상관없이 다시 실행할 단계"""
+        order = self._needed(targets or list(self.stages))
+        hashes, values, failed = {}, {}, {}
+        self.status = {}
+        pending = list(order)
+        running = {}
+
+        def value_of(name):
+            if name not in values:
+                values[name] = self.load(name)
+            return values[name]
+
+        def execute(stage, key):
+            kwargs = {dep: value_of(dep) for dep in stage.deps}
+            t0 = time.perf_counter()
+            with span(stage.name):
+                value = stage.fn(**kwargs)
+            elapsed = time.perf_counter() - t0
+            return value, self._save(stage.name, key, value, elapsed), elapsed
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(dep in failed or self.status.get(dep) == 'blocked' for dep in stage.deps):
+                        self.status[name] = 'blocked'
+                        pending.remove(name)
+                        self._log(f'{name}: 중단 (의존 단계 실패)')
+                        continue
+                    if not all(dep in hashes for dep in stage.deps):
+                        continue
+                    pending.remove(name)
+                    key = stage.key(hashes)
+                    meta = self._meta(name)
+                    if name not in force and meta is not None and meta['key'] == key:
+                        hashes[name] = meta['output']
+                        self.status[name] = 'skipped'
+                        self._log(f'{name}: 최신 결과 사용')
+                        continue
+                    # 의존 결과 로드는 메인 스레드에서 (같은 결과를 여러 스레드가 동시에 읽지 않도록)
+                    for dep in stage.deps:
+                        value_of(dep)
+                    self._log(f'{name}: 실행')
+                    running[pool.submit(execute, stage, key)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        values[name], hashes[name], elapsed = future.result()
+                        self.status[name] = 'ran'
+                        self._log(f'{name}: 완료 ({elapsed:.1f}s)')
+                    except Exception as e:
+                        failed[name] = e
+                        self.status[name] = 'failed'
+                        self._log(f'{name}: 실패 ({type(e).__name__}: {e})')
+        if failed:
+            raise StageError(failed)
+        return {name: value_of(name) for name in order}
@@ -1,41 +1,10 @@
-import requests
-import pandas as pd
+import http_client
 from datetime import datetime
+from profiler import profile_run
+from html_extract import extract_sector_changes
+from market_indices import get_kospi_index, get_kosdaq_index, get_usd_krw_exchange_rate
 
-# 1. 거시경제 분석 단계
-
-def get_kospi_index():
-    """코스피 지수 가져오기 (네이버 금융)"""
-    try:
-        url = 'https://finance.naver.com/sise/sise_index.naver?code=KOSPI'
-        res = requests.get(url)
-        df = pd.read_html(res.text)[0]
-        price = df.iloc[0, 1]
-        return float(str(price).replace(',', ''))
-    except:
-        return None
-
-def get_kosdaq_index():
-    """코스닥 지수 가져오기 (네이버 금융)"""
-    try:
-        url = 'https://finance.naver.com/sise/sise_index.naver?code=KOSDAQ'
-        res = requests.get(url)
-        df = pd.read_html(res.text)[0]
-        price = df.iloc[0, 1]
-        return float(str(price).replace(',', ''))
-    except:
-        return None
-
-def get_usd_krw_exchange_rate():
-    """원/달러 환율 (네이버 금융)"""
-    try:
-        url = 'https://finance.naver.com/marketindex/exchangeDetail.naver?marketindexCd=FX_USDKRW'
-        res = requests.get(url)
-        df = pd.read_html(res.text)[0]
-        price = df.iloc[0, 1]
-        return float(str(price).replace(',', ''))
-    except:
-        return None
+# 1. 거시경제 분석 단계 (지수/환율 조회는 market_indices)
 
 def get_interest_rate():
     """기준금리, 국고채 3년물 등 (구조만 설계)"""
@@ -73,14 +42,16 @@ def industry_analysis(top_n=3):
     """
     네이버 금융 업종별 시세에서 당일 등락률(전일대비)이 높은 상위 n개 산업군 추천
     """
+    import pandas as pd
     url = 'https://finance.naver.com/sise/sise_group.naver?type=upjong'
-    res = requests.get(url)
-    df = pd.read_html(res.text, header=0)[0]  # 첫 번째 테이블이 업종별 시세
-    df = df.dropna(subset=['전일대비'])
-    # '전일대비' 컬럼에서 %와 +, -, , 제거 후 float 변환
-    df['전일대비(수치)'] = df['전일대비'].astype(str).str.replace('%','').str.replace('+','').str.replace(',','')
-    df['전일대비(수치)'] = pd.to_numeric(df['전일대비(수치)'], errors='coerce')
-    df = df.dropna(subset=['전일대비(수치)'])
+    res = http_client.get(url)
+    # 첫 번째 표(업종별 시세)에서 업종명, 전일대비(표기, 수치)만 추출 (구분선/수치 없는 행 제외)
+    sectors = extract_sector_changes(res.text)
+    df = pd.DataFrame({
+        '업종명': [x.name for x in sectors],
+        '전일대비': [x.change_text for x in sectors],
+        '전일대비(수치)': [x.change for x in sectors],
+    })
     # 상위 n개 산업군 추출
     top_industries = df.sort_values('전일대비(수치)', ascending=False).head(top_n)
     result = top_industries[['업종명', '전일대비']].reset_index(drop=True)
@@ -105,9 +76,35 @@ def stock_analysis(selected_industries):
     return recommendations
 
 # 전체 파이프라인 실행
-def run_pipeline():
+# 단계별 결과를 data/stages/run_pipeline/에 저장 → 다시 실행하면 오늘 이미 끝난 단계는 건너뛰고 실패한 단계부터 실행
+# (거시경제, 산업분석, 저평가 종목 스크리닝은 서로 독립이라 동시에 실행)
+# 저평가 종목 스크리닝은 전 종목 네이버 조회라 오래 걸리므로 screen=True(--screen)일 때만 실행
+def build_pipeline(runner=None):
+    from stage_runner import StageRunner, today
+    runner = runner or StageRunner('run_pipeline')
+    runner.add('macro', lambda: macro_analysis(), inputs=today)
+    runner.add('industry', lambda: industry_analysis(top_n=3), inputs=today, params={'top_n': 3})
+    runner.add('stock', lambda industry: stock_analysis(industry['업종명'].tolist()), deps=['industry'])
+    runner.add('screen', screen_stocks, inputs=today, params={'top_n': 3})
+    return runner
+
+def screen_stocks():
+    # 업종 평균 대비 PER/PBR이 낮은 종목 (test.StockScreener)
+    from test import StockScreener
+    screener = StockScreener()
+    screener.analyze_stocks()
+    return screener.find_undervalued_stocks(top_n=3)
+
+def run_pipeline(force=(), screen=False):
+    with profile_run('run_pipeline'):  # KSTOCK_PROFILE=1이면 단계별 시간/메모리 보고서 저장
+        _run_pipeline(force, screen)
+
+def _run_pipeline(force=(), screen=False):
+    targets = ['macro', 'industry', 'stock'] + (['screen'] if screen else [])
+    outputs = build_pipeline().run(targets=targets, force=force)
+
     print('[1] 거시경제 분석')
-    macro = macro_analysis()
+    macro = outputs['macro']
     print(macro)
     if macro['Market Status'] == '침체':
         print('시장 침체: 종목 추천을 보수적으로 진행합니다.')
@@ -115,14 +112,20 @@ def run_pipeline():
         print('시장 호황: 적극적으로 종목 추천을 진행합니다.')
 
     print('\n[2] 산업분석 (실제 데이터 기반)')
-    industry_df = industry_analysis(top_n=3)
+    industry_df = outputs['industry']
     print(industry_df)
     selected = industry_df['업종명'].tolist()
     print(f'추천 산업군: {selected}')
 
     print('\n[3] 종목분석')
-    stock_recs = stock_analysis(selected)
-    print('추천 종목:', stock_recs)
+    print('추천 종목:', outputs['stock'])
+
+    if screen:
+        print('\n[4] 업종별 저평가 종목 (상위 3개)')
+        print(outputs['screen'].to_string())
 
 if __name__ == "__main__":
-    run_pipeline() 
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--screen', action='store_true', help='업종별 저평가 종목 스크리닝도 실행 (전 종목 조회)')
+    run_pipeline(screen=parser.parse_args().screen)
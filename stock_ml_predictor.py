@@ -1,99 +1,216 @@
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, accuracy_score
-from pykrx import stock
 from datetime import datetime, timedelta
+from ohlcv_store import OHLCVStore
+from indicators import compute_indicators, to_features, ML_FEATURE_COLS
+from walk_forward import walk_forward
+from model_backends import get_backend
+from backtest import backtest, pivot_matrix
+from scoring_service import score_universe
+from profiler import profile_run, count
+from ticker_index import TickerIndex
 
 # 거시경제/산업분석 함수 임포트
 from stock_investment_pipeline import macro_analysis, industry_analysis
 
-# 1. 실제 데이터 준비 (pykrx 활용)
-def get_real_stock_data(n_sample=100):
+# 1. 실제 데이터 준비 (pykrx 활용, 로컬 OHLCV 저장소에 증분 동기화)
+def get_real_stock_data(n_sample=100, store=None, start_str=None, market="KOSPI"):
+    """market 상장 종목 중 앞 n_sample개(None이면 전 종목)의 일봉 (long-format)
+    저장소는 빠진 구간만 수집: 종목이 많고 기간이 짧으면 날짜별 전 종목 조회, 아니면 종목별 조회"""
+    from pykrx import stock  # 임포트가 느려서 (KRX 로그인 포함) 수집할 때 읽음
     today = datetime.today()
-    start = today - timedelta(days=365*2)  # 2년치 데이터
-    start_str = start.strftime('%Y%m%d')
+    if start_str is None:
+        start = today - timedelta(days=365*2)  # 2년치 데이터
+        start_str = start.strftime('%Y%m%d')
     end_str = today.strftime('%Y%m%d')
-    tickers = stock.get_market_ticker_list(market="KOSPI")[:n_sample]
-    all_data = []
-    for code in tickers:
-        df = stock.get_market_ohlcv_by_date(start_str, end_str, code)
-        if len(df) < 80:  # 데이터 부족 종목 제외
-            continue
-        df = df.reset_index()
-        df['code'] = code
-        all_data.append(df)
-    df_all = pd.concat(all_data)
+    tickers = stock.get_market_ticker_list(market=market)
+    if n_sample is not None:
+        tickers = tickers[:n_sample]
+    if store is None:
+        store = OHLCVStore()
+    store.sync(tickers, start_str, end_str)  # 빠진 날짜만 수집
+    df_all = store.load(tickers, start_str, end_str, min_rows=80)  # 데이터 부족 종목 제외
     return df_all
 
-def make_ml_dataset(df_all):
-    # 3개월(60영업일) 뒤 수익률 계산
-    dfs = []
-    for code, df in df_all.groupby('code'):
-        df = df.sort_values('날짜').reset_index(drop=True)
-        df['return_3m'] = (df['종가'].shift(-60) - df['종가']) / df['종가']
-        # 특성: 시가, 고가, 저가, 종가, 거래량 (정규화)
-        features = df[['시가', '고가', '저가', '종가', '거래량']].copy()
-        features = (features - features.mean()) / features.std()
-        features.columns = [f'{c}' for c in features.columns]
-        out = features.copy()
-        out['target_reg'] = df['return_3m']
-        out['target_cls'] = (df['return_3m'] > 0.1).astype(int)
-        out['code'] = code
-        out['date'] = df['날짜']
-        dfs.append(out)
-    data = pd.concat(dfs)
-    # 결측치/미래 없는 row 제거
-    data = data.dropna(subset=['target_reg'])
+FEATURE_COLS = ['시가', '고가', '저가', '종가', '거래량']
+
+def _group_segments(codes):
+    # 종목코드 순으로 정렬된 배열에서 종목별 (시작 위치, 길이)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    return starts, counts
+
+def _zscore_by_segment(values, starts, counts):
+    # 종목별 (x - 평균) / 표준편차(ddof=1)
+    # 길이가 같은 종목끼리 (컬럼, 종목, 날짜) 3차원 배열로 모아 한 번에 계산
+    # (행 단위 합계라서 pandas의 종목별 mean/std와 부동소수점 결과까지 동일)
+    # 결측(NaN)은 pandas처럼 합계/개수에서 빼고 계산, 결측 자리는 NaN 유지
+    out = np.empty_like(values)
+    for length in np.unique(counts):
+        idx = starts[counts == length][:, None] + np.arange(length)
+        block = np.ascontiguousarray(values[:, idx])
+        nan = np.isnan(block)
+        n = (length - nan.sum(axis=2)).astype(values.dtype)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg = np.expand_dims(np.where(nan, 0, block).sum(axis=2) / n, 2)
+            std = np.sqrt(np.where(nan, 0, (avg - block) ** 2).sum(axis=2) / (n - 1))
+            out[:, idx] = (block - avg) / np.expand_dims(std, 2)
+    return out
+
+HORIZONS = [5, 20, 60, 120]  # 타깃 기간 비교용 (영업일)
+
+def forward_returns(close, pos, counts, horizons):
+    """종목 경계를 넘지 않는 h영업일 뒤 수익률 (shift(-h)), 모든 horizon을 (len(horizons), row 수) 배열로 한 번에 계산"""
+    horizons = np.asarray(horizons)[:, None]
+    remaining = np.repeat(counts, counts) - pos  # 종목 내 자기 포함 남은 row 수
+    idx = np.minimum(np.arange(len(close)) + horizons, len(close) - 1)
+    future = np.where(horizons < remaining, close[idx], np.nan)
+    return (future - close) / close
+
+def make_ml_dataset(df_all, dtype=None, with_indicators=False, horizon=60, threshold=0.1,
+                    horizons=(), thresholds=None):
+    """종목별 정규화 특성 + 3개월(60영업일) 뒤 수익률 타깃 (dtype=np.float32로 메모리 절반)
+    with_indicators=True면 기술적 지표 특성(ML_FEATURE_COLS)도 추가
+    horizons=[5, 20, 60, 120]이면 target_reg_{h}, target_cls_{h} 컬럼도 같이 계산
+    (thresholds: {h: 기준 수익률}, 없으면 threshold / 미래가 없는 row는 NaN)
+    horizons를 주면 요청한 기간 중 하나라도 타깃이 있는 row를 모두 유지 (기본 horizon 타깃도 없으면 NaN)
+    → 기간별 학습 데이터는 walk_forward.horizon_view(data, h)로 (해당 기간 타깃이 있는 row만)"""
+    df = df_all.sort_values(['code', '날짜'], kind='stable')
+    codes = df['code'].to_numpy()
+    starts, counts = _group_segments(codes)
+    pos = np.arange(len(df)) - np.repeat(starts, counts)  # 종목 내 순번
+
+    # 특성: 시가, 고가, 저가, 종가, 거래량 (종목별 정규화)
+    values = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(dtype=np.float64).T)
+    features = _zscore_by_segment(values, starts, counts)
+
+    # horizon(기본 60영업일) 및 추가 horizons 뒤 수익률을 한 번에 계산
+    close = values[FEATURE_COLS.index('종가')]
+    horizons = list(horizons)
+    returns = forward_returns(close, pos, counts, [horizon] + horizons)
+    return_3m = returns[0]
+
+    # 미래 없는 row 제거 (모든 horizon의 타깃이 없는 row만, horizons가 없으면 기본 horizon 기준)
+    keep = ~np.isnan(returns).all(axis=0)
+    data = pd.DataFrame({c: features[i, keep] for i, c in enumerate(FEATURE_COLS)}, index=pos[keep])
+    data['target_reg'] = return_3m[keep]
+    float_cols = FEATURE_COLS + ['target_reg']
+    if horizons:
+        data['target_cls'] = np.where(np.isnan(return_3m[keep]), np.nan, return_3m[keep] > threshold)
+        float_cols += ['target_cls']
+    else:
+        data['target_cls'] = (return_3m[keep] > threshold).astype(int)
+    for h, ret in zip(horizons, returns[1:]):
+        thr = (thresholds or {}).get(h, threshold)
+        ret = ret[keep]
+        data[f'target_reg_{h}'] = ret
+        data[f'target_cls_{h}'] = np.where(np.isnan(ret), np.nan, ret > thr)  # 0/1, 미래 없으면 NaN
+        float_cols += [f'target_reg_{h}', f'target_cls_{h}']
+    data['code'] = codes[keep]
+    data['date'] = df['날짜'].to_numpy()[keep]
+    if with_indicators:
+        # 기술적 지표 (MA, RSI, ATR, 변동성, 모멘텀, 거래량 z-score, 골든/데드크로스)
+        ind = to_features(compute_indicators(df), close)
+        for c in ML_FEATURE_COLS:
+            data[c] = ind[c].to_numpy()[keep]
+        float_cols += [c for c in ML_FEATURE_COLS if c not in ('GOLDEN_CROSS', 'DEAD_CROSS')]
+    if dtype is not None:
+        data = data.astype({c: dtype for c in float_cols})
     return data
 
 def get_code_name_sector_dict():
-    # pykrx에서 종목코드-종목명, 종목코드-업종(산업군) dict 생성
-    tickers = stock.get_market_ticker_list(market="KOSPI")
-    code2name = {code: stock.get_market_ticker_name(code) for code in tickers}
-    # 업종 정보는 pykrx에서 직접 제공하지 않으므로, 네이버 금융 크롤링 등으로 확장 가능
-    # 여기서는 임시로 모두 '기타'로 표기
-    code2sector = {code: '기타' for code in tickers}
-    return code2name, code2sector
-
-def main():
-    print('[실제 데이터 기반 ML 예시]')
-    print('주가 데이터 수집 중...')
-    df_all = get_real_stock_data(n_sample=50)  # 50종목 예시
-    print('ML 데이터셋 생성 중...')
-    data = make_ml_dataset(df_all)
-    X = data[['시가', '고가', '저가', '종가', '거래량']]
-    y_reg = data['target_reg']
-    y_cls = data['target_cls']
-    X_train, X_test, y_reg_train, y_reg_test, y_cls_train, y_cls_test = train_test_split(
-        X, y_reg, y_cls, test_size=0.2, random_state=42)
-
-    # 회귀 모델 학습 및 예측
-    lr = LinearRegression().fit(X_train, y_reg_train)
-    rf_reg = RandomForestRegressor(random_state=42).fit(X_train, y_reg_train)
-    y_pred_lr = lr.predict(X_test)
-    y_pred_rf = rf_reg.predict(X_test)
-    print('[회귀] LinearRegression MSE:', mean_squared_error(y_reg_test, y_pred_lr))
-    print('[회귀] RandomForestRegressor MSE:', mean_squared_error(y_reg_test, y_pred_rf))
-
-    # 분류 모델 학습 및 예측
-    rf_cls = RandomForestClassifier(random_state=42).fit(X_train, y_cls_train)
-    y_pred_cls = rf_cls.predict(X_test)
-    print('[분류] RandomForestClassifier 정확도:', accuracy_score(y_cls_test, y_pred_cls))
+    # 종목 메타데이터 색인에서 종목코드-종목명, 종목코드-업종(산업군) dict 생성
+    # (하루 한 번 신규/상장폐지 종목만 갱신, 업종은 네이버 금융 종목 페이지 기준)
+    index = TickerIndex().refresh_if_stale()
+    return index.code2name(), index.code2sector()
+
+def build_stages(runner=None, n_sample=50, backend=None):
+    """수집 → 데이터셋 → 학습 → 백테스트/점수화, 종목 메타데이터, 거시경제, 산업분석 단계
+    (결과는 data/stages/stock_ml_predictor/에 저장 → 다시 실행하면 끝난 단계는 건너뛰고 실패한 단계부터)"""
+    from stage_runner import StageRunner, today
+    runner = runner or StageRunner('stock_ml_predictor')
+    backend = backend or get_backend()  # KSTOCK_MODEL_BACKEND=rf|rf_lean|hgb
+    # 시작일을 연초로 고정해야 과거 fold의 학습 데이터가 매일 바뀌지 않음 (fold 모델 캐시 재사용)
+    start_str = f'{datetime.today().year - 2}0101'
+
+    @runner.stage('fetch', inputs=today, params={'n_sample': n_sample, 'start': start_str})
+    def fetch():
+        df_all = get_real_stock_data(n_sample=n_sample, start_str=start_str)
+        count('ohlcv_rows', len(df_all))
+        return df_all
+
+    @runner.stage('dataset', deps=['fetch'], params={'dtype': str(np.dtype(backend.dtype))})
+    def dataset(fetch):
+        data = make_ml_dataset(fetch, dtype=backend.dtype, with_indicators=True)
+        # 지표 계산 구간(최대 200일)이 부족한 초기 row 제외
+        data = data.dropna(subset=ML_FEATURE_COLS).reset_index(drop=True)
+        count('dataset_rows', len(data))
+        return data
+
+    # walk-forward 학습/평가 (월 단위 fold, 학습은 테스트 시작 60영업일 전까지)
+    # 정규화 OHLCV 특성은 종목 전체 기간 통계를 써서 미래 정보가 섞이므로 기술적 지표만 사용
+    @runner.stage('training', deps=['dataset'], params={'backend': backend.name}, version='2')  # 2: 보고서 mse_reg/model 컬럼
+    def training(dataset):
+        report, predictions, _ = walk_forward(dataset, ML_FEATURE_COLS, models=backend.models())
+        return report, predictions
+
+    # walk-forward 테스트 구간 예측으로 추천 종목을 실제로 들고 있었다면? (20영업일 리밸런싱, 거래비용 0.25%)
+    @runner.stage('backtest', deps=['fetch', 'training'])
+    def backtest_stage(fetch, training):
+        prices = pivot_matrix(fetch, '종가', index='날짜')
+        predictions = training[1]
+        bt_top = backtest(prices, pivot_matrix(predictions, 'pred_reg'), top_n=10, rebalance=20)
+        bt_cls = backtest(prices, pivot_matrix(predictions, 'pred_cls'), top_n=None, threshold=0.5, rebalance=20)
+        return pd.DataFrame({'예측수익률 TOP 10': bt_top.summary(), '10% 초과 분류 종목': bt_cls.summary()})
 
     # 종목명, 산업군 dict
-    code2name, code2sector = get_code_name_sector_dict()
-
-    # 예측 결과로 추천 종목 예시 (상위 10개)
-    test_df = X_test.copy()
-    test_df['pred_reg'] = y_pred_rf
-    test_df['pred_cls'] = y_pred_cls
-    test_df['code'] = data.iloc[X_test.index]['code'].values
-    test_df['date'] = data.iloc[X_test.index]['date'].values
-    test_df['종목명'] = test_df['code'].map(code2name)
-    test_df['산업군'] = test_df['code'].map(code2sector)
+    runner.add('metadata', get_code_name_sector_dict, inputs=today)
+
+    # 종목별 최신 거래일 특성을 최근 fold 모델로 일괄 점수화 (학습 단계가 저장한 모델 사용)
+    @runner.stage('scoring', deps=['fetch', 'training', 'metadata'])
+    def scoring(fetch, training, metadata):
+        code2name, code2sector = metadata
+        test_df = score_universe(tickers=fetch['code'].unique().tolist())
+        count('scored_rows', len(test_df))
+        test_df['종목명'] = test_df['code'].map(code2name)
+        test_df['산업군'] = test_df['code'].map(code2sector)
+        return test_df
+
+    runner.add('macro', lambda: macro_analysis(), inputs=today)
+    runner.add('industry', lambda: industry_analysis(top_n=3), inputs=today, params={'top_n': 3})
+    return runner
+
+def main(force=(), n_sample=50, backend=None):
+    with profile_run('stock_ml_predictor'):  # KSTOCK_PROFILE=1이면 단계별 시간/메모리 보고서 저장
+        _main(force, n_sample, backend)
+
+def train(force=(), n_sample=50, backend=None):
+    """수집 → 데이터셋 → 학습 → 백테스트 단계만 실행하고 fold별 성능, 백테스트 결과 출력"""
+    backend = get_backend(backend)
+    with profile_run('stock_ml_predictor'):
+        outputs = build_stages(n_sample=n_sample, backend=backend).run(targets=['training', 'backtest'], force=force)
+        _print_training(outputs, backend)
+
+def predict(force=(), n_sample=50, backend=None):
+    """점수화 단계까지 실행하고 (학습이 끝나 있으면 저장된 모델 사용) 추천 종목 출력"""
+    backend = get_backend(backend)
+    with profile_run('stock_ml_predictor'):
+        outputs = build_stages(n_sample=n_sample, backend=backend).run(targets=['scoring'], force=force)
+        _print_recommendations(outputs)
+
+def _print_training(outputs, backend):
+    report, _ = outputs['training']
+    print('\n[walk-forward fold별 성능]')
+    print(report.to_string(index=False))
+    print('[회귀] LinearRegression 평균 MSE:', report['mse_lr'].mean())
+    print(f'[회귀] {backend.description} 평균 MSE:', report['mse_reg'].mean())
+    print(f'[분류] {backend.description} 평균 정확도:', report['accuracy'].mean())
+
+    print('\n[백테스트 - walk-forward 테스트 구간]')
+    print(outputs['backtest'].to_string())
+
+def _print_recommendations(outputs):
+    test_df = outputs['scoring']
     # 3개월 뒤 수익률 예측이 높은 순 추천
     top_recommend = test_df.sort_values('pred_reg', ascending=False).head(10)
     print('\n[추천 종목 TOP 10 - 3개월 뒤 수익률 예측 기준]')
@@ -102,14 +219,19 @@ def main():
     print('\n[추천 종목 - 10% 초과로 분류된 종목]')
     print(test_df[test_df['pred_cls'] == 1][['종목명', '산업군', 'code', 'date', 'pred_reg']].to_string(index=False))
 
+def _main(force=(), n_sample=50, backend=None):
+    print('[실제 데이터 기반 ML 예시]')
+    backend = get_backend(backend)
+    outputs = build_stages(n_sample=n_sample, backend=backend).run(force=force)
+    _print_training(outputs, backend)
+    _print_recommendations(outputs)
+
     # 전체 해석 출력
     print('\n[해석 및 요약]')
     print('1. 거시경제 분석 결과:')
-    macro = macro_analysis()
-    print(macro)
+    print(outputs['macro'])
     print('\n2. 산업분석 결과:')
-    industry_df = industry_analysis(top_n=3)
-    print(industry_df)
+    print(outputs['industry'])
     print('\n3. 종목분석 결과: 위 표에서 예측 수익률이 높거나 10% 초과로 분류된 종목이 추천 대상입니다.')
     print('   실제 투자 전에는 재무제표, 산업 트렌드, 뉴스 등 추가 분석이 필요합니다.')
 
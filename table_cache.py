@@ -0,0 +1,85 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+# 엑셀 원본(dataSet.xlsx 등)을 한 번만 읽어 Parquet으로 변환해 두고 재사용
+# - {cache_dir}/{파일명}-{경로 해시}.parquet + 같은 이름의 .json (원본 mtime, 크기, 내용 해시, 변환 설정)
+# - 원본 mtime/크기가 같으면 바로 Parquet 읽기, 다르면 내용 해시를 비교해서 실제로 바뀐 경우만 다시 변환
+# - 변환할 때 숫자 컬럼은 pd.to_numeric(errors='coerce')로 float, 범주 컬럼은 category(dictionary)로 저장
+# - columns를 주면 필요한 컬럼만 읽음 (column projection)
+
+DEFAULT_DIR = os.path.join('data', 'cache', 'tables')
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _cache_paths(path, cache_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    tag = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    base = os.path.join(cache_dir, f'{name}-{tag}')
+    return base + '.parquet', base + '.json'
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+def transcode(path, numeric=(), categorical=(), reader=pd.read_excel):
+    """원본을 읽어 숫자/범주 컬럼 타입을 정리한 DataFrame"""
+    df = reader(path)
+    for col in numeric:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in categorical:
+        df[col] = df[col].astype('category')
+    for col in df.columns:
+        if df[col].dtype == object:  # 숫자/문자가 섞인 나머지 컬럼은 문자열로 (Parquet 타입 고정)
+            df[col] = df[col].astype('string')
+    return df
+
+
+def load_table(path, columns=None, numeric=(), categorical=(), cache_dir=DEFAULT_DIR, reader=pd.read_excel):
+    """엑셀 원본 대신 변환해 둔 Parquet을 읽음 (원본이 바뀌었으면 다시 변환)"""
+    parquet_path, meta_path = _cache_paths(path, cache_dir)
+    stat = os.stat(path)
+    options = {'numeric': list(numeric), 'categorical': list(categorical)}
+    meta = _read_meta(meta_path)
+    fresh = meta is not None and meta.get('options') == options and os.path.exists(parquet_path)
+    if fresh and (meta['mtime_ns'], meta['size']) != (stat.st_mtime_ns, stat.st_size):
+        # 저장/복사만 다시 된 경우(내용 동일)는 메타데이터만 갱신
+        digest = _file_hash(path)
+        fresh = digest == meta['sha1']
+        if fresh:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_meta(meta_path, meta)
+    if not fresh:
+        df = transcode(path, numeric, categorical, reader)
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(parquet_path + '.tmp', index=False)
+        os.replace(parquet_path + '.tmp', parquet_path)
+        _write_meta(meta_path, {
+            'source': os.path.abspath(path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha1': _file_hash(path),
+            'options': options,
+            'rows': len(df),
+        })
+        return df[list(columns)] if columns is not None else df
+    return pd.read_parquet(parquet_path, columns=list(columns) if columns is not None else None)
@@ -1,119 +1,71 @@
-import ssl
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-from pykrx import stock
-import time
-from tqdm import tqdm
 import warnings
-from datetime import datetime
-
-# SSL 인증서 검증 비활성화
-ssl._create_default_https_context = ssl._create_unverified_context
+from fetch_engine import FetchEngine
+from html_extract import extract_item_info
+from screener_engine import ValueScreener
+from ticker_index import TickerIndex, NAVER_ITEM_URL
 
 warnings.filterwarnings('ignore')
 
+def parse_item_info(html):
+    """네이버 금융 종목 페이지에서 업종, PER, PBR을 함께 추출"""
+    return extract_item_info(html).as_dict()
+
 class StockScreener:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.verify = False
+    def __init__(self, max_workers=8, rate=10, item_url=NAVER_ITEM_URL, index=None):
+        # 네이버 서버 부하 방지: 동시 요청은 max_workers개, 전체 속도는 초당 rate회 이하
+        # (인증서 검증은 이 엔진의 요청에서만 끔, 연결 풀은 공용 HTTP 클라이언트와 공유)
+        self.engine = FetchEngine(max_workers=max_workers, rate=rate, verify=False)
+        self.item_url = item_url
+        self.item_info = {}  # 종목코드 -> {'업종', 'PER', 'PBR'} (종목당 1회만 요청)
+        # 종목명/업종/시장은 메타데이터 색인에서 (신규 종목의 업종은 아래 get_item_info로 조회)
+        self.index = index or TickerIndex(sector_fetcher=self._fetch_sectors)
+        self.names = {}  # 종목코드 -> 종목명
+        self.screener = None  # 업종별 합계를 유지하는 저평가 스크리닝 엔진 (analyze_stocks에서 생성)
     
     def get_stock_lists(self):
-        """KOSPI와 KOSDAQ 상장기업 목록을 가져옴"""
-        today = datetime.today().strftime("%Y%m%d")
-        
-        # KOSPI 종목 리스트
-        kospi_tickers = stock.get_market_ticker_list(market="KOSPI")
-        kospi_names = []
-        kospi_sectors = []
-        
-        print("KOSPI 종목 정보 수집 중...")
-        for ticker in tqdm(kospi_tickers):
-            name = stock.get_market_ticker_name(ticker)
-            kospi_names.append(name)
-            # 네이버 금융에서 업종 정보 가져오기
-            sector = self.get_sector_info(ticker)
-            kospi_sectors.append(sector)
-            time.sleep(0.1)  # 네이버 서버 부하 방지
-        
-        kospi_df = pd.DataFrame({
-            '종목코드': kospi_tickers,
-            '종목명': kospi_names,
-            '업종': kospi_sectors,
-            '시장구분': 'KOSPI'
-        })
-
-        # KOSDAQ 종목 리스트
-        kosdaq_tickers = stock.get_market_ticker_list(market="KOSDAQ")
-        kosdaq_names = []
-        kosdaq_sectors = []
-        
-        print("KOSDAQ 종목 정보 수집 중...")
-        for ticker in tqdm(kosdaq_tickers):
-            name = stock.get_market_ticker_name(ticker)
-            kosdaq_names.append(name)
-            # 네이버 금융에서 업종 정보 가져오기
-            sector = self.get_sector_info(ticker)
-            kosdaq_sectors.append(sector)
-            time.sleep(0.1)  # 네이버 서버 부하 방지
-        
-        kosdaq_df = pd.DataFrame({
-            '종목코드': kosdaq_tickers,
-            '종목명': kosdaq_names,
-            '업종': kosdaq_sectors,
-            '시장구분': 'KOSDAQ'
-        })
+        """KOSPI와 KOSDAQ 상장기업 목록을 가져옴 (하루 한 번 신규/상장폐지 종목만 색인에 반영)"""
+        self.index.refresh_if_stale()
+        dfs = [self.index.to_frame(market) for market in ['KOSPI', 'KOSDAQ']]
+        self.names = self.index.code2name()
 
         # 데이터프레임 합치기
-        self.stock_df = pd.concat([kospi_df, kosdaq_df])
+        self.stock_df = pd.concat(dfs)
         return self.stock_df
     
+    def _fetch_sectors(self, codes):
+        # 색인에 새로 들어온 종목의 업종 (페이지는 item_info에 남아 투자지표 조회에 재사용)
+        infos = self.engine.map(self.get_item_info, codes, desc="신규 종목 업종 수집 중")
+        return [info['업종'] for info in infos]
+    
+    def get_item_info(self, code):
+        """네이버 금융 종목 페이지를 한 번만 받아 업종, PER, PBR 정보를 반환"""
+        if code not in self.item_info:
+            try:
+                html = self.engine.get(self.item_url.format(code=code))
+                self.item_info[code] = parse_item_info(html)
+            except:
+                self.item_info[code] = {'업종': "기타", 'PER': None, 'PBR': None}
+        return self.item_info[code]
+    
     def get_sector_info(self, code):
         """네이버 금융에서 업종 정보를 가져옴"""
-        url = f'https://finance.naver.com/item/main.naver?code={code}'
-        try:
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 업종 정보 추출
-            sector = soup.select_one('div.trade_compare > h4 > em > a')
-            return sector.text if sector else "기타"
-        except:
-            return "기타"
+        return self.get_item_info(code)['업종']
     
     def get_stock_info(self, code):
         """개별 종목의 투자지표 정보를 가져옴"""
-        url = f'https://finance.naver.com/item/main.naver?code={code}'
-        try:
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # PER, PBR 추출
-            per = soup.select_one('#_per')
-            pbr = soup.select_one('#_pbr')
-            
-            per = float(per.text.replace(',', '')) if per else None
-            pbr = float(pbr.text.replace(',', '')) if pbr else None
-            
-            return per, pbr
-        except:
-            return None, None
+        info = self.get_item_info(code)
+        return info['PER'], info['PBR']
     
     def analyze_stocks(self):
         """전체 종목 분석"""
-        # 기본 정보 가져오기
+        # 기본 정보 가져오기 (업종/투자지표를 함께 수집)
         self.get_stock_lists()
         
-        # 투자지표 정보 추가
-        tqdm.pandas()
-        print("투자지표 수집 중...")
-        
-        def get_indicators(code):
-            per, pbr = self.get_stock_info(code)
-            time.sleep(0.1)  # 네이버 서버 부하 방지
-            return pd.Series([per, pbr])
-        
-        self.stock_df[['PER', 'PBR']] = self.stock_df['종목코드'].progress_apply(get_indicators)
+        # 투자지표 정보 추가 (종목 페이지를 병렬로 받아 두고 재사용)
+        self.engine.map(self.get_item_info, self.stock_df['종목코드'].tolist(), desc="투자지표 수집 중")
+        self.stock_df['PER'] = self.stock_df['종목코드'].map(lambda code: self.get_stock_info(code)[0])
+        self.stock_df['PBR'] = self.stock_df['종목코드'].map(lambda code: self.get_stock_info(code)[1])
         
         # NaN 값 제거
         self.stock_df = self.stock_df.dropna(subset=['PER', 'PBR'])
@@ -121,31 +73,27 @@ class StockScreener:
         # 비정상적인 값 제거 (PER이 0이하이거나 1000이상인 경우)
         self.stock_df = self.stock_df[(self.stock_df['PER'] > 0) & (self.stock_df['PER'] < 1000)]
         
+        # 업종별 PER/PBR 합계 계산 (이후 종목 갱신은 refresh_stocks로 증분 반영)
+        self.screener = ValueScreener.from_frame(self.stock_df)
         return self.stock_df
     
+    def refresh_stocks(self, codes):
+        """장중 일부 종목만 다시 받아 업종 평균/저평가 점수에 반영 (바뀐 종목 수에 비례하는 시간)"""
+        if self.screener is None:
+            self.screener = ValueScreener.from_frame(self.stock_df)
+        for code in codes:
+            self.item_info.pop(code, None)
+        infos = self.engine.map(self.get_item_info, codes, desc="종목 정보 갱신 중")
+        for code, info in zip(codes, infos):
+            self.screener.update(code, info['PER'], info['PBR'], info['업종'], self.names.get(code))
+    
     def find_undervalued_stocks(self, top_n=5):
         """업종별 저평가 종목 찾기"""
-        # 업종별 평균 PER, PBR 계산
-        industry_avg = self.stock_df.groupby('업종').\
-            agg({'PER': 'mean', 'PBR': 'mean'}).\
-            rename(columns={'PER': 'industry_PER', 'PBR': 'industry_PBR'})
-        
-        # 개별 종목에 업종 평균 추가
-        self.stock_df = self.stock_df.merge(industry_avg, on='업종')
-        
-        # PER, PBR 상대값 계산 (낮을수록 저평가)
-        self.stock_df['PER_ratio'] = self.stock_df['PER'] / self.stock_df['industry_PER']
-        self.stock_df['PBR_ratio'] = self.stock_df['PBR'] / self.stock_df['industry_PBR']
-        
-        # 종합 점수 계산 (PER와 PBR 비율의 평균)
-        self.stock_df['value_score'] = (self.stock_df['PER_ratio'] + self.stock_df['PBR_ratio']) / 2
-        
-        # 업종별로 가장 저평가된 종목 선정
-        undervalued = self.stock_df.sort_values('value_score').\
-            groupby('업종').head(top_n).\
-            sort_values(['업종', 'value_score'])
-        
-        return undervalued[['종목명', '업종', 'PER', 'PBR', 'industry_PER', 'industry_PBR', 'value_score']]
+        # 업종별 평균 PER/PBR, 종목별 PER/PBR 상대값 평균(value_score)으로 업종별 저평가 상위 top_n개
+        # (stock_df는 그대로 두므로 여러 번 호출해도 결과가 같음)
+        if self.screener is None:
+            self.screener = ValueScreener.from_frame(self.stock_df)
+        return self.screener.top_n(top_n)
 
 # 실행
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+import os
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from fetch_engine import FetchEngine
+from html_extract import extract_item_info
+
+# 종목 메타데이터 색인 (종목코드 → 종목명, 업종, 시장)
+# - data/meta/tickers.parquet 한 파일 (컬럼: code, name, sector, market, first_seen, delisted, sector_checked)
+#   first_seen/delisted는 색인에 처음 들어온 날/목록에서 빠진 날, sector_checked는 마지막 업종 조회일 (YYYYMMDD)
+#   파일 메타데이터에 버전(갱신할 때마다 +1), 기준일(as_of, 영업일), 마지막 확인일(checked, 달력 날짜) 저장, 읽기는 수 ms
+# - refresh(): 오늘 상장 종목 목록과 비교해서 신규 종목만 종목명/업종 조회, 상장폐지 종목은 delisted 표시,
+#   시장 이전(코스닥 → 코스피)은 market만 갱신, 업종을 못 받은 종목('기타')은 SECTOR_RETRY_DAYS마다 다시 시도
+#   (재상장 종목은 이전 종목명/업종 유지)
+# - 기준일은 직전 영업일로 맞춤 (휴일에는 상장 종목 목록이 비어 있음)
+# - 목록이 비었거나 상장 종목의 MAX_DELISTED_RATIO 넘게 한 번에 빠지면 조회 오류로 보고 저장하지 않음
+# - 조회는 dict라 O(1): name(code), sector(code), market(code), code2name(), code2sector()
+
+DEFAULT_PATH = os.path.join('data', 'meta', 'tickers.parquet')
+NAVER_ITEM_URL = 'https://finance.naver.com/item/main.naver?code={code}'
+MARKETS = ['KOSPI', 'KOSDAQ']
+UNKNOWN_SECTOR = '기타'
+COLUMNS = ['code', 'name', 'sector', 'market', 'first_seen', 'delisted', 'sector_checked']
+SECTOR_RETRY_DAYS = 7
+MAX_DELISTED_RATIO = 0.05
+MIN_DELISTED_GUARD = 10  # 종목 수가 적을 때는 이 개수까지는 허용
+
+
+def naver_sector_fetcher(max_workers=8, rate=10):
+    """종목코드 목록 → 업종 목록 (네이버 금융 종목 페이지, 실패 시 '기타')"""
+    engine = FetchEngine(max_workers=max_workers, rate=rate, verify=False)
+
+    def fetch(code):
+        try:
+            return extract_item_info(engine.get(NAVER_ITEM_URL.format(code=code))).sector
+        except Exception:
+            return UNKNOWN_SECTOR
+
+    return lambda codes: engine.map(fetch, codes, desc='업종 정보 수집 중')
+
+
+class TickerIndex:
+    def __init__(self, path=DEFAULT_PATH, stock_api=None, sector_fetcher=None):
+        """stock_api: get_market_ticker_list / get_market_ticker_name / get_nearest_business_day_in_a_week 제공
+        (기본값: pykrx.stock)"""
+        self.path = path
+        self._stock_api = stock_api
+        self._sector_fetcher = sector_fetcher
+        self.version = 0
+        self.as_of = None
+        self.checked = None  # 마지막으로 refresh한 달력 날짜 (주말/휴일에는 as_of보다 뒤)
+        self.records = {}  # code -> {'name', 'sector', 'market', 'first_seen', 'delisted', 'sector_checked'}
+        self.load()
+
+    @property
+    def stock_api(self):
+        if self._stock_api is None:
+            from pykrx import stock
+            self._stock_api = stock
+        return self._stock_api
+
+    # 1. 읽기 / 쓰기
+    def load(self):
+        if not os.path.exists(self.path):
+            return self
+        table = pq.read_table(self.path)
+        meta = json.loads(table.schema.metadata.get(b'ticker_index', b'{}'))
+        self.version = meta.get('version', 0)
+        self.as_of = meta.get('as_of')
+        self.checked = meta.get('checked', self.as_of)  # 이전 버전 파일은 기준일로 대신
+        cols = table.to_pydict()
+        n = len(cols['code'])
+        for c in COLUMNS[1:]:
+            cols.setdefault(c, [None] * n)  # 이전 버전 파일 (sector_checked 없음)
+        self.records = {
+            code: {c: cols[c][i] for c in COLUMNS[1:]}
+            for i, code in enumerate(cols['code'])
+        }
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        codes = sorted(self.records)
+        data = {'code': codes}
+        for c in COLUMNS[1:]:
+            data[c] = [self.records[code][c] for code in codes]
+        table = pa.table(data, schema=pa.schema([(c, pa.string()) for c in COLUMNS]))
+        table = table.replace_schema_metadata({
+            'ticker_index': json.dumps({'version': self.version, 'as_of': self.as_of, 'checked': self.checked}),
+        })
+        tmp = self.path + '.tmp'
+        pq.write_table(table, tmp, compression='zstd')
+        os.replace(tmp, self.path)
+
+    # 2. 갱신
+    def is_stale(self, date_str=None):
+        """date_str(기본: 오늘)에 아직 refresh하지 않았는지 (기준일이 직전 영업일이라 달력 날짜로 비교)"""
+        return self.checked is None or self.checked < (date_str or datetime.today().strftime('%Y%m%d'))
+
+    def _sector_due(self, record, date_str):
+        # 업종을 못 받은 종목은 마지막 조회 후 SECTOR_RETRY_DAYS가 지났을 때만 다시 조회
+        if record['sector'] != UNKNOWN_SECTOR:
+            return False
+        checked = record.get('sector_checked')
+        if checked is None:
+            return True
+        return datetime.strptime(date_str, '%Y%m%d') - datetime.strptime(checked, '%Y%m%d') >= \
+            timedelta(days=SECTOR_RETRY_DAYS)
+
+    def refresh(self, date_str=None, markets=MARKETS):
+        """date_str(기본: 오늘, 휴일이면 직전 영업일) 기준 상장 종목 목록과 비교해서 바뀐 종목만 반영하고 저장,
+        변경 내역 dict 반환 (목록 조회가 비정상이면 저장하지 않고 빈 dict)"""
+        checked = date_str or datetime.today().strftime('%Y%m%d')
+        date_str = self.stock_api.get_nearest_business_day_in_a_week(checked, prev=True)
+        current = {}
+        for market in markets:
+            for code in self.stock_api.get_market_ticker_list(date_str, market=market):
+                current[code] = market
+        active = {code for code, r in self.records.items() if r['delisted'] is None and r['market'] in markets}
+
+        # 1) 목록 조회 이상 (빈 목록, 비정상적으로 많은 상장폐지) → 색인 유지
+        delisted = sorted(active - set(current))
+        if not current or len(delisted) > max(MIN_DELISTED_GUARD, MAX_DELISTED_RATIO * len(active)):
+            print(f'⚠️ {date_str} 상장 종목 목록 이상 ({len(current)}종목, 상장폐지 {len(delisted)}/{len(active)}): '
+                  '종목 색인을 갱신하지 않습니다.')
+            return {}
+
+        new = sorted(code for code in current if code not in self.records)
+        relisted = sorted(code for code in current if code in self.records and self.records[code]['delisted'])
+        moved = sorted(code for code in current
+                       if code in active and self.records[code]['market'] != current[code])
+        retry = sorted(code for code in current
+                       if code not in new and self._sector_due(self.records[code], date_str))
+
+        # 2) 신규 종목은 종목명 조회, 재상장 종목은 이전 종목명/업종 유지
+        for code in new:
+            self.records[code] = {
+                'name': self.stock_api.get_market_ticker_name(code),
+                'sector': UNKNOWN_SECTOR,
+                'market': current[code],
+                'first_seen': date_str,
+                'delisted': None,
+                'sector_checked': None,
+            }
+        for code in relisted:
+            self.records[code].update(market=current[code], delisted=None)
+        for code in delisted:
+            self.records[code]['delisted'] = date_str
+        for code in moved:
+            self.records[code]['market'] = current[code]
+
+        # 3) 업종 조회 (신규 + 업종 미확인 종목)
+        to_fetch = new + retry
+        if to_fetch:
+            fetcher = self._sector_fetcher or naver_sector_fetcher()
+            for code, sector in zip(to_fetch, fetcher(to_fetch)):
+                self.records[code]['sector'] = sector or UNKNOWN_SECTOR
+                self.records[code]['sector_checked'] = date_str
+        added = sorted(new + relisted)
+
+        changes = {'added': added, 'delisted': delisted, 'moved': moved,
+                   'sector_filled': [c for c in retry if self.records[c]['sector'] != UNKNOWN_SECTOR]}
+        if any(changes.values()) or self.as_of is None:
+            self.version += 1
+        self.as_of = max(self.as_of or date_str, date_str)
+        self.checked = max(self.checked or checked, checked)
+        self.save()
+        return changes
+
+    def refresh_if_stale(self, date_str=None):
+        """하루 한 번만 refresh (오늘 이미 갱신했으면 그대로 사용)"""
+        if self.is_stale(date_str):
+            self.refresh(date_str)
+        return self
+
+    # 3. 조회
+    def get(self, code):
+        return self.records.get(code)
+
+    def name(self, code, default=None):
+        r = self.records.get(code)
+        return r['name'] if r else default
+
+    def sector(self, code, default=UNKNOWN_SECTOR):
+        r = self.records.get(code)
+        return r['sector'] if r else default
+
+    def market(self, code, default=None):
+        r = self.records.get(code)
+        return r['market'] if r else default
+
+    def codes(self, market=None, include_delisted=False):
+        """상장 종목코드 목록 (market을 주면 해당 시장만)"""
+        return [code for code, r in self.records.items()
+                if (include_delisted or r['delisted'] is None) and (market is None or r['market'] == market)]
+
+    def code2name(self, market=None):
+        return {code: self.records[code]['name'] for code in self.codes(market)}
+
+    def code2sector(self, market=None):
+        return {code: self.records[code]['sector'] for code in self.codes(market)}
+
+    def to_frame(self, market=None):
+        codes = self.codes(market)
+        return pd.DataFrame({
+            '종목코드': codes,
+            '종목명': [self.records[c]['name'] for c in codes],
+            '업종': [self.records[c]['sector'] for c in codes],
+            '시장구분': [self.records[c]['market'] for c in codes],
+        })
+
+
+if __name__ == "__main__":
+    index = TickerIndex()
+    changes = index.refresh()
+    print(f'종목 메타데이터 v{index.version} ({index.as_of}): {len(index.codes())}종목')
+    print({k: len(v) for k, v in changes.items()})
@@ -0,0 +1,132 @@
+import os
+import json
+import math
+import time
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+
+# 거시 지표 조회 함수용 TTL 캐시
+# - 1단계: 프로세스 내 LRU (OrderedDict), 2단계: 디스크 JSON ({root}/{이름}-{인자 해시}.json)
+# - TTL이 지나면 다시 조회, 조회 실패(예외/None/NaN) 시 만료된 값이라도 있으면 그대로 사용(stale)
+# - 같은 지표를 여러 스레드가 동시에 요청해도 실제 조회는 한 번만 수행
+# - 지표별 hit/miss/stale/error 횟수는 cache_stats()로 확인
+
+INTRADAY = 10 * 60          # 지수/환율: 10분
+DAILY = 24 * 60 * 60
+MONTHLY = 30 * DAILY        # 월간 통계 (기준금리, M2)
+
+DEFAULT_ROOT = os.path.join('data', 'cache', 'indicators')
+MAX_ENTRIES = 256
+
+_memory = OrderedDict()  # key -> (value, fetched_at)
+_locks = {}
+_lock = threading.Lock()
+_stats = {}
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _count(name, kind):
+    with _lock:
+        _stats.setdefault(name, {'hit': 0, 'disk_hit': 0, 'miss': 0, 'stale': 0, 'error': 0})[kind] += 1
+
+
+def _disk_path(root, key):
+    name, _, args = key.partition(':')
+    return os.path.join(root, f"{name}-{hashlib.sha1(args.encode()).hexdigest()[:10]}.json")
+
+
+def _read_disk(root, key):
+    path = _disk_path(root, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        return entry['value'], entry['fetched_at']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_disk(root, key, value, fetched_at):
+    try:
+        os.makedirs(root, exist_ok=True)
+        path = _disk_path(root, key)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'value': value, 'fetched_at': fetched_at}, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+    except (OSError, TypeError):
+        pass  # 디스크 캐시는 실패해도 조회 결과는 그대로 반환
+
+
+def _remember(key, value, fetched_at):
+    with _lock:
+        _memory[key] = (value, fetched_at)
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def cached(name, ttl, fallback=None, root=DEFAULT_ROOT):
+    """지표 조회 함수에 TTL 캐시 적용, 조회 실패 시 만료된 값 → fallback 순으로 반환"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = f'{name}:{args!r}:{sorted(kwargs.items())!r}'
+            with _lock:
+                entry = _memory.get(key)
+                if entry is not None:
+                    _memory.move_to_end(key)  # LRU: 최근 사용 순서 갱신
+                key_lock = _locks.setdefault(key, threading.Lock())
+            if entry is not None and time.time() - entry[1] < ttl:
+                _count(name, 'hit')
+                return entry[0]
+            with key_lock:
+                # 대기하는 동안 다른 스레드가 조회를 끝냈을 수 있음
+                entry, source = _memory.get(key), 'hit'
+                if entry is None or time.time() - entry[1] >= ttl:
+                    disk = _read_disk(root, key)
+                    if disk is not None and (entry is None or disk[1] > entry[1]):
+                        entry, source = disk, 'disk_hit'
+                if entry is not None and time.time() - entry[1] < ttl:
+                    _count(name, source)
+                    _remember(key, *entry)
+                    return entry[0]
+                _count(name, 'miss')
+                try:
+                    value = fn(*args, **kwargs)
+                except Exception:
+                    value = None
+                if _is_missing(value):
+                    _count(name, 'error')
+                    if entry is not None:
+                        _count(name, 'stale')
+                        return entry[0]
+                    return fallback if fallback is not None else value
+                fetched_at = time.time()
+                _remember(key, value, fetched_at)
+                _write_disk(root, key, value, fetched_at)
+                return value
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """지표별 {'hit', 'disk_hit', 'miss', 'stale', 'error'} 횟수"""
+    with _lock:
+        return {name: dict(counts) for name, counts in _stats.items()}
+
+
+def clear_cache(root=None):
+    """프로세스 내 캐시와 횟수 초기화 (root를 주면 디스크 캐시도 삭제)"""
+    with _lock:
+        _memory.clear()
+        _stats.clear()
+    if root and os.path.isdir(root):
+        for f in os.listdir(root):
+            if f.endswith('.json'):
+                os.remove(os.path.join(root, f))
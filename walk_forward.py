@@ -0,0 +1,204 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from model_registry import ModelRegistry, data_fingerprint, params_fingerprint
+from model_backends import make_models, canonical_models, model_label
+
+# 시계열 walk-forward(확장 윈도우) 학습/평가
+# - fold 경계는 달력 기간(기본 월)으로 고정 → 새 거래일이 추가돼도 기존 fold는 그대로
+# - 학습 구간은 테스트 시작 horizon 영업일 전까지만 사용 (타깃이 테스트 구간 가격을 보지 않도록)
+# - fold별 학습 모델은 모델 저장소(ModelRegistry)에 'walk_forward/{fold}'로 저장
+#   (학습 데이터 해시, 모델 설정)이 같으면 재사용 → 새 fold만 학습
+# - 주의: make_ml_dataset의 정규화 OHLCV 특성은 종목 전체 기간 평균/표준편차를 쓰므로 미래 정보가 섞임
+#         → 기본 특성은 과거 윈도우만 쓰는 기술적 지표(ML_FEATURE_COLS)
+# - walk_forward_horizons: make_ml_dataset(horizons=...)의 타깃 기간별로 같은 평가를 한 번에 실행
+# - fold마다 타깃(target_reg)이 없는 row는 학습/평가에서 제외
+
+def default_models(backend=None):
+    """{'lr', 'reg', 'cls'} 모델 묶음 (backend: model_backends.BACKENDS 이름, 기본은 설정값)"""
+    return make_models(backend)
+
+
+# 1. fold 분할
+def make_folds(dates, freq='M', horizon=60, min_train=60, n_folds=None):
+    """기간(freq, 기본 월) 단위 확장 윈도우 fold 목록 (최근 n_folds개)
+    각 fold: {'fold', 'train_end', 'test_start', 'test_end'}"""
+    dates = pd.DatetimeIndex(np.sort(pd.unique(np.asarray(dates))))
+    periods = dates.to_period(freq)
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    ends = np.r_[starts[1:], len(dates)] - 1
+    folds = []
+    for s, e in zip(starts, ends):
+        if s - horizon < min_train:
+            continue
+        folds.append({
+            'fold': str(periods[s]),
+            'train_end': dates[s - horizon - 1],  # 이 날짜까지 학습 (타깃이 test_start 이전에 확정)
+            'test_start': dates[s],
+            'test_end': dates[e],
+        })
+    return folds[-n_folds:] if n_folds else folds
+
+
+def split_fold(data, fold):
+    """fold의 학습/테스트 구간 (타깃이 없는 row는 제외: make_ml_dataset(horizons=...)의 기본 타깃은 NaN일 수 있음)"""
+    train = _with_target(data[data['date'] <= fold['train_end']])
+    test = _with_target(data[(data['date'] >= fold['test_start']) & (data['date'] <= fold['test_end'])])
+    return train, test
+
+
+def _with_target(frame):
+    """target_reg가 있는 row만, target_cls는 0/1 정수로"""
+    if not frame['target_reg'].isna().any() and frame['target_cls'].dtype.kind in 'iu':
+        return frame
+    frame = frame.dropna(subset=['target_reg'])
+    return frame.assign(target_cls=frame['target_cls'].astype(int))
+
+
+# 2. 학습 + 캐시
+def fold_key(train, features, models):
+    """학습 데이터 내용과 모델 설정으로 만든 fold 모델 키"""
+    cols = ['code', 'date'] + list(features) + ['target_reg', 'target_cls']
+    return data_fingerprint(train[cols]) + params_fingerprint(models)
+
+
+def fit_fold(X, y_reg, y_cls, models, threads=None):
+    """하나의 fold 학습 (프로세스 풀에서 실행)
+    threads: 이 프로세스의 OpenMP/BLAS 스레드 수 제한 (HistGradientBoosting 등, 프로세스 수 x 코어 수 방지)"""
+    if threads is not None:
+        from threadpoolctl import threadpool_limits
+        with threadpool_limits(threads):
+            return fit_fold(X, y_reg, y_cls, models)
+    fitted = {}
+    for name, model in models.items():
+        y = y_cls if name.endswith('cls') else y_reg
+        fitted[name] = model.fit(X, y)
+    return fitted
+
+
+def _plan(data, features, models, registry, prefix, freq, horizon, min_train, n_folds):
+    """fold 목록과 저장소에서 재사용할 모델 {fold: 모델}, 새로 학습할 fold {fold: (train, fold)}"""
+    # fold 경계도 타깃이 있는 날짜 기준 (최근 타깃 없는 기간이 빈 fold로 n_folds를 차지하지 않도록)
+    folds = make_folds(data.loc[data['target_reg'].notna(), 'date'], freq, horizon, min_train, n_folds)
+    fitted, todo = {}, {}
+    for fold in folds:
+        train, _ = split_fold(data, fold)
+        fold['key'] = fold_key(train, features, models)
+        name = f"{prefix}/{fold['fold']}"
+        if registry.is_current(name, fold['key']):
+            fitted[fold['fold']] = canonical_models(registry.load(name, features))
+        else:
+            todo[fold['fold']] = (train, fold)
+    return folds, fitted, todo
+
+
+def _fit_all(todo, features, models, max_workers):
+    """{키: (train, fold)} 전부 학습 (2개 이상이면 프로세스 풀에서 병렬)"""
+    if len(todo) == 1 or max_workers == 1:
+        return {k: fit_fold(t[features], t['target_reg'], t['target_cls'], models) for k, (t, _) in todo.items()}
+    if not todo:
+        return {}
+    # 프로세스마다 코어를 나눠 씀 (전체 스레드 수 ≈ 코어 수)
+    workers = min(max_workers or os.cpu_count() or 1, len(todo))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {k: pool.submit(fit_fold, t[features], t['target_reg'], t['target_cls'], models, threads)
+                   for k, (t, _) in todo.items()}
+        return {k: f.result() for k, f in futures.items()}
+
+
+def _evaluate(data, features, folds, fitted, todo):
+    from sklearn.metrics import mean_squared_error, accuracy_score
+    rows, preds = [], []
+    for fold in folds:
+        train, test = split_fold(data, fold)
+        if len(test) == 0:
+            continue
+        fold_models = fitted[fold['fold']]
+        pred = test[['code', 'date', 'target_reg', 'target_cls']].copy()
+        pred['fold'] = fold['fold']
+        pred['pred_lr'] = fold_models['lr'].predict(test[features])
+        pred['pred_reg'] = fold_models['reg'].predict(test[features])
+        pred['pred_cls'] = fold_models['cls'].predict(test[features])
+        preds.append(pred)
+        rows.append({
+            'fold': fold['fold'],
+            'train_end': fold['train_end'],
+            'test_start': fold['test_start'],
+            'test_end': fold['test_end'],
+            'n_train': len(train),
+            'n_test': len(test),
+            'model': model_label(fold_models),
+            'mse_lr': mean_squared_error(pred['target_reg'], pred['pred_lr']),
+            'mse_reg': mean_squared_error(pred['target_reg'], pred['pred_reg']),
+            'accuracy': accuracy_score(pred['target_cls'], pred['pred_cls']),
+            'hit_rate': float(np.mean(np.sign(pred['pred_reg']) == np.sign(pred['target_reg']))),
+            'cached': fold['fold'] not in todo,
+        })
+    report = pd.DataFrame(rows)
+    predictions = pd.concat(preds) if preds else pd.DataFrame()
+    return report, predictions
+
+
+def walk_forward(data, features, freq='M', horizon=60, min_train=60, n_folds=5,
+                 models=None, max_workers=None, registry=None):
+    """fold별 학습/평가, (fold별 지표 DataFrame, 테스트 구간 예측 DataFrame, {fold: 모델}) 반환"""
+    models = models or default_models()
+    registry = registry or ModelRegistry()
+
+    # 저장소에 없거나 바뀐 fold만 병렬 학습
+    folds, fitted, todo = _plan(data, features, models, registry, 'walk_forward', freq, horizon, min_train, n_folds)
+    for k, fold_models in _fit_all(todo, features, models, max_workers).items():
+        train, fold = todo[k]
+        registry.save(f'walk_forward/{k}', fold_models, fold['key'], features,
+                      {'train_end': fold['train_end'], 'n_rows': len(train), 'model': model_label(models)})
+        fitted[k] = fold_models
+
+    # fold별 평가
+    report, predictions = _evaluate(data, features, folds, fitted, todo)
+    return report, predictions, fitted
+
+
+# 3. 여러 타깃 기간(horizon) 비교
+def horizon_view(data, h):
+    """make_ml_dataset(horizons=[..., h])의 target_reg_{h}, target_cls_{h}를 target_reg, target_cls로 바꾼 데이터
+    (h일 뒤 타깃이 없는 row는 제외 → 짧은 기간일수록 최근 row까지 사용)"""
+    view = data.dropna(subset=[f'target_reg_{h}'])
+    return view.assign(target_reg=view[f'target_reg_{h}'], target_cls=view[f'target_cls_{h}'].astype(int))
+
+
+def walk_forward_horizons(data, features, horizons, freq='M', min_train=60, n_folds=5,
+                          models=None, max_workers=None, registry=None):
+    """horizon마다 walk-forward 학습/평가 (모든 horizon × fold 학습을 프로세스 풀 하나에서 병렬)
+    각 horizon의 학습 구간은 테스트 시작 h영업일 전까지, 모델은 'walk_forward/h{h}/{fold}'로 저장
+    (horizon별 fold 지표를 이어붙인 DataFrame(horizon 컬럼), 예측 DataFrame, {h: {fold: 모델}}) 반환"""
+    models = models or default_models()
+    registry = registry or ModelRegistry()
+    plans, todo = {}, {}
+    for h in horizons:
+        view = horizon_view(data, h)
+        folds, fitted, h_todo = _plan(view, features, models, registry, f'walk_forward/h{h}',
+                                      freq, h, min_train, n_folds)
+        plans[h] = (view, folds, fitted, h_todo)
+        todo.update({(h, k): v for k, v in h_todo.items()})
+
+    for (h, k), fold_models in _fit_all(todo, features, models, max_workers).items():
+        train, fold = todo[(h, k)]
+        registry.save(f'walk_forward/h{h}/{k}', fold_models, fold['key'], features,
+                      {'train_end': fold['train_end'], 'n_rows': len(train), 'horizon': h,
+                       'model': model_label(models)})
+        plans[h][2][k] = fold_models
+
+    reports, preds, fitted = [], [], {}
+    for h, (view, folds, h_fitted, h_todo) in plans.items():
+        report, pred = _evaluate(view, features, folds, h_fitted, h_todo)
+        reports.append(report.assign(horizon=h))
+        preds.append(pred.assign(horizon=h))
+        fitted[h] = h_fitted
+    return pd.concat(reports, ignore_index=True), pd.concat(preds), fitted
+
+
+def summarize_horizons(report):
+    """horizon별 평균 성능 (walk_forward_horizons 보고서)"""
+    return report.groupby('horizon')[['mse_lr', 'mse_reg', 'accuracy', 'hit_rate']].mean()
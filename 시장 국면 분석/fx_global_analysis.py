@@ -1,21 +1,31 @@
-import yfinance as yf
+import os
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ttl_cache import cached, INTRADAY
+
+@cached('usdkrw', ttl=INTRADAY)
 def get_usdkrw():
+    import yfinance as yf  # 임포트가 느려서 (약 1초) 조회할 때 읽음
     df = yf.download('USDKRW=X', period='5d')
     if df.empty:
         return np.nan
     return float(df['Close'].iloc[-1])
 
+@cached('us10y', ttl=INTRADAY)
 def get_us10y():
+    import yfinance as yf
     df = yf.download('^TNX', period='5d')
     if df.empty:
         return np.nan
     # yfinance의 ^TNX는 10배수로 제공됨
     return float(df['Close'].iloc[-1]) / 10
 
+@cached('sp500', ttl=INTRADAY)
 def get_sp500():
+    import yfinance as yf
     df = yf.download('^GSPC', period='5d')
     if df.empty:
         return np.nan
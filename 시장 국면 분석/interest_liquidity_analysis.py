@@ -1,33 +1,63 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
-import requests
+from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ttl_cache import cached, DAILY, MONTHLY
+import http_client
+
+@cached('base_rate', ttl=MONTHLY, fallback=3.5)
 def get_base_rate():
     try:
         url = 'https://ecos.bok.or.kr/api/StatisticSearch/sample/json/kr/1/5/722Y001/M/202301/202312/0101000'
-        r = requests.get(url)
+        r = http_client.get(url)
         data = r.json()
         rows = data['StatisticSearch']['row']
         latest = float(rows[-1]['DATA_VALUE'])
         return latest
     except:
-        return 3.5
+        return None
 
+@cached('m2_growth', ttl=MONTHLY, fallback=7.1)  # 조회 실패 시 최신값 수동입력(예시)
 def get_m2_growth():
     try:
         url = 'https://ecos.bok.or.kr/api/StatisticSearch/sample/json/kr/1/5/322Y001/M/202301/202312/0101000'
-        r = requests.get(url)
+        r = http_client.get(url)
         data = r.json()
         rows = data['StatisticSearch']['row']
         latest = float(rows[-1]['DATA_VALUE'])
         return latest
     except:
-        return 7.1  # 최신값 수동입력(예시)
+        return None
+
+def get_bond_yield(item_code):
+    """ECOS 시장금리(일별)에서 최근 5영업일 중 마지막 값"""
+    try:
+        end = datetime.today()
+        start = end - timedelta(days=7)
+        url = (f'https://ecos.bok.or.kr/api/StatisticSearch/sample/json/kr/1/5/817Y002/D/'
+               f'{start:%Y%m%d}/{end:%Y%m%d}/{item_code}')
+        r = http_client.get(url)
+        data = r.json()
+        rows = data['StatisticSearch']['row']
+        return float(rows[-1]['DATA_VALUE'])
+    except:
+        return None
+
+# 조회 실패 시 국고채 3년/10년 금리: 2025년 4월 기준 수동 입력
+@cached('bond3y', ttl=DAILY, fallback=2.40)
+def get_bond3y():
+    return get_bond_yield('010200000')
+
+@cached('bond10y', ttl=DAILY, fallback=2.66)
+def get_bond10y():
+    return get_bond_yield('010210000')
 
 if __name__ == "__main__":
-    # 국고채 3년/10년 금리: 2025년 4월 기준 수동 입력
-    bond3y = 2.40
-    bond10y = 2.66
+    bond3y = get_bond3y()
+    bond10y = get_bond10y()
     base_rate = get_base_rate()
     m2_growth = get_m2_growth()
     table = pd.DataFrame({
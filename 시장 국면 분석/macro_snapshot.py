@@ -0,0 +1,104 @@
+import os
+import sys
+import math
+import time
+import threading
+from typing import Optional
+from dataclasses import dataclass, field, fields
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+from market_indices import get_kospi_index
+from market_phase_analysis import get_vkospi
+from interest_liquidity_analysis import get_bond3y, get_base_rate, get_m2_growth
+from fx_global_analysis import get_usdkrw, get_us10y, get_sp500
+
+# 시장 국면 진단용 8개 지표 동시 수집
+# - 지표마다 별도 스레드에서 조회, 지표별 제한 시간(SOURCE_TIMEOUTS)을 넘기면 None 처리
+# - 조회 스레드는 daemon → 응답 없는 지표가 남아 있어도 프로세스 종료를 막지 않음
+# - 전체 소요 시간 ≈ 가장 느린 지표 하나의 시간 (지표별 시간의 합이 아님)
+# - 결과는 MacroSnapshot으로 모아 diagnose_market_phase(**snapshot.as_kwargs())로 전달
+
+SOURCES = {
+    'kospi': get_kospi_index,      # 네이버 금융
+    'sp500': get_sp500,            # yfinance
+    'vkospi': get_vkospi,          # 수동 입력
+    'kor_bond3y': get_bond3y,      # ECOS
+    'base_rate': get_base_rate,    # ECOS
+    'm2_growth': get_m2_growth,    # ECOS
+    'usdkrw': get_usdkrw,          # yfinance
+    'us10y': get_us10y,            # yfinance
+}
+SOURCE_TIMEOUTS = {
+    'kospi': 5, 'sp500': 10, 'vkospi': 1, 'kor_bond3y': 8,
+    'base_rate': 8, 'm2_growth': 8, 'usdkrw': 10, 'us10y': 10,
+}
+
+
+@dataclass
+class MacroSnapshot:
+    kospi: Optional[float] = None
+    sp500: Optional[float] = None
+    vkospi: Optional[float] = None
+    kor_bond3y: Optional[float] = None
+    base_rate: Optional[float] = None
+    m2_growth: Optional[float] = None
+    usdkrw: Optional[float] = None
+    us10y: Optional[float] = None
+    elapsed: dict = field(default_factory=dict)  # 지표별 소요 시간(초)
+    errors: dict = field(default_factory=dict)   # 지표별 실패 사유 (timeout/예외)
+
+    def as_kwargs(self):
+        """diagnose_market_phase 인자 dict"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name in SOURCES}
+
+
+def _start(fn):
+    """fn을 daemon 스레드에서 실행, (스레드, 결과 dict: value/error/elapsed) 반환"""
+    box = {}
+
+    def run():
+        t0 = time.perf_counter()
+        try:
+            box['value'] = fn()
+        except Exception as e:
+            box['error'] = e
+        box['elapsed'] = time.perf_counter() - t0
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, box
+
+
+def collect_snapshot(sources=None, timeouts=None):
+    """8개 지표를 동시에 조회해서 MacroSnapshot 반환 (실패/시간 초과/NaN은 None)"""
+    sources = sources or SOURCES
+    timeouts = timeouts or SOURCE_TIMEOUTS
+    snapshot = MacroSnapshot()
+    t0 = time.perf_counter()
+    running = {name: _start(fn) for name, fn in sources.items()}
+    for name, (thread, box) in running.items():
+        deadline = t0 + timeouts.get(name, 10)
+        thread.join(timeout=max(0, deadline - time.perf_counter()))
+        value = None
+        if thread.is_alive():
+            # 시간 초과된 조회는 기다리지 않음 (백그라운드에서 끝나면 결과는 TTL 캐시에 남음)
+            snapshot.errors[name] = 'timeout'
+            snapshot.elapsed[name] = time.perf_counter() - t0
+        elif 'error' in box:
+            snapshot.errors[name] = repr(box['error'])
+            snapshot.elapsed[name] = box['elapsed']
+        else:
+            value = box['value']
+            snapshot.elapsed[name] = box['elapsed']
+        if value is not None and isinstance(value, float) and math.isnan(value):
+            value = None
+            snapshot.errors[name] = 'NaN'
+        setattr(snapshot, name, value)
+    return snapshot
+
+
+if __name__ == "__main__":
+    snapshot = collect_snapshot()
+    print(snapshot)
@@ -4,16 +4,17 @@ import pandas as pd
 def diagnose_market_phase(
     kospi=None, sp500=None, vkospi=None,
     kor_bond3y=None, base_rate=None, m2_growth=None,
-    usdkrw=None, us10y=None
+    usdkrw=None, us10y=None, verbose=True
 ):
     # 진단 근거 표 생성
     data = {
         '지표': ['KOSPI', 'S&P500', 'VKOSPI', '국고채 3년', '기준금리', 'M2 증가율', 'USD/KRW', '미국 10Y'],
         '값': [kospi, sp500, vkospi, kor_bond3y, base_rate, m2_growth, usdkrw, us10y]
     }
-    df = pd.DataFrame(data)
-    print('[시장 주요 지표]')
-    print(df.to_string(index=False))
+    if verbose:
+        df = pd.DataFrame(data)
+        print('[시장 주요 지표]')
+        print(df.to_string(index=False))
 
     # 국면 진단 로직
     # (예시: 실제로는 더 정교하게 조합 가능)
@@ -62,8 +63,9 @@ def diagnose_market_phase(
         phase = '침체기'
     elif rate_down and index_down and econ_down:
         phase = '불황기'
-    print('\n[시장 국면 진단 결과]')
-    print(f'현재 시장 국면: {phase}')
+    if verbose:
+        print('\n[시장 국면 진단 결과]')
+        print(f'현재 시장 국면: {phase}')
     '''
     print('\n[진단 근거]')
     print(f'- 금리↓: {rate_down}, 금리↑: {rate_up}')
@@ -71,19 +73,54 @@ def diagnose_market_phase(
     print(f'- 경기지표↑: {econ_up}, 경기지표↓: {econ_down}')
     print(f'- (판단 로직: 회복기=금리↓+지수↑+경기↑, 과열기=금리↑+지수↑+경기↑, 침체기=금리↑+지수↓, 불황기=금리↓+지수↓+경기↓)')
     '''
+    return phase
+
+# 월간/분기 지표 (발표일에만 값이 있음) → 직전 발표값을 일간 날짜로 이어서 사용
+LOW_FREQ = ['base_rate', 'm2_growth']
+
+def diagnose_market_phase_series(indicators, ffill=True):
+    """날짜별 지표 시계열(dict 또는 DataFrame, 컬럼명은 diagnose_market_phase 인자명)로 날짜별 국면 계산
+    날짜는 일간 지표에 값이 있는 날(거래일), 월간 지표(LOW_FREQ)는 ffill=True면 직전 발표값을 이어서 사용
+    일간 지표의 결측(NaN)은 채우지 않고 스칼라 버전의 None과 같이 조건 불충족 처리"""
+    frame = pd.DataFrame(indicators).sort_index()
+    daily = [name for name in frame if name not in LOW_FREQ] or list(frame)
+    df = frame[frame[daily].notna().any(axis=1)].copy()  # 월말이 주말/휴일인 월간 지표 날짜는 제외
+    if ffill:
+        for name in frame.columns.intersection(LOW_FREQ):
+            df[name] = frame[name].ffill().reindex(df.index)  # 전체 날짜에서 채운 뒤 거래일만 사용
+
+    def col(name):
+        return df[name].to_numpy(dtype=float) if name in df else np.full(len(df), np.nan)
+
+    kospi, sp500, vkospi = col('kospi'), col('sp500'), col('vkospi')
+    kor_bond3y, base_rate, m2_growth, us10y = col('kor_bond3y'), col('base_rate'), col('m2_growth'), col('us10y')
+
+    # 조건 플래그 (NaN 비교는 False → 스칼라 버전의 'is not None and ...'과 동일)
+    rate_down = ((base_rate <= 2.5).astype(int) + (kor_bond3y <= 2.5) + (us10y <= 2.5)) >= 2
+    rate_up = ((base_rate >= 3.0).astype(int) + (kor_bond3y >= 3.0) + (us10y >= 3.0)) >= 2
+    index_up = ((kospi >= 2000).astype(int) + (sp500 >= 4000)) >= 2
+    index_down = ((kospi < 2000).astype(int) + (sp500 < 4000)) >= 2
+    econ_up = ((m2_growth >= 7).astype(int) + (vkospi < 20)) >= 1
+    econ_down = ((m2_growth <= 5).astype(int) + (vkospi > 25)) >= 1
+    # 국면 진단 (조건 순서대로 먼저 맞는 국면)
+    phase = np.select(
+        [rate_down & index_up & econ_up,
+         rate_up & index_up & econ_up,
+         rate_up & index_down,
+         rate_down & index_down & econ_down],
+        ['회복기', '과열기', '침체기', '불황기'],
+        default='판단불가'
+    )
+    return pd.Series(phase, index=df.index, name='phase')
+
 if __name__ == "__main__":
-    # 예시: 각 분석 파일에서 값 수동 입력 또는 import해서 전달
-    # 아래 값은 예시이므로 실제 분석 결과로 대체하세요
-    kospi = 2700
-    sp500 = 5200
-    vkospi = 15
-    kor_bond3y = 2.4
-    base_rate = 3.5
-    m2_growth = 7.1
-    usdkrw = 1370
-    us10y = 4.3
-    diagnose_market_phase(
-        kospi=kospi, sp500=sp500, vkospi=vkospi,
-        kor_bond3y=kor_bond3y, base_rate=base_rate, m2_growth=m2_growth,
-        usdkrw=usdkrw, us10y=us10y
-    ) 
\ No newline at end of file
+    # 각 분석 파일의 지표 조회 함수를 동시에 실행해서 수집한 값으로 진단
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from macro_snapshot import collect_snapshot
+
+    snapshot = collect_snapshot()
+    for name, error in snapshot.errors.items():
+        print(f'⚠️ {name} 조회 실패: {error}')
+    diagnose_market_phase(**snapshot.as_kwargs())